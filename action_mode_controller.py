@@ -5,6 +5,7 @@ class ActionModeController:
     def __init__(self, texture_atlas, inventory):
         self.texture_atlas = texture_atlas
         self.inventory = inventory
+        self.chunk_store = None  # Set by the game loop so broken blocks are persisted
 
     def handle_mouse_event(self, event, world_chunks, player, cam_offset_x, cam_offset_y, block_size, chunk_width, world_height):
         if event.button == 1:  # Left click to break
@@ -23,6 +24,8 @@ class ActionModeController:
                         self.inventory.add_item(block.item_variant, 1)
                         print(f"Added {block.item_variant.name} to inventory")
                     world_chunks[chunk_index][world_y][local_x] = b.AIR
+                    if self.chunk_store:
+                        self.chunk_store.mark_dirty(chunk_index)
 
         # Get block at mouse position
         mouse_x, mouse_y = event.pos
@@ -0,0 +1,15 @@
+class AnimationClock:
+    """Time base shared by every animated block, so all water shows the same frame"""
+
+    def __init__(self):
+        self.time_ms = 0
+
+    def update(self, dt):
+        """Advance by ``dt`` milliseconds"""
+        self.time_ms += dt
+
+    def frame(self, block):
+        """Index into ``block.animation_frames`` to show now"""
+        return int(self.time_ms // max(block.frame_duration, 1)) % len(block.animation_frames)
+
+ANIMATION_CLOCK = AnimationClock()
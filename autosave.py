@@ -0,0 +1,92 @@
+import config as c
+from logger import get_logger
+
+log = get_logger("chunks")
+
+class Autosave:
+    """Periodically writes what changed without stalling the game.
+
+    Every ``interval`` ms a pass starts with the chunks the ChunkStore has
+    marked dirty. Each frame copies at most ``chunks_per_frame`` of them with
+    SaveManager.chunk_snapshot(), which is all the main thread does. When the
+    last one is copied, the background saver encodes, compresses and writes
+    the chunks, then fsyncs the region files and writes the level and player
+    files. Nothing is written unless something actually changed, and a failed
+    write marks everything dirty again. A chunk edited and unloaded before
+    the pass is written keeps the newer copy ChunkStore.unload() stored.
+    """
+
+    def __init__(self, save_manager, chunk_store, background_saver,
+                 interval=c.AUTOSAVE_INTERVAL, chunks_per_frame=c.AUTOSAVE_CHUNKS_PER_FRAME):
+        self.save_manager = save_manager
+        self.chunk_store = chunk_store
+        self.background_saver = background_saver
+        self.interval = interval
+        self.chunks_per_frame = max(1, chunks_per_frame)
+        self.elapsed = 0
+        self.pending = []  # Chunk indices left in the running pass, popped from the end
+        self.running = False
+        self.snapshots = []  # Chunks copied so far in the running pass
+        self.saved_player = None  # Player fields as of the last save
+        self.stats = {'passes': 0, 'chunks': 0, 'player_saves': 0}
+
+    def player_state(self, player):
+        return (player.rect.x, player.rect.y, player.health, player.hunger, player.thirst)
+
+    def player_dirty(self, player, inventory):
+        return inventory.dirty or self.player_state(player) != self.saved_player
+
+    def mark_player_saved(self, player, inventory):
+        inventory.dirty = False
+        self.saved_player = self.player_state(player)
+
+    def update(self, dt, world_chunks, player, inventory):
+        """Advance the timer and do this frame's share of a running pass"""
+        if self.interval <= 0 or c.SAVE_FORMAT != "region":
+            return  # A JSON save is one file and cannot be written piecewise
+        if not self.running:
+            self.elapsed += dt
+            if self.elapsed < self.interval or self.background_saver.busy:
+                return
+            self.elapsed = 0
+            self.begin(world_chunks, player, inventory)
+            if not self.running:
+                return
+        self.step(world_chunks, player, inventory)
+
+    def begin(self, world_chunks, player, inventory):
+        """Start a pass over the chunks that are dirty right now"""
+        self.pending = sorted(self.chunk_store.dirty_chunks(world_chunks), reverse=True)
+        self.snapshots = []
+        self.running = bool(self.pending) or self.player_dirty(player, inventory)
+
+    def step(self, world_chunks, player, inventory):
+        """Copy this frame's share of the pass; the last step hands the pass to the background saver"""
+        budget = self.chunks_per_frame
+        while self.pending and budget > 0:
+            ci = self.pending.pop()
+            if ci not in world_chunks or ci not in self.chunk_store.dirty:
+                continue  # Unloaded (and saved) or already written since the pass started
+            self.snapshots.append(self.save_manager.chunk_snapshot(ci, world_chunks[ci]))
+            self.chunk_store.mark_saved([ci])  # Changes from now on make it dirty again
+            budget -= 1
+        if self.pending:
+            return
+
+        # Pass done: encoding, region writes, fsync, level and player file happen off the main thread
+        self.running = False
+        snapshot = self.save_manager.snapshot(world_chunks, player, inventory, chunk_indices=())
+        snapshot['chunks'] = self.snapshots
+        saved_chunks = [ci for ci, _, _, _ in self.snapshots]
+        self.background_saver.submit(snapshot, on_failed=lambda: self.save_failed(saved_chunks))
+        self.mark_player_saved(player, inventory)
+        self.stats['passes'] += 1
+        self.stats['chunks'] += len(saved_chunks)
+        self.stats['player_saves'] += 1
+        self.snapshots = []
+        log.info("Autosave queued %d chunks", len(saved_chunks))
+
+    def save_failed(self, chunk_indices):
+        """Called from the saver's worker when a save failed: write it all again next pass"""
+        self.chunk_store.mark_unsaved(chunk_indices)
+        self.saved_player = None
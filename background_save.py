@@ -0,0 +1,94 @@
+import threading
+import time
+from queue import Queue
+from logger import get_logger
+
+log = get_logger("save")
+
+class BackgroundSaver:
+    """Runs saves on a worker thread so the game loop never waits for the disk.
+
+    start() takes a snapshot on the calling (main) thread: block ids, block
+    entity state and player data are copied, which is cheap. Encoding,
+    compression, writing and fsync then happen on the worker while the game
+    keeps running and keeps changing the live world.
+
+    Chunks that are unloaded meanwhile are written directly by the ChunkStore.
+    Every chunk copy carries a sequence number from the SaveManager, and a
+    copy older than the one already on disk is skipped, so a queued save
+    never replaces a newer version of a chunk.
+    """
+
+    def __init__(self, save_manager, on_progress=None):
+        self.save_manager = save_manager
+        self.on_progress = on_progress  # Called as on_progress(done, total) from the worker
+        self.jobs = Queue()
+        self.pending = 0
+        self.progress = (0, 0)
+        self.last_result = None  # (chunks written, seconds) of the last finished save
+        self.last_error = None
+        self._lock = threading.Lock()
+        self.worker = threading.Thread(target=self._worker, daemon=True)
+        self.worker.start()
+
+    @property
+    def busy(self):
+        return self.pending > 0
+
+    def start(self, world_chunks, player, inventory, chunk_indices=None, on_failed=None):
+        """Snapshot the world now and write it in the background; see submit()"""
+        snapshot = self.save_manager.snapshot(world_chunks, player, inventory, chunk_indices)
+        return self.submit(snapshot, on_failed)
+
+    def submit(self, snapshot, on_failed=None):
+        """Write a snapshot() in the background; ``on_failed()`` is called from the worker if it fails
+
+        Jobs run in the order they were submitted. A chunk that was written
+        by a newer save in the meantime, including a ChunkStore unload, keeps
+        that newer copy.
+        """
+        with self._lock:
+            self.pending += 1
+        self.progress = (0, len(snapshot.get('chunks', ())) + 1)
+        self.jobs.put((snapshot, on_failed))
+        return snapshot
+
+    def _report(self, done, total):
+        self.progress = (done, total)
+        if self.on_progress:
+            self.on_progress(done, total)
+
+    def _worker(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                break
+            snapshot, on_failed = job
+            started = time.perf_counter()
+            try:
+                written = self.save_manager.write_snapshot(snapshot, self._report)
+                self.last_result = (written, time.perf_counter() - started)
+                self.last_error = None
+            except Exception as e:
+                self.last_error = e
+                log.error("Background save failed: %s", e, exc_info=True)
+                if on_failed:
+                    on_failed()
+            finally:
+                with self._lock:
+                    self.pending -= 1
+
+    def wait(self, timeout=None):
+        """Block until every queued save has been written"""
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        while self.busy:
+            if deadline is not None and time.perf_counter() > deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def stop(self):
+        """Finish outstanding saves and end the worker"""
+        self.wait()
+        self.jobs.put(None)
+        self.worker.join(timeout=1.0)
@@ -0,0 +1,382 @@
+"""Benchmark suite for world generation, rendering, saving and simulation.
+
+Usage:
+    python bench.py                         # run every workload
+    python bench.py worldgen water          # run only the named workloads
+    python bench.py --repeat 20 --output results.json
+
+Each workload is warmed up, then timed ``--repeat`` times. Results are printed
+as a table and written as JSON so runs can be compared between versions.
+"""
+import os
+
+# Run headless: the render and mob workloads need a display mode, not a window.
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import contextlib
+import json
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import pygame
+import config as c
+
+WORKLOADS = {}
+SCRATCH_DIRS = []  # Temporary save directories removed when the run ends
+
+def workload(name):
+    """Register a workload factory under ``name``"""
+    def register(factory):
+        WORKLOADS[name] = factory
+        return factory
+    return register
+
+def flat_world(chunk_indices, ground_y):
+    """Build chunks of air above ``ground_y`` and stone below it"""
+    import block as b
+    world = {}
+    for ci in chunk_indices:
+        chunk = []
+        for y in range(c.WORLD_HEIGHT):
+            fill = b.STONE if y >= ground_y else b.AIR
+            chunk.append([fill] * c.CHUNK_WIDTH)
+        world[ci] = chunk
+    return world
+
+def generated_world(chunk_indices, seed):
+    """Generate real terrain for ``chunk_indices`` with a fixed random state"""
+    from worldgen import generate_chunk, clear_chunk_cache
+    clear_chunk_cache()
+    random.seed(seed)
+    return {ci: generate_chunk(ci, c.CHUNK_WIDTH, c.WORLD_HEIGHT, seed) for ci in chunk_indices}
+
+@workload("worldgen")
+def bench_worldgen(args):
+    """generate_chunk throughput across several seeds (cache cleared per run)"""
+    from worldgen import generate_chunk, clear_chunk_cache
+    seeds = [args.seed + i for i in range(args.seeds)]
+
+    def run(_):
+        clear_chunk_cache()
+        random.seed(args.seed)
+        for seed in seeds:
+            for ci in range(args.chunks):
+                generate_chunk(ci, c.CHUNK_WIDTH, c.WORLD_HEIGHT, seed)
+
+    return None, run, len(seeds) * args.chunks, "chunks"
+
+@workload("render")
+def bench_render(args, rasterizer=None, view=False):
+    """ChunkManager.render_chunk cost for freshly invalidated chunks"""
+    from main import ChunkManager
+    world = generated_world(range(args.chunks), args.seed)
+    chunk_manager = ChunkManager(c.CHUNK_WIDTH, c.VIEW_DISTANCE)
+    chunk_manager.async_manager.cleanup()
+    if rasterizer:
+        chunk_manager.rasterizer.mode = rasterizer
+
+    def prepare():
+        for ci in world:
+            chunk_manager.invalidate_chunk(ci)
+
+    # The game only draws the tiles under the screen
+    top = (c.WORLD_HEIGHT * c.BLOCK_SIZE - c.SCREEN_HEIGHT) // 2 if view else 0
+    bottom = top + c.SCREEN_HEIGHT if view else None
+
+    def run(_):
+        for ci, chunk in world.items():
+            chunk_manager.render_chunk(ci, chunk, None, top, bottom)
+
+    return prepare, run, len(world), "chunks"
+
+@workload("render_blits")
+def bench_render_blits(args):
+    """render with one Surface.blits call per chunk"""
+    return bench_render(args, "blits")
+
+@workload("render_numpy")
+def bench_render_numpy(args):
+    """render composing chunk images from block id arrays with NumPy"""
+    return bench_render(args, "numpy")
+
+@workload("render_view")
+def bench_render_view(args):
+    """render of the tiles one screen height covers, as drawn each frame"""
+    return bench_render(args, view=True)
+
+@workload("animation")
+def bench_animation(args):
+    """Animation ticks on already rendered chunks: only water and leaf cells are redrawn"""
+    from main import ChunkManager
+    from animation_clock import ANIMATION_CLOCK
+    world = generated_world(range(args.chunks), args.seed)
+    chunk_manager = ChunkManager(c.CHUNK_WIDTH, c.VIEW_DISTANCE)
+    chunk_manager.async_manager.cleanup()
+    for ci, chunk in world.items():
+        chunk_manager.render_chunk(ci, chunk, None)
+
+    def run(_):
+        ANIMATION_CLOCK.update(100)
+        for ci, chunk in world.items():
+            chunk_manager.render_chunk(ci, chunk, None)
+
+    return None, run, len(world), "chunks"
+
+@workload("atlas")
+def bench_atlas(args):
+    """TextureManager.load_atlas from the prebuilt cache, as on every start after the first"""
+    from texture_manager import TextureManager
+    TextureManager().load_atlas("texture_atlas.png")  # Make sure the cache exists
+
+    def run(_):
+        TextureManager().load_atlas("texture_atlas.png")
+
+    return None, run, 1, "loads"
+
+@workload("atlas_build")
+def bench_atlas_build(args):
+    """Slicing, packing and quantizing texture_atlas.png, as after the art changed"""
+    from texture_manager import TextureManager
+
+    def run(_):
+        TextureManager().build_atlas("texture_atlas.png")
+
+    return None, run, 1, "builds"
+
+def save_fixture(args):
+    """Create a SaveManager in a scratch directory plus a player to save"""
+    import inventory
+    from character import Character
+    from save_manager import SaveManager
+    save_dir = tempfile.mkdtemp(prefix="bench_save_")
+    SCRATCH_DIRS.append(save_dir)
+    save_manager = SaveManager(seed=args.seed, save_dir=save_dir)
+    player = Character(100, 100)
+    player_inventory = inventory.Inventory()
+    player_inventory.set_player(player)
+    world = generated_world(range(args.chunks), args.seed)
+    return save_manager, world, player, player_inventory
+
+@workload("save")
+def bench_save(args):
+    """Full-world SaveManager.save_all"""
+    save_manager, world, player, player_inventory = save_fixture(args)
+
+    def run(_):
+        save_manager.save_all(world, player, player_inventory)
+
+    return None, run, len(world), "chunks"
+
+@workload("load")
+def bench_load(args):
+    """Full-world SaveManager.load_all of a save written by save_all"""
+    import block as b
+    save_manager, world, player, player_inventory = save_fixture(args)
+    with quiet(args):
+        save_manager.save_all(world, player, player_inventory)
+
+    def run(_):
+        save_manager.load_all(b.BLOCK_MAP)
+
+    return None, run, len(world), "chunks"
+
+@workload("first_chunk")
+def bench_first_chunk(args):
+    """Loading a save up to the chunk the player stands in; the rest streams in later"""
+    import block as b
+    save_manager, world, player, player_inventory = save_fixture(args)
+    with quiet(args):
+        save_manager.save_all(world, player, player_inventory)
+    center = args.chunks // 2
+
+    def run(_):
+        save_manager.load_all(b.BLOCK_MAP, chunk_indices=(center,))
+
+    return None, run, 1, "loads"
+
+@workload("water")
+def bench_water(args):
+    """Water simulation ticks on a flooded cave spanning three chunks"""
+    import block as b
+    from main import update_water
+    cave_top, cave_bottom = 60, 100
+
+    def prepare():
+        world = flat_world(range(3), 40)
+        for ci, chunk in world.items():
+            for y in range(cave_top, cave_bottom):
+                for x in range(c.CHUNK_WIDTH):
+                    # Upper half of the cave starts flooded, lower half is air
+                    chunk[y][x] = b.WATER if y < (cave_top + cave_bottom) // 2 else b.AIR
+        return world
+
+    def run(world):
+        for tick in range(args.ticks):
+            update_water(world, 1, c.CHUNK_WIDTH, c.WORLD_HEIGHT, tick)
+
+    return prepare, run, args.ticks, "ticks"
+
+@workload("mobs")
+def bench_mobs(args):
+    """Mob AI and physics ticks for ``--mobs`` mobs around one player"""
+    from character import Character
+    from mob import Mob
+    ground_y = 80
+    world = flat_world(range(-2, 3), ground_y)
+    world_info = {
+        "world_chunks": world,
+        "chunk_width": c.CHUNK_WIDTH,
+        "block_size": c.BLOCK_SIZE,
+        "world_height": c.WORLD_HEIGHT,
+        "dropped_items": []
+    }
+    ground_px = ground_y * c.BLOCK_SIZE
+    player = Character(0, ground_px - c.BLOCK_SIZE)
+    spread = 2 * c.CHUNK_WIDTH * c.BLOCK_SIZE
+    mobs = [Mob(-spread // 2 + i * spread // max(1, args.mobs), ground_px - c.BLOCK_SIZE)
+            for i in range(args.mobs)]
+    start_x = [mob.rect.x for mob in mobs]
+
+    def prepare():
+        random.seed(args.seed)
+        player.health = 100
+        player.is_alive = True
+        for mob, x in zip(mobs, start_x):
+            mob.rect.x = x
+            mob.rect.y = ground_px - mob.rect.height
+            mob.vy = 0
+
+    def run(_):
+        for _tick in range(args.ticks):
+            for mob in mobs:
+                mob.update(16, world_info, player)
+
+    return prepare, run, args.mobs * args.ticks, "mob ticks"
+
+@contextlib.contextmanager
+def quiet(args):
+    """Silence the game's debug prints unless --verbose was given"""
+    if args.verbose:
+        yield
+        return
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+def measure(prepare, run, args):
+    """Time ``run`` after warm-up; ``prepare`` runs untimed before each sample"""
+    samples = []
+    for i in range(args.warmup + args.repeat):
+        state = prepare() if prepare else None
+        with quiet(args):
+            start = time.perf_counter()
+            run(state)
+            elapsed = time.perf_counter() - start
+        if i >= args.warmup:
+            samples.append(elapsed)
+    return samples
+
+def summarize(samples, ops, unit):
+    """Reduce raw samples to robust statistics"""
+    ordered = sorted(samples)
+    median = statistics.median(ordered)
+    p95 = ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+    return {
+        "samples": len(ordered),
+        "ops_per_sample": ops,
+        "unit": unit,
+        "min_s": ordered[0],
+        "max_s": ordered[-1],
+        "mean_s": statistics.fmean(ordered),
+        "median_s": median,
+        "stdev_s": statistics.stdev(ordered) if len(ordered) > 1 else 0.0,
+        "p95_s": p95,
+        "ops_per_s": ops / median if median > 0 else float("inf"),
+        "raw_s": samples
+    }
+
+def git_revision():
+    """Return the current commit hash, or 'unknown' outside a checkout"""
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run game benchmarks")
+    parser.add_argument("workloads", nargs="*",
+                        help=f"workloads to run (default: all of {', '.join(WORKLOADS)})")
+    parser.add_argument("--repeat", type=int, default=10, help="timed samples per workload")
+    parser.add_argument("--warmup", type=int, default=2, help="untimed runs before sampling")
+    parser.add_argument("--seed", type=int, default=c.SEED, help="base terrain seed")
+    parser.add_argument("--seeds", type=int, default=3, help="seeds to cycle through in worldgen")
+    parser.add_argument("--chunks", type=int, default=5, help="chunks per world")
+    parser.add_argument("--ticks", type=int, default=30, help="simulation ticks per sample")
+    parser.add_argument("--mobs", type=int, default=50, help="mobs in the mob workload")
+    parser.add_argument("--output", default=None,
+                        help="JSON result path (default: bench_results/bench_<timestamp>.json)")
+    parser.add_argument("--verbose", action="store_true", help="keep game debug output")
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.workloads if name not in WORKLOADS]
+    if unknown:
+        parser.error(f"unknown workload(s): {', '.join(unknown)}")
+    if args.output:
+        args.output = os.path.abspath(args.output)  # main() changes the working directory
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+    names = args.workloads or list(WORKLOADS)
+
+    # Assets are loaded with paths relative to the game directory
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+
+    try:
+        results = {}
+        for name in names:
+            with quiet(args):
+                prepare, run, ops, unit = WORKLOADS[name](args)
+            samples = measure(prepare, run, args)
+            results[name] = summarize(samples, ops, unit)
+            stats = results[name]
+            print(f"{name:<10} median {stats['median_s'] * 1000:9.2f} ms  "
+                  f"p95 {stats['p95_s'] * 1000:9.2f} ms  "
+                  f"stdev {stats['stdev_s'] * 1000:8.2f} ms  "
+                  f"{stats['ops_per_s']:10.1f} {unit}/s")
+
+        report = {
+            "format": 1,
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "revision": git_revision(),
+            "python": sys.version.split()[0],
+            "pygame": pygame.version.ver,
+            "platform": platform.platform(),
+            "parameters": {key: value for key, value in vars(args).items() if key != "output"},
+            "results": results
+        }
+        output = args.output or os.path.join("bench_results", f"bench_{time.strftime('%Y%m%d_%H%M%S')}.json")
+        if os.path.dirname(output):
+            os.makedirs(os.path.dirname(output), exist_ok=True)
+        with open(output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {output}")
+    finally:
+        for save_dir in SCRATCH_DIRS:
+            shutil.rmtree(save_dir, ignore_errors=True)
+        pygame.quit()
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,9 @@ import pygame
 import config as c
 from block_loader import BlockLoader
 from registry import REGISTRY
+from logger import get_logger
+
+farm_log = get_logger("farming")
 
 class Block:
     def __init__(self, id, name, solid, color, texture_coords, drop_item=None, animation_frames=None, frame_duration=0, tint=None, entity_type=None):
@@ -121,6 +124,14 @@ class StorageBlock(Block):
             self.script.from_dict(data['storage_data'], item_registry)
             self.inventory = self.script.inventory  # Update compatibility reference
 
+    def to_record(self):
+        """Compact state for chunk saves; the block type is stored by id alongside it"""
+        return self.script.to_record()
+
+    def from_record(self, record, item_registry):
+        self.script.from_record(record, item_registry)
+        self.inventory = self.script.inventory  # Update compatibility reference
+
 class FurnaceBlock(Block):
     def __init__(self, id, name, texture_coords, solid=True, color=(100, 100, 100), 
                  drop_item=None, animation_frames=None, frame_duration=0, tint=None, entity_type=None):
@@ -175,6 +186,14 @@ class FurnaceBlock(Block):
             self.script.from_dict(data['furnace_data'], item_registry)
             self._update_proxy_slots()
 
+    def to_record(self):
+        """Compact state for chunk saves"""
+        return self.script.to_record()
+
+    def from_record(self, record, item_registry):
+        self.script.from_record(record, item_registry)
+        self._update_proxy_slots()
+
 class EnhancerBlock(Block):
     def __init__(self, id, name, texture_coords, solid=True, color=(100, 50, 150), 
                  drop_item=None, animation_frames=None, frame_duration=0, tint=None, entity_type=None):
@@ -247,6 +266,14 @@ class EnhancerBlock(Block):
             self.input_slot = self.script.input_slot
             self.ingredient_slot = self.script.ingredient_slot
 
+    def to_record(self):
+        """Compact state for chunk saves"""
+        return self.script.to_record()
+
+    def from_record(self, record, item_registry):
+        self.script.from_record(record, item_registry)
+        self.update_slots()
+
 class FarmingBlock(Block):
     def __init__(self, id, name, texture_coords, solid=True, color=(139, 69, 19), 
                  drop_item=None, animation_frames=None, frame_duration=0, tint=None, entity_type=None):
@@ -265,7 +292,7 @@ class FarmingBlock(Block):
 
     def create_instance(self):
         """Create a new instance of the farming block"""
-        print("[FARM DEBUG] Creating new FarmingBlock instance")
+        farm_log.debug("Creating new FarmingBlock instance")
         new_block = FarmingBlock(
             self.id, 
             self.name, 
@@ -279,18 +306,18 @@ class FarmingBlock(Block):
         new_block.item_variant = self.item_variant
         new_block.drop_item = self.drop_item
         
-        print(f"[FARM DEBUG] Created block: texture={new_block.texture_coords}, tilled={new_block.script.tilled}")
+        farm_log.debug("Created block: texture=%s, tilled=%s", new_block.texture_coords, new_block.script.tilled)
         return new_block
         
     def till(self):
         """Delegate to script"""
         if self.script:
-            print(f"[FARM DEBUG] Till requested on block: {self.texture_coords}")
+            farm_log.debug("Till requested on block: %s", self.texture_coords)
             result = self.script.till()
             # Force texture update
             if hasattr(self, '_cached_base'):
                 del self._cached_base
-            print(f"[FARM DEBUG] Till result: {result}, New texture: {self.texture_coords}")
+            farm_log.debug("Till result: %s, new texture: %s", result, self.texture_coords)
             return result
         return False
 
@@ -335,6 +362,16 @@ class FarmingBlock(Block):
             self.tilled = self.script.tilled
             self.plantable = self.script.plantable
 
+    def to_record(self):
+        """Compact state for chunk saves"""
+        return self.script.to_record()
+
+    def from_record(self, record, item_registry):
+        self.script.from_record(record, item_registry)
+        self.plant = self.script.plant
+        self.tilled = self.script.tilled
+        self.plantable = self.script.plantable
+
 # Update WOOD block creation with burn time
 WOOD = Block(19, "Wood", True, (139, 69, 19), (1, 13))
 WOOD.burn_time = 1000  # Add burn time before registration
@@ -443,6 +480,13 @@ BLOCK_LOADER = BlockLoader()
 # Load JSON blocks
 BLOCK_LOADER.load_blocks()
 
+# The predefined blocks take their animation from the JSON definitions
+for loaded in BLOCK_LOADER.blocks.values():
+    block = REGISTRY.blocks.get(str(loaded.id))
+    if block is not None and block is not loaded and loaded.animation_frames and not block.animation_frames:
+        block.animation_frames = loaded.animation_frames
+        block.frame_duration = loaded.frame_duration
+
 # Ensure all blocks have item variants
 ensure_block_item_variants()
 
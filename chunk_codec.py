@@ -0,0 +1,196 @@
+"""Palette encoding of chunks for region files.
+
+A chunk payload is:
+
+    uint8   codec version
+    uint8   kind: KIND_FULL or KIND_DELTA (absent in version 1, always full)
+    uint16  height, uint16 width
+    uint16  palette size, then one uint16 block id per palette entry
+    full:   height * width palette indices, row by row
+    delta:  uint32 change count, the changed cells as uint16 indices
+            (y * width + x), then one palette index per changed cell
+    uint32  length of the block-entity JSON, then the JSON itself
+
+Palette indices take one byte when the palette has at most 256 entries,
+otherwise two. A delta only lists the cells that differ from the generated
+terrain, so decoding it needs the freshly generated chunk as a base.
+
+Plain blocks are shared singletons and only need their id. Blocks with state
+(storage, furnace, enhancer, farmland) are stored as block entities:
+``[cell, block id, record]`` where ``cell`` is ``y * width + x`` and
+``record`` is the block's ``to_record()``: positional lists that hold only
+occupied slots as ``[item id, quantity]``, with the appearance fields left to
+the block definition. Version 2 payloads stored ``[y, x, to_dict() state]``
+instead and still load.
+"""
+import json
+import struct
+from array import array
+from block import StorageBlock, FurnaceBlock, EnhancerBlock, FarmingBlock
+from item import ITEM_REGISTRY
+from registry import REGISTRY
+
+CODEC_VERSION = 3
+
+KIND_FULL = 0
+KIND_DELTA = 1
+
+# A delta with more changed cells than this fraction is stored as a full chunk
+DELTA_MAX_FRACTION = 0.25
+
+# Blocks whose per-instance state has to be saved
+ENTITY_BLOCK_TYPES = (StorageBlock, FurnaceBlock, EnhancerBlock, FarmingBlock)
+
+# Block.to_dict() fields that are defined by the block type, not the instance (codec version 2)
+DEFINITION_FIELDS = ("name", "solid", "color", "texture_coords", "tint", "entity_type")
+
+HEADER_V1 = struct.Struct("<BHHH")     # version, height, width, palette size
+PAYLOAD_HEADER = struct.Struct("<BBHHH")  # version, kind, height, width, palette size
+CHANGE_COUNT = struct.Struct("<I")
+ENTITY_LENGTH = struct.Struct("<I")
+
+class ChunkDecodeError(Exception):
+    """Raised when a payload cannot be turned back into a chunk"""
+
+def entity_records(chunk, width):
+    """[cell, block id, record] for every block entity in a chunk"""
+    return [[y * width + x, block.id, block.to_record()]
+            for y, row in enumerate(chunk) for x, block in enumerate(row)
+            if isinstance(block, ENTITY_BLOCK_TYPES)]
+
+def load_entities(chunk, width, entities, item_registry=ITEM_REGISTRY, lut=None):
+    """Put the block entities of entity_records() back into a chunk
+
+    Records refer to items by their numeric id, so ``item_registry`` is keyed
+    like ITEM_REGISTRY.
+    """
+    lut = REGISTRY.block_lut() if lut is None else lut
+    for cell, block_id, record in entities:
+        if block_id >= len(lut) or not isinstance(lut[block_id], ENTITY_BLOCK_TYPES):
+            continue  # Block type no longer exists; the cell keeps what the grid says
+        block = lut[block_id].create_instance()
+        block.from_record(record, item_registry)
+        chunk[cell // width][cell % width] = block
+
+def chunk_ids(chunk):
+    """Flat array of block ids, row by row"""
+    return array("H", [block.id if block else 0 for row in chunk for block in row])
+
+def _index_bytes(indices, palette_size):
+    return array("B", indices).tobytes() if palette_size <= 256 else array("H", indices).tobytes()
+
+def snapshot_chunk(chunk):
+    """Copy what encoding needs, (height, width, ids, entities), so the chunk can keep changing"""
+    height = len(chunk)
+    width = len(chunk[0]) if height else 0
+    ids = chunk_ids(chunk)
+    # Entity instances keep their type's id, so most chunks skip the per-block entity scan
+    entity_ids = {block_id for block_id, block in enumerate(REGISTRY.block_lut()) if isinstance(block, ENTITY_BLOCK_TYPES)}
+    entities = entity_records(chunk, width) if entity_ids.intersection(ids) else []
+    return height, width, ids, entities
+
+def encode_chunk(chunk, base_ids=None):
+    """Encode a chunk as a palette payload"""
+    return encode_snapshot(snapshot_chunk(chunk), base_ids)
+
+def encode_snapshot(snapshot, base_ids=None):
+    """Encode a snapshot_chunk() result
+
+    When ``base_ids`` (chunk_ids of the generated terrain) is given and few
+    enough cells differ, only the differences are stored.
+    """
+    height, width, ids, entities = snapshot
+    kind = KIND_FULL
+    if base_ids is not None and len(base_ids) == len(ids):
+        changed = [i for i, (block_id, base_id) in enumerate(zip(ids, base_ids)) if block_id != base_id]
+        if len(changed) <= len(ids) * DELTA_MAX_FRACTION:
+            kind = KIND_DELTA
+
+    palette = {}
+    if kind == KIND_DELTA:
+        values = [palette.setdefault(ids[i], len(palette)) for i in changed]
+        cells = CHANGE_COUNT.pack(len(changed)) + array("H", changed).tobytes() + _index_bytes(values, len(palette))
+    else:
+        indices = [palette.setdefault(block_id, len(palette)) for block_id in ids]
+        cells = _index_bytes(indices, len(palette))
+
+    entity_json = json.dumps(entities, separators=(",", ":")).encode("utf-8") if entities else b""
+    return b"".join((
+        PAYLOAD_HEADER.pack(CODEC_VERSION, kind, height, width, len(palette)),
+        array("H", palette).tobytes(),
+        cells,
+        ENTITY_LENGTH.pack(len(entity_json)),
+        entity_json
+    ))
+
+def decode_chunk(payload, item_registry=None, base=None):
+    """Rebuild a chunk from a palette payload
+
+    ``base`` is a callable returning the generated chunk; it is only called
+    for delta payloads. ``payload`` may be any bytes-like object; it is
+    sliced through a memoryview, so no part of it is copied before decoding.
+    """
+    payload = memoryview(payload)
+    try:
+        version = payload[0]
+        if version == 1:
+            _, height, width, palette_size = HEADER_V1.unpack_from(payload)
+            kind, offset = KIND_FULL, HEADER_V1.size
+        else:
+            _, kind, height, width, palette_size = PAYLOAD_HEADER.unpack_from(payload)
+            offset = PAYLOAD_HEADER.size
+    except (IndexError, struct.error):
+        raise ChunkDecodeError("payload too short") from None
+    if version > CODEC_VERSION:
+        raise ChunkDecodeError(f"unsupported chunk codec version {version}")
+
+    palette_ids = array("H")
+    palette_ids.frombytes(payload[offset:offset + palette_size * 2])
+    offset += palette_size * 2
+
+    lut = REGISTRY.block_lut()
+    palette = [lut[block_id] if block_id < len(lut) else lut[0] for block_id in palette_ids]
+    value_size = 1 if palette_size <= 256 else 2
+
+    if kind == KIND_DELTA:
+        if base is None:
+            raise ChunkDecodeError("delta payload needs the generated chunk")
+        chunk = base()
+        (count,) = CHANGE_COUNT.unpack_from(payload, offset)
+        offset += CHANGE_COUNT.size
+        cells = array("H")
+        cells.frombytes(payload[offset:offset + count * 2])
+        offset += count * 2
+        values = array("B" if value_size == 1 else "H")
+        values.frombytes(payload[offset:offset + count * value_size])
+        offset += count * value_size
+        if len(cells) != count or len(values) != count:
+            raise ChunkDecodeError("payload truncated in block changes")
+        for cell, value in zip(cells, values):
+            chunk[cell // width][cell % width] = palette[value]
+    else:
+        count = height * width
+        if value_size == 1:
+            indices = payload[offset:offset + count]
+        else:
+            indices = array("H")
+            indices.frombytes(payload[offset:offset + count * 2])
+        if len(indices) != count:
+            raise ChunkDecodeError("payload truncated in block data")
+        offset += count * value_size
+        lookup = palette.__getitem__
+        chunk = [list(map(lookup, indices[y * width:(y + 1) * width])) for y in range(height)]
+
+    (entity_length,) = ENTITY_LENGTH.unpack_from(payload, offset)
+    offset += ENTITY_LENGTH.size
+    if entity_length:
+        entities = json.loads(bytes(payload[offset:offset + entity_length]))
+        if version >= 3:
+            load_entities(chunk, width, entities, ITEM_REGISTRY if item_registry is None else item_registry, lut)
+        else:
+            item_registry = REGISTRY.items if item_registry is None else item_registry
+            for y, x, state in entities:
+                block = chunk[y][x].create_instance()
+                block.from_dict(state, item_registry)
+                chunk[y][x] = block
+    return chunk
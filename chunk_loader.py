@@ -0,0 +1,73 @@
+import itertools
+import threading
+from queue import PriorityQueue, Queue, Empty
+import config as c
+from logger import get_logger
+
+log = get_logger("chunks")
+
+class ChunkLoader:
+    """Reads, decodes or generates chunks on worker threads, nearest first.
+
+    request() queues a chunk index with a priority (lower loads sooner) and
+    ready() hands finished chunks to the main thread. A request is cancelled
+    when the main thread needs the chunk right away and loads it itself;
+    a result that arrives for a cancelled request is dropped.
+    """
+
+    def __init__(self, load, workers=c.CHUNK_LOAD_WORKERS):
+        self.load = load  # load(ci) -> result, called on a worker thread
+        self.jobs = PriorityQueue()
+        self.results = Queue()
+        self.pending = {}  # ci -> token of the request still wanted
+        self._tokens = itertools.count()
+        self.workers = [threading.Thread(target=self._worker, daemon=True) for _ in range(max(1, workers))]
+        for worker in self.workers:
+            worker.start()
+
+    def request(self, ci, priority=0):
+        if ci in self.pending:
+            return
+        token = next(self._tokens)
+        self.pending[ci] = token
+        self.jobs.put((priority, token, ci))
+
+    def cancel(self, ci):
+        self.pending.pop(ci, None)
+
+    def cancel_all(self):
+        self.pending.clear()
+
+    def _worker(self):
+        while True:
+            _, token, ci = self.jobs.get()
+            if ci is None:
+                break
+            if self.pending.get(ci) != token:
+                continue  # Cancelled before a worker got to it
+            try:
+                result = self.load(ci)
+            except Exception as e:
+                log.error("Loading chunk %d failed: %s", ci, e, exc_info=True)
+                result = None
+            self.results.put((ci, token, result))
+
+    def ready(self):
+        """(ci, result) for every finished request still wanted; result is None if loading failed"""
+        finished = []
+        while True:
+            try:
+                ci, token, result = self.results.get_nowait()
+            except Empty:
+                break
+            if self.pending.get(ci) == token:
+                del self.pending[ci]
+                finished.append((ci, result))
+        return finished
+
+    def stop(self):
+        self.cancel_all()
+        for i, _ in enumerate(self.workers):
+            self.jobs.put((float("-inf"), -1 - i, None))
+        for worker in self.workers:
+            worker.join(timeout=1.0)
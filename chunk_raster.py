@@ -0,0 +1,153 @@
+import numpy as np
+import pygame
+import config as c
+import block as b
+from texture_manager import block_texture_key
+
+class ChunkTile:
+    """A rendered band of chunk rows and the blocks it was drawn from"""
+    __slots__ = ('surface', 'rows', 'entities', 'animated', 'frames')
+
+    def __init__(self, surface):
+        self.surface = surface
+        self.rows = None      # Copies of the rows last drawn
+        self.entities = ()    # (block, texture key) of block entities, whose texture changes in place
+        self.animated = {}    # block id -> pixel positions of its animated cells
+        self.frames = {}      # block id -> animation frame those cells show
+
+    def is_current(self, rows):
+        """True if ``rows`` still hold the blocks and entity textures this tile shows"""
+        return self.rows == rows and all(block_texture_key(block) == key for block, key in self.entities)
+
+class ChunkRasterizer:
+    """Draws chunk block grids onto chunk surfaces.
+
+    Registry blocks are shared instances, so their textures are resolved once
+    per block id. "blits" submits every (texture, dest) pair of a chunk in one
+    Surface.blits call; "numpy" composes the image from the block id array
+    with a stack of tile pixels and writes it through pygame.surfarray. Block
+    entities with their own texture (farmland growth stages) are blitted on
+    top either way. Cells of animated blocks are redrawn by animate() alone,
+    without touching the rest of the tile.
+    """
+
+    def __init__(self, texture_manager, blocks, mode=c.CHUNK_RASTERIZER):
+        self.texture_manager = texture_manager
+        self.mode = mode
+        self.blocks = list(blocks)  # block id -> registry block, None for unused ids
+        size = c.BLOCK_SIZE
+        self.textures = [None] * len(self.blocks)  # block id -> texture, None for air
+        self.frame_textures = {}  # block id -> texture per animation frame
+        self.frame_tiles = {}     # block id -> packed pixels per animation frame
+        self.shown_frames = {}    # block id -> frame in textures and the tile stack, None for the still texture
+        # Block id -> index into the tile stack; tile 0 is transparent. The extra
+        # last id stands for block entities, which are blitted separately
+        self.entity_id = len(self.blocks)
+        self.tile_index = np.zeros(len(self.blocks) + 1, dtype=np.intp)
+        self._layout = pygame.Surface((size, size), pygame.SRCALPHA)
+        tiles = [np.zeros((size, size), dtype=np.uint32)]
+        for block_id, block in enumerate(self.blocks):
+            if block is None or block is b.AIR:
+                continue
+            texture = texture_manager.get_texture(*block_texture_key(block))
+            self.textures[block_id] = texture
+            if block.animation_frames:
+                tint = block_texture_key(block)[1]
+                self.frame_textures[block_id] = [texture_manager.get_texture(tuple(frame), tint)
+                                                 for frame in block.animation_frames]
+                self.frame_tiles[block_id] = [self._pack(frame) for frame in self.frame_textures[block_id]]
+                self.shown_frames[block_id] = None
+            self.tile_index[block_id] = len(tiles)
+            tiles.append(self._pack(texture))
+        self.tiles = np.stack(tiles)
+
+    def _pack(self, texture):
+        """Pixels of a texture in the layout of a chunk surface, row by row"""
+        self._layout.fill((0, 0, 0, 0))
+        self._layout.blit(texture, (0, 0))
+        return pygame.surfarray.array2d(self._layout).T
+
+    def show_frames(self, clock):
+        """Draw animated blocks with their current frame from now on"""
+        for block_id, shown in self.shown_frames.items():
+            frame = clock.frame(self.blocks[block_id])
+            if frame != shown:
+                self.shown_frames[block_id] = frame
+                self.textures[block_id] = self.frame_textures[block_id][frame]
+                self.tiles[self.tile_index[block_id]] = self.frame_tiles[block_id][frame]
+
+    def render(self, surface, chunk, mode=None):
+        """Draw ``chunk`` onto the transparent ``surface``"""
+        if (mode or self.mode) == "numpy":
+            self.compose(surface, chunk)
+        else:
+            surface.blits(self.blit_sequence(chunk), doreturn=False)
+
+    def render_tile(self, tile, rows, clock=None):
+        """Redraw ``tile`` from ``rows`` and remember what it shows; animated blocks at ``clock``'s frame"""
+        if clock is not None:
+            self.show_frames(clock)
+        if self.mode != "numpy":
+            tile.surface.fill((0, 0, 0, 0))  # compose overwrites every pixel itself
+        self.render(tile.surface, rows)
+        size = c.BLOCK_SIZE
+        blocks, frame_textures = self.blocks, self.frame_textures
+        tile.rows = [row[:] for row in rows]
+        tile.entities = []
+        tile.animated = {}
+        tile.frames = dict(self.shown_frames)
+        for y, row in enumerate(rows):
+            for x, block in enumerate(row):
+                if blocks[block.id] is not block:
+                    tile.entities.append((block, block_texture_key(block)))
+                elif block.id in frame_textures:
+                    tile.animated.setdefault(block.id, []).append((x * size, y * size))
+
+    def animate(self, tile, clock):
+        """Redraw the animated cells of ``tile`` whose frame changed; returns how many were drawn"""
+        size = c.BLOCK_SIZE
+        drawn = 0
+        for block_id, cells in tile.animated.items():
+            frame = clock.frame(self.blocks[block_id])
+            if tile.frames.get(block_id) == frame:
+                continue
+            tile.frames[block_id] = frame
+            for x, y in cells:
+                tile.surface.fill((0, 0, 0, 0), (x, y, size, size))  # Water is translucent
+            texture = self.frame_textures[block_id][frame]
+            tile.surface.blits([(texture, cell) for cell in cells], doreturn=False)
+            drawn += len(cells)
+        return drawn
+
+    def _texture(self, block):
+        """Texture of a block that is not its registry instance"""
+        return self.texture_manager.get_texture(*block_texture_key(block))
+
+    def blit_sequence(self, chunk, x0=0, y0=0):
+        """(texture, dest) pairs for every non-air block of ``chunk``"""
+        size = c.BLOCK_SIZE
+        blocks, textures = self.blocks, self.textures
+        sequence = []
+        for y, row in enumerate(chunk, y0):
+            for x, block in enumerate(row, x0):
+                block_id = block.id
+                texture = textures[block_id] if blocks[block_id] is block else self._texture(block)
+                if texture is not None:
+                    sequence.append((texture, (x * size, y * size)))
+        return sequence
+
+    def compose(self, surface, chunk):
+        """Write the chunk image into ``surface`` from its block id array"""
+        size = c.BLOCK_SIZE
+        height, width = len(chunk), len(chunk[0])
+        blocks, entity_id = self.blocks, self.entity_id
+        ids = np.fromiter((block.id if blocks[block.id] is block else entity_id for row in chunk for block in row),
+                          dtype=np.intp, count=height * width).reshape(height, width)
+        pixels = self.tiles[self.tile_index[ids]]  # (y, x, tile row, tile column)
+        view = pygame.surfarray.pixels2d(surface).T  # Surface memory, indexed [y][x]
+        view.reshape(height, size, width, size)[...] = pixels.transpose(0, 2, 1, 3)
+        del view  # Unlocks the surface
+        entities = [(self._texture(chunk[y][x]), (x * size, y * size))
+                    for y, x in zip(*np.nonzero(ids == entity_id))]
+        if entities:
+            surface.blits(entities, doreturn=False)
@@ -0,0 +1,138 @@
+from collections import OrderedDict
+import config as c
+from worldgen import generate_chunk
+from chunk_loader import ChunkLoader
+from logger import get_logger
+
+log = get_logger("chunks")
+
+class ChunkStore:
+    """Loads chunks from memory, disk or the generator and persists them on unload.
+
+    Unloaded chunks stay in a small LRU so walking back and forth across a
+    chunk boundary never touches the disk. Modified chunks are written to the
+    region files when they are unloaded, so edits survive leaving the area.
+    Chunks that are not needed this frame can be requested instead of loaded;
+    worker threads read or generate them and collect() returns them later.
+    """
+
+    def __init__(self, save_manager, seed, chunk_width=c.CHUNK_WIDTH, world_height=c.WORLD_HEIGHT,
+                 cache_size=c.CHUNK_CACHE_SIZE):
+        self.save_manager = save_manager
+        self.seed = seed
+        self.chunk_width = chunk_width
+        self.world_height = world_height
+        self.cache_size = cache_size
+        self.cache = OrderedDict()  # ci -> chunk, least recently unloaded first
+        self.dirty = set()          # Loaded chunks whose blocks or block state changed since they were last written
+        self.stats = {'cache_hits': 0, 'disk_loads': 0, 'generated': 0, 'saved': 0}
+        self.loader = ChunkLoader(self._read)
+
+    def mark_dirty(self, ci):
+        """Record that a loaded chunk was modified, including the state of its chests, furnaces and farmland"""
+        self.dirty.add(ci)
+
+    def load(self, ci):
+        """Return chunk ``ci`` from the LRU, the region files or the generator"""
+        self.loader.cancel(ci)
+        chunk = self.cache.pop(ci, None)
+        if chunk is not None:
+            self.stats['cache_hits'] += 1
+            return chunk
+        chunk = self.save_manager.load_chunk(ci)
+        if chunk is not None:
+            self.stats['disk_loads'] += 1
+            log.debug("Loaded chunk %d from disk", ci)
+            return chunk
+        chunk = generate_chunk(ci, self.chunk_width, self.world_height, self.seed)
+        self._generated(ci, chunk)
+        return chunk
+
+    def _generated(self, ci, chunk):
+        self.stats['generated'] += 1
+        self.save_manager.remember_base(ci, chunk)
+        if ci in self.save_manager.corrupt_chunks:
+            self.dirty.add(ci)  # Replace the damaged copy on disk with the regenerated chunk
+
+    def adopt(self, ci, chunk):
+        """Accept a chunk generated in the background unless a saved copy exists"""
+        self.loader.cancel(ci)
+        if ci in self.cache or self.save_manager.has_saved_chunk(ci):
+            return self.load(ci)
+        self.save_manager.remember_base(ci, chunk)
+        return chunk
+
+    def _read(self, ci):
+        """Worker side of request(): (chunk, generated) from the region files or the generator"""
+        chunk = self.save_manager.load_chunk(ci)
+        if chunk is not None:
+            return chunk, False
+        return generate_chunk(ci, self.chunk_width, self.world_height, self.seed), True
+
+    def request(self, ci, priority=0):
+        """Return chunk ``ci`` if it is in memory, otherwise queue it for the workers and return None"""
+        chunk = self.cache.pop(ci, None)
+        if chunk is not None:
+            self.stats['cache_hits'] += 1
+            self.loader.cancel(ci)
+            return chunk
+        self.loader.request(ci, priority)
+        return None
+
+    def collect(self):
+        """(ci, chunk) pairs finished by the workers since the last call"""
+        loaded = []
+        for ci, result in self.loader.ready():
+            if result is None:
+                loaded.append((ci, self.load(ci)))  # Retry here so the error surfaces as it would have
+                continue
+            chunk, generated = result
+            if generated:
+                self._generated(ci, chunk)
+            else:
+                self.stats['disk_loads'] += 1
+                log.debug("Streamed chunk %d from disk", ci)
+            loaded.append((ci, chunk))
+        return loaded
+
+    def unload(self, ci, chunk):
+        """Persist a chunk if needed and keep it in the LRU"""
+        self.save(ci, chunk)
+        self.cache[ci] = chunk
+        self.cache.move_to_end(ci)
+        while len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)  # Already on disk if it had changes
+
+    def save(self, ci, chunk):
+        """Write a chunk if it was modified"""
+        if ci in self.dirty:
+            if self.save_manager.save_chunk(ci, chunk):
+                self.stats['saved'] += 1
+                log.debug("Saved chunk %d", ci)
+        self.dirty.discard(ci)
+
+    def save_loaded(self, world_chunks):
+        """Persist every loaded chunk that needs it, e.g. before quitting"""
+        for ci, chunk in world_chunks.items():
+            self.save(ci, chunk)
+        self.save_manager.flush()
+
+    def dirty_chunks(self, world_chunks):
+        """Loaded chunks that a save has to write"""
+        return [ci for ci in world_chunks if ci in self.dirty]
+
+    def mark_saved(self, chunk_indices):
+        self.dirty.difference_update(chunk_indices)
+
+    def mark_unsaved(self, chunk_indices):
+        """Mark chunks dirty again after their background save failed; safe from the saver's worker"""
+        self.dirty.update(chunk_indices)
+
+    def reset(self):
+        """Forget cached, dirty and requested chunks, e.g. after loading a save"""
+        self.loader.cancel_all()
+        self.cache.clear()
+        self.dirty.clear()
+
+    def stop(self):
+        self.loader.stop()
@@ -1,4 +1,5 @@
 import config as c
+import logger
 from block_loader import BlockLoader
 from item import ITEM_REGISTRY  # Add this to access items
 
@@ -9,6 +10,7 @@ class CommandManager:
         self.block_loader = BlockLoader()
         self.blocks = self.block_loader.load_blocks()
         self.items = ITEM_REGISTRY  # Add access to item registry
+        self.profile_capture = None  # Set by the game loop to enable 'profile'
         print("Available items:", [item_id for item_id in self.items.keys()])
 
     def execute_command(self, command_str, player, inventory, mobs):
@@ -35,6 +37,10 @@ class CommandManager:
         elif cmd == "setweather":
             # Let Console handle this command.
             return
+        elif cmd == "profile":
+            self.handle_profile(tokens[1:])
+        elif cmd == "log":
+            self.handle_log(tokens[1:])
         elif cmd == "spawn_entity":
             try:
                 entity_type = tokens[1]
@@ -61,6 +67,48 @@ class CommandManager:
         else:
             print("[WARN] Unknown command:", cmd)
 
+    def handle_profile(self, args):
+        """profile start | profile stop [file] | profile frames <n> | profile status"""
+        write = self.game.write if self.game else print
+        if self.profile_capture is None:
+            write("Profiling is not available")
+            return
+        action = args[0].lower() if args else "status"
+        if action == "start":
+            self.profile_capture.start()
+        elif action == "stop":
+            self.profile_capture.stop(args[1] if len(args) > 1 else None)
+        elif action == "frames":
+            try:
+                frames = int(args[1])
+                if frames <= 0:
+                    raise ValueError(frames)
+            except (IndexError, ValueError):
+                write("Usage: profile frames <n>")
+                return
+            self.profile_capture.start(frames)
+        elif action == "status":
+            write(self.profile_capture.status())
+        else:
+            write("Usage: profile start | profile stop [file] | profile frames <n> | profile status")
+
+    def handle_log(self, args):
+        """log | log <subsystem|all> <level>"""
+        write = self.game.write if self.game else print
+        if not args:
+            for subsystem, level in logger.effective_levels().items():
+                write(f"{subsystem}: {level}")
+            return
+        if len(args) != 2:
+            write("Usage: log <subsystem|all> <debug|info|warning|error>")
+            return
+        try:
+            logger.set_level(args[0].lower(), args[1])
+        except ValueError as e:
+            write(str(e))
+            return
+        write(f"Log level for {args[0].lower()} set to {args[1].upper()}")
+
     def handle_spawn_item(self, args):
         if len(args) < 2:
             print("Usage: spawn_item <item_id|item_name> <quantity>")
@@ -51,5 +51,41 @@ ENTITY_KNOCKBACK_LIFT = 8  # Upward force of knockback
 # Performance settings
 PLANT_UPDATE_INTERVAL = 1000  # Milliseconds between plant growth updates
 MAX_VISIBLE_CHUNKS = 5        # Maximum chunks to render/update at once
-TEXTURE_CACHE_SIZE = 100      # Maximum number of textures to cache
+TEXTURE_CACHE_SIZE = 100      # Textures kept in the LRU besides the pinned block textures
+TEXTURE_CACHE_BYTES = 512 * 1024  # Byte limit of that LRU (a 16x16 texture is 1 KiB)
+TEXTURE_CACHE_DIR = "cache"   # Packed texture atlas, rebuilt only when texture_atlas.png changes
+TEXT_CACHE_SIZE = 256         # Rendered strings kept for HUD and UI text; numbers are drawn from digit glyphs
+CHUNK_RASTERIZER = "numpy"    # "numpy" composes chunk images from block id arrays, "blits" submits one Surface.blits per chunk
+CHUNK_TILE_ROWS = 15          # Block rows per rendered chunk tile; only tiles on screen are drawn
+SURFACE_POOL_BYTES = 32 * 1024 * 1024  # Cap on chunk tile surfaces (a 15-row tile is 750 KiB); least recently seen go first
+ANIMATE_BLOCKS = True         # Cycle the animation_frames of water and leaves; only those cells are redrawn
 FARM_CHUNK_DISTANCE = 2       # Only update farms within this many chunks of player
+
+# Frame profiler settings
+PROFILER_HISTORY = 300        # Frames kept for the overlay graph, histograms and CSV dumps
+PROFILER_DUMP_DIR = "profiles"  # Directory for frame-time CSV dumps
+PROFILE_TOP_N = 8             # Functions listed after a console profile capture
+PROFILE_SORT = "tottime"      # "tottime" (self time) or "cumulative"
+
+# Logging: default level plus per-subsystem overrides ("DEBUG", "INFO", "WARNING", "ERROR").
+# Subsystems: inventory, world, world_item, furnace, farming, chunks. Change at runtime with "log <subsystem|all> <level>".
+LOG_LEVEL = "WARNING"
+LOG_LEVELS = {
+    # "furnace": "DEBUG",
+}
+
+# Save format: "region" stores chunks palette-encoded in region files, "json" writes one world JSON
+SAVE_FORMAT = "region"
+REGION_SIZE = 32              # Chunks per region file
+REGION_COMPRESSION_LEVEL = 6  # zlib level for chunk payloads (1 = fastest, 9 = smallest)
+CHUNK_CACHE_SIZE = 16         # Unloaded chunks kept in memory before relying on disk
+CHUNK_SAVE_MODE = "delta"     # "delta" stores only cells that differ from generated terrain, "full" every cell
+DELTA_BASE_CACHE = 32         # Generated chunks remembered (as id arrays) to diff against when saving
+
+# Autosave: dirty chunks and player data are written a few at a time, never the whole world at once
+AUTOSAVE_INTERVAL = 30000     # Milliseconds between autosave passes (0 disables autosave)
+AUTOSAVE_CHUNKS_PER_FRAME = 2 # Dirty chunks snapshotted per frame while a pass is running
+
+# Chunk streaming: chunks this close to the player load at once, the rest of the view on worker threads
+CHUNK_SYNC_RADIUS = 1         # Chunks left/right of the player's chunk loaded before the frame continues
+CHUNK_LOAD_WORKERS = 2        # Threads reading, decoding and generating chunks
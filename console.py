@@ -32,7 +32,7 @@ class Console:
         self.selection_start = None
         self.selection_end = None
         self.cursor_position = 0  # Initialize cursor position
-        self.max_lines = 10  # Add max lines for output history
+        self.max_lines = 15  # Add max lines for output history
 
         # Initialize the scrap system
         pygame.scrap.init()
@@ -177,6 +177,12 @@ class Console:
         # Otherwise pass to command manager
         self.manager.execute_command(command_line, self.player, self.inventory, self.mobs)
 
+    def write(self, line):
+        """Append a line to the console output (also echoed to stdout)"""
+        print(f"Console: {line}")
+        self.output_lines.append(line)
+        self.output_lines = self.output_lines[-self.max_lines:]
+
     def set_day(self, args):
         self.output_lines.append("Time set to day")
         print("Console Command: Time set to day")
@@ -220,6 +226,17 @@ class Console:
         overlay.fill((50, 50, 50, 200))
         screen.blit(overlay, rect.topleft)
         pygame.draw.rect(screen, (255, 255, 255), rect, 2)
+        # Draw command output above the input line, newest at the bottom
+        line_height = self.font.get_linesize()
+        if self.output_lines:
+            output_rect = pygame.Rect(0, rect.y - line_height * len(self.output_lines) - 6,
+                                      self.screen_width, line_height * len(self.output_lines) + 6)
+            output_overlay = pygame.Surface(output_rect.size, flags=pygame.SRCALPHA)
+            output_overlay.fill((30, 30, 30, 170))
+            screen.blit(output_overlay, output_rect.topleft)
+            for i, line in enumerate(self.output_lines):
+                line_surface = self.font.render(line.replace('\x00', ''), True, (220, 220, 220))
+                screen.blit(line_surface, (5, output_rect.y + 3 + i * line_height))
         blink = "_" if (pygame.time.get_ticks() // 500) % 2 == 0 else " "
         # Filter out null characters from input text
         safe_input_text = self.input_text.replace('\x00', '')
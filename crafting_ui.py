@@ -5,6 +5,8 @@ from scrollable_list import ScrollableList
 from item import Item
 from ui_tooltip import Tooltip, get_item_tooltip
 from ui_manager import UIManager
+from text_cache import TEXT_CACHE
+from icon_cache import ICON_CACHE
 
 class CraftingUI:
     def __init__(self, screen, inventory, atlas):
@@ -12,7 +14,7 @@ class CraftingUI:
         self.inventory = inventory
         self.atlas = atlas
         self.crafting = Crafting()
-        self.font = pygame.font.SysFont(None, 24)
+        self.font = TEXT_CACHE.font(24)
         self.running = True
         self.recipes = list(self.crafting.recipes.keys())
         self.selected_recipe = 0  # ensure selected_recipe is defined
@@ -58,13 +60,6 @@ class CraftingUI:
         self.scroll_rect = pygame.Rect(100, 150, 300, 400)
 
         self.ui_manager = UIManager(screen)
-        self.crafting_batch = self.ui_manager.create_batch('crafting')
-        self.ingredients_batch = self.ui_manager.create_batch('ingredients')
-        self.result_batch = self.ui_manager.create_batch('result')
-        
-        # Add frame tracking
-        self._last_frame_ingredients = {}
-        self._last_frame_result = None
 
         # Add position calculations for all UI elements
         screen_center_x = c.SCREEN_WIDTH // 2
@@ -152,7 +147,7 @@ class CraftingUI:
                     if 0 <= item_index < len(self.recipes):
                         self.selected_recipe = item_index
             self.draw()
-            pygame.display.flip()
+            self.ui_manager.present()
 
     def handle_event(self, event):
         if event.type == pygame.KEYDOWN:
@@ -215,15 +210,12 @@ class CraftingUI:
                 return i
         return None
 
-    def draw(self):
-        """Draw the crafting UI with batched rendering"""
-        self.ui_manager.begin_frame()
-        
-        # Draw background
-        self.screen.fill((30, 30, 30))
+    def draw_background(self, surface):
+        """Static part of the screen, painted once"""
+        surface.fill((30, 30, 30))
         bg_overlay = pygame.Surface((c.SCREEN_WIDTH, c.SCREEN_HEIGHT), pygame.SRCALPHA)
         bg_overlay.fill((0, 0, 0, 200))
-        self.screen.blit(bg_overlay, (0, 0))
+        surface.blit(bg_overlay, (0, 0))
         
         # Draw section titles
         title_color = (200, 200, 200)
@@ -232,63 +224,15 @@ class CraftingUI:
         result_title = self.font.render("Result", True, title_color)
         
         # Position titles
-        self.screen.blit(crafting_title, (c.SCREEN_WIDTH//2 - crafting_title.get_width()//2, 20))
-        self.screen.blit(ingredients_title, (self.ingredients_start_x, self.ingredients_start_y - 25))
-        self.screen.blit(result_title, (self.result_x, self.result_y - 25))
-        
-        # Draw crafting slots
-        for i, recipe in enumerate(self.visible_recipes):
-            slot_id = f"recipe_{i}"
-            if slot_id in self.crafting_batch.dirty or recipe != self._last_frame_recipes.get(i):
-                surface = self._render_recipe_slot(recipe, i == self.selected_recipe)
-                self.ui_manager.draw_ui_element(self.crafting_batch, slot_id, surface,
-                    (self.crafting_start_x + i * (self.slot_size + self.padding), self.crafting_start_y), True)
-        
-        # Draw ingredient slots
-        for i, slot in enumerate(self.current_ingredients):
-            slot_id = f"ingredient_{i}"
-            if slot_id in self.ingredients_batch.dirty or slot != self._last_frame_ingredients.get(i):
-                surface = self._render_ingredient_slot(slot)
-                self.ui_manager.draw_ui_element(self.ingredients_batch, slot_id, surface,
-                    self._get_ingredient_pos(i), True)
-        
-        # Draw result slot
-        if self.result_item != self._last_frame_result:
-            surface = self._render_result_slot()
-            self.ui_manager.draw_ui_element(self.result_batch, "result", surface,
-                (self.result_x, self.result_y), True)
-        
-        # Update frame cache
-        self._last_frame_recipes = {i: recipe for i, recipe in enumerate(self.visible_recipes)}
-        self._last_frame_ingredients = {i: slot for i, slot in enumerate(self.current_ingredients)}
-        self._last_frame_result = self.result_item
-        
-        # Draw crafting progress if active
-        if self.crafting_progress > 0:
-            progress_width = int(self.slot_size * (self.crafting_progress / self.crafting_time))
-            progress_rect = pygame.Rect(self.result_x, self.result_y + self.slot_size + 5,
-                                     progress_width, 5)
-            pygame.draw.rect(self.screen, (0, 255, 0), progress_rect)
-        
-        # Draw dragged item last
-        if self.dragging_item:
-            mx, my = pygame.mouse.get_pos()
-            self._render_dragged_item(mx, my)
-
-        # Draw tooltip if hovering over an item
-        mouse_pos = pygame.mouse.get_pos()
-        if self.hovered_item and not self.dragging_item:
-            tooltip_text = get_item_tooltip(self.hovered_item)
-            self.tooltip.draw(self.screen, tooltip_text, (mouse_pos[0] + 15, mouse_pos[1] + 15))
+        surface.blit(crafting_title, (c.SCREEN_WIDTH//2 - crafting_title.get_width()//2, 20))
+        surface.blit(ingredients_title, (self.ingredients_start_x, self.ingredients_start_y - 25))
+        surface.blit(result_title, (self.result_x, self.result_y - 25))
 
         # Draw recipe list background
         recipe_bg = pygame.Rect(self.recipe_list_x - 10, self.recipe_list_y - 10,
                               320, 420)
-        pygame.draw.rect(self.screen, (40, 40, 40), recipe_bg)
-        pygame.draw.rect(self.screen, (100, 100, 100), recipe_bg, 2)
-
-        # Update recipe list draw call with required arguments
-        self.recipe_list.draw(self.screen, self.font, self.selected_recipe)
+        pygame.draw.rect(surface, (40, 40, 40), recipe_bg)
+        pygame.draw.rect(surface, (100, 100, 100), recipe_bg, 2)
 
         # Draw inventory grid background
         inventory_bg = pygame.Rect(
@@ -297,8 +241,28 @@ class CraftingUI:
             8 * (self.slot_size + self.slot_padding) + 20,
             4 * (self.slot_size + self.slot_padding) + 20
         )
-        pygame.draw.rect(self.screen, (40, 40, 40), inventory_bg)
-        pygame.draw.rect(self.screen, (100, 100, 100), inventory_bg, 2)
+        pygame.draw.rect(surface, (40, 40, 40), inventory_bg)
+        pygame.draw.rect(surface, (100, 100, 100), inventory_bg, 2)
+
+    def draw(self):
+        """Draw the crafting UI; only widgets whose state changed are repainted"""
+        self.ui_manager.retain(self.draw_background)
+
+        # Recipe list, repainted when scrolled or the selection moves
+        list_state = (self.recipe_list.scroll_offset, self.selected_recipe)
+        self.ui_manager.draw_widget("recipes", self.recipe_list.rect, list_state,
+                                    lambda surface: self.recipe_list.draw(surface, self.font, self.selected_recipe))
+
+        # Selected recipe details, repainted when the selection or what the player can afford changes
+        details_rect = pygame.Rect(c.SCREEN_WIDTH // 2, self.ingredients_start_y - 30,
+                                   c.SCREEN_WIDTH // 2, self.inventory_start_y - 10 - (self.ingredients_start_y - 30))
+        if 0 <= self.selected_recipe < len(self.recipes):
+            recipe = self.crafting.recipes[self.recipes[self.selected_recipe]]
+            affordable = tuple(self.inventory.has_items([(ingredient["item_id"], ingredient["quantity"])])
+                               for ingredient in recipe["ingredients"])
+            details_state = (self.selected_recipe, affordable, self.crafting_progress)
+            self.ui_manager.draw_widget("details", details_rect, details_state,
+                                        lambda surface: self.draw_recipe_details(surface, recipe, affordable))
 
         # Draw inventory slots
         for i in range(len(self.inventory.main)):
@@ -306,100 +270,89 @@ class CraftingUI:
             col = i % 8
             x = self.inventory_start_x + col * (self.slot_size + self.slot_padding)
             y = self.inventory_start_y + row * (self.slot_size + self.slot_padding)
-            
-            # Draw slot background
-            slot_rect = pygame.Rect(x, y, self.slot_size, self.slot_size)
-            pygame.draw.rect(self.screen, (50, 50, 50), slot_rect)
-            pygame.draw.rect(self.screen, (100, 100, 100), slot_rect, 1)
-            
-            # Draw item if present
             slot = self.inventory.main[i]
-            if slot and slot.get("item"):
-                self.draw_item(slot, slot_rect)
-
-        # Draw selected recipe details
-        if 0 <= self.selected_recipe < len(self.recipes):
-            recipe_key = self.recipes[self.selected_recipe]
-            recipe = self.crafting.recipes[recipe_key]
-            
-            # Draw ingredients list
-            y_offset = self.ingredients_start_y
-            ingredients_header = self.font.render("Required:", True, (200, 200, 200))
-            self.screen.blit(ingredients_header, (self.ingredients_start_x, y_offset))
-            y_offset += 30
-            
-            for ingredient in recipe["ingredients"]:
-                # Get ingredient name - try different keys or use item_id as fallback
-                ingredient_name = ingredient.get("name",                  # Try name key first
-                               ingredient.get("item_name",                # Try item_name second
-                               str(ingredient.get("item_id", "Unknown"))) # Use item_id as fallback
-                               )
-                
-                text = f"{ingredient['quantity']}x {ingredient_name}"
-                # Check if player has enough
-                has_enough = self.inventory.has_items([(ingredient["item_id"], ingredient["quantity"])])
-                color = (0, 255, 0) if has_enough else (255, 0, 0)
-                surf = self.font.render(text, True, color)
-                self.screen.blit(surf, (self.ingredients_start_x, y_offset))
-                y_offset += 25
-
-            # Draw result preview with fixed result handling
-            result_text = self.font.render("Result:", True, (200, 200, 200))
-            self.screen.blit(result_text, (self.result_x, self.result_y - 30))
-            
-            result_rect = pygame.Rect(self.result_x, self.result_y, self.slot_size, self.slot_size)
-            pygame.draw.rect(self.screen, (60, 60, 60), result_rect)
-            pygame.draw.rect(self.screen, (120, 120, 120), result_rect, 2)
-            
-            # Draw craft button with updated style
-            can_craft = self.inventory.has_items([(i["item_id"], i["quantity"]) for i in recipe["ingredients"]])
-            button_color = (0, 150, 0) if can_craft else (100, 100, 100)
-            hover_color = (0, 200, 0) if can_craft else (120, 120, 120)
-            
-            mouse_pos = pygame.mouse.get_pos()
-            if self.craft_button_rect.collidepoint(mouse_pos) and can_craft:
-                pygame.draw.rect(self.screen, hover_color, self.craft_button_rect)
-            else:
-                pygame.draw.rect(self.screen, button_color, self.craft_button_rect)
-            
-            pygame.draw.rect(self.screen, (200, 200, 200), self.craft_button_rect, 2)
-            
-            button_text = self.font.render("Craft", True, (255, 255, 255))
-            text_rect = button_text.get_rect(center=self.craft_button_rect.center)
-            self.screen.blit(button_text, text_rect)
-            
-            # Draw the result item
-            if "result" in recipe:
-                result_item = recipe["result"]
-                if isinstance(result_item, dict):
-                    self.draw_item(result_item, result_rect)
-                else:
-                    self.draw_item({"item": result_item, "quantity": 1}, result_rect)
-
-        # Draw craft button
-        pygame.draw.rect(self.screen, (0, 100, 0), self.craft_button_rect)
-        pygame.draw.rect(self.screen, (0, 200, 0), self.craft_button_rect, 2)
-        
-        button_text = self.font.render("Craft", True, (255, 255, 255))
-        text_rect = button_text.get_rect(center=self.craft_button_rect.center)
-        self.screen.blit(button_text, text_rect)
+            self.draw_slot(f"inventory_{i}", pygame.Rect(x, y, self.slot_size, self.slot_size), slot)
 
         # Draw dragged item
+        mouse_pos = pygame.mouse.get_pos()
         if self.dragging_item:
-            mouse_pos = pygame.mouse.get_pos()
+            dragged = self.dragging_item
             drag_rect = pygame.Rect(
                 mouse_pos[0] - self.slot_size//2,
                 mouse_pos[1] - self.slot_size//2,
                 self.slot_size,
                 self.slot_size
             )
-            self.draw_item(self.dragging_item, drag_rect)
+            self.ui_manager.draw_overlay(drag_rect, (dragged["item"], dragged.get("quantity")),
+                                         lambda screen: self.draw_item(screen, dragged, drag_rect))
 
         # Draw tooltip if hovering over an item
         if self.hovered_item and not self.dragging_item:
-            mouse_pos = pygame.mouse.get_pos()
             tooltip_text = get_item_tooltip(self.hovered_item)
-            self.tooltip.draw(self.screen, tooltip_text, (mouse_pos[0] + 15, mouse_pos[1] + 15))
+            self.ui_manager.draw_tooltip(self.tooltip, tooltip_text, (mouse_pos[0] + 15, mouse_pos[1] + 15))
+
+    def draw_slot(self, slot_id, rect, slot):
+        """Inventory slot widget, repainted when its item or quantity changes"""
+        def draw(surface):
+            pygame.draw.rect(surface, (50, 50, 50), rect)
+            pygame.draw.rect(surface, (100, 100, 100), rect, 1)
+            if slot and slot.get("item"):
+                self.draw_item(surface, slot, rect)
+
+        state = (slot.get("item"), slot.get("quantity")) if slot else (None, 0)
+        self.ui_manager.draw_widget(slot_id, rect, state, draw)
+
+    def draw_recipe_details(self, surface, recipe, affordable):
+        """Ingredients, result and craft button of the selected recipe"""
+        # Draw ingredients list
+        y_offset = self.ingredients_start_y
+        ingredients_header = self.font.render("Required:", True, (200, 200, 200))
+        surface.blit(ingredients_header, (self.ingredients_start_x, y_offset))
+        y_offset += 30
+        
+        for ingredient, has_enough in zip(recipe["ingredients"], affordable):
+            # Get ingredient name - try different keys or use item_id as fallback
+            ingredient_name = ingredient.get("name",                  # Try name key first
+                           ingredient.get("item_name",                # Try item_name second
+                           str(ingredient.get("item_id", "Unknown"))) # Use item_id as fallback
+                           )
+            
+            text = f"{ingredient['quantity']}x {ingredient_name}"
+            color = (0, 255, 0) if has_enough else (255, 0, 0)
+            surf = self.font.render(text, True, color)
+            surface.blit(surf, (self.ingredients_start_x, y_offset))
+            y_offset += 25
+
+        # Draw result preview with fixed result handling
+        result_text = self.font.render("Result:", True, (200, 200, 200))
+        surface.blit(result_text, (self.result_x, self.result_y - 30))
+        
+        result_rect = pygame.Rect(self.result_x, self.result_y, self.slot_size, self.slot_size)
+        pygame.draw.rect(surface, (60, 60, 60), result_rect)
+        pygame.draw.rect(surface, (120, 120, 120), result_rect, 2)
+        
+        # Draw the result item
+        if "result" in recipe:
+            result_item = recipe["result"]
+            if isinstance(result_item, dict):
+                self.draw_item(surface, result_item, result_rect)
+            else:
+                self.draw_item(surface, {"item": result_item, "quantity": 1}, result_rect)
+
+        # Draw crafting progress if active
+        if self.crafting_progress > 0:
+            progress_width = int(self.slot_size * (self.crafting_progress / self.crafting_time))
+            progress_rect = pygame.Rect(self.result_x, self.result_y + self.slot_size + 5,
+                                     progress_width, 5)
+            pygame.draw.rect(surface, (0, 255, 0), progress_rect)
+
+        # Draw craft button
+        pygame.draw.rect(surface, (0, 100, 0), self.craft_button_rect)
+        pygame.draw.rect(surface, (0, 200, 0), self.craft_button_rect, 2)
+        
+        button_text = self.font.render("Craft", True, (255, 255, 255))
+        text_rect = button_text.get_rect(center=self.craft_button_rect.center)
+        surface.blit(button_text, text_rect)
 
     def _render_recipe_slot(self, recipe, selected):
         """Create a surface for a recipe slot"""
@@ -416,28 +369,24 @@ class CraftingUI:
             item = recipe.result["item"]
             if hasattr(item, 'texture_coords'):
                 tx, ty = item.texture_coords
-                texture_rect = pygame.Rect(tx * c.BLOCK_SIZE, ty * c.BLOCK_SIZE, c.BLOCK_SIZE, c.BLOCK_SIZE)
-                item_texture = self.texture_atlas.subsurface(texture_rect)
-                scaled_texture = pygame.transform.scale(item_texture, (self.slot_size-8, self.slot_size-8))
+                scaled_texture = ICON_CACHE.icon(self.texture_atlas, (tx, ty), self.slot_size-8)
                 surface.blit(scaled_texture, (4, 4))
         
         return surface
 
     # Add similar render methods for ingredients and result slots...
 
-    def draw_item(self, slot, rect):
+    def draw_item(self, surface, slot, rect):
         """Draw an item in a slot"""
         if slot and slot.get("item"):
             item = slot["item"]
             if hasattr(item, 'texture_coords'):
                 tx, ty = item.texture_coords
-                texture_rect = pygame.Rect(tx * c.BLOCK_SIZE, ty * c.BLOCK_SIZE, c.BLOCK_SIZE, c.BLOCK_SIZE)
-                item_img = self.atlas.subsurface(texture_rect)
-                scaled_img = pygame.transform.scale(item_img, (self.slot_size-8, self.slot_size-8))
-                self.screen.blit(scaled_img, (rect.x + 4, rect.y + 4))
+                scaled_img = ICON_CACHE.icon(self.atlas, (tx, ty), self.slot_size-8)
+                surface.blit(scaled_img, (rect.x + 4, rect.y + 4))
                 
                 # Draw quantity if more than 1
                 quantity = slot.get("quantity", 0)
                 if quantity > 1:
                     quantity_text = self.font.render(str(quantity), True, (255, 255, 255))
-                    self.screen.blit(quantity_text, (rect.right - 20, rect.bottom - 20))
+                    surface.blit(quantity_text, (rect.right - 20, rect.bottom - 20))
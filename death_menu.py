@@ -1,11 +1,12 @@
 import pygame
+from text_cache import TEXT_CACHE
 
 class DeathMenu:
     def __init__(self, screen_width, screen_height):
         self.screen_width = screen_width
         self.screen_height = screen_height
-        self.font = pygame.font.SysFont(None, 72)  # Larger font for death message
-        self.button_font = pygame.font.SysFont(None, 48)  # Smaller font for buttons
+        self.font = TEXT_CACHE.font(72)  # Larger font for death message
+        self.button_font = TEXT_CACHE.font(48)  # Smaller font for buttons
         
         # Create buttons
         button_width = 200
@@ -2,7 +2,8 @@ import random
 import block as b
 
 class DungeonGenerator:
-    def __init__(self, min_rooms=3, max_rooms=5):
+    def __init__(self, min_rooms=3, max_rooms=5, rng=random):
+        self.rng = rng  # Seeded per chunk so a chunk always gets the same dungeon
         self.min_rooms = min_rooms
         self.max_rooms = max_rooms
         self.rooms = []
@@ -40,7 +41,7 @@ class DungeonGenerator:
             'y': start_y,
             'width': self.room_size,
             'height': self.room_size,
-            'type': random.choice(['spawner', 'loot'])
+            'type': self.rng.choice(['spawner', 'loot'])
         }
         
         if first_room['type'] == 'spawner':
@@ -52,11 +53,11 @@ class DungeonGenerator:
         last_room = first_room
 
         # Generate additional rooms
-        room_count = random.randint(self.min_rooms, self.max_rooms)
+        room_count = self.rng.randint(self.min_rooms, self.max_rooms)
         for i in range(1, room_count):
             # Decide direction (right or down)
-            direction = random.choice(['right', 'down'])
-            hallway_length = random.randint(5, 8)  # Shorter hallways
+            direction = self.rng.choice(['right', 'down'])
+            hallway_length = self.rng.randint(5, 8)  # Shorter hallways
             
             # Calculate new room position
             if direction == 'right':
@@ -70,7 +71,7 @@ class DungeonGenerator:
             if i == room_count - 1:  # Last room
                 if not self.has_spawner and not self.has_storage:
                     # Force either spawner or storage if neither exists
-                    room_type = random.choice(['spawner', 'loot'])
+                    room_type = self.rng.choice(['spawner', 'loot'])
                 elif not self.has_spawner:
                     room_type = 'spawner'
                 elif not self.has_storage:
@@ -79,9 +80,9 @@ class DungeonGenerator:
                     room_type = 'empty'
             else:
                 # Random type with preference for missing special rooms
-                if not self.has_spawner and random.random() < 0.4:
+                if not self.has_spawner and self.rng.random() < 0.4:
                     room_type = 'spawner'
-                elif not self.has_storage and random.random() < 0.4:
+                elif not self.has_storage and self.rng.random() < 0.4:
                     room_type = 'loot'
                 else:
                     room_type = 'empty'
@@ -1,17 +1,22 @@
 import pygame
+import copy
 import json
 import config as c
 from block import ENHANCER  # Add this import
 from ui_tooltip import Tooltip, get_item_tooltip
+from ui_manager import UIManager
+from text_cache import TEXT_CACHE
+from icon_cache import ICON_CACHE
 
 class EnhancerUI:
     def __init__(self, screen, player_inventory, atlas):
         self.screen = screen
         self.inventory = player_inventory
         self.atlas = atlas
-        self.font = pygame.font.SysFont(None, 24)
+        self.font = TEXT_CACHE.font(24)
         self.running = True
         self.tooltip = Tooltip(self.font)
+        self.ui_manager = UIManager(screen)
         
         # Load enhancement recipes
         with open('enhancement_recipes.json', 'r') as f:
@@ -82,16 +87,19 @@ class EnhancerUI:
         """Apply enhancement if possible"""
         recipe = self.can_enhance()
         if recipe:
-            # Create enhanced copy of item
+            # Create enhanced copy of item; registry items are shared by every slot holding them
+            original = self.item_in_slot["item"]
             enhanced_item = dict(self.item_in_slot)
+            enhanced_item["item"] = copy.copy(original)
+            enhanced_item["item"].modifiers = dict(original.modifiers)
             enhanced_item["item"].apply_enhancement(
                 recipe["modifiers"],
                 recipe["result_suffix"]
             )
             
             # If item is equipped, update player stats
-            if enhanced_item["item"] in self.inventory.player.equipped_items:
-                self.inventory.player.unequip_item(self.item_in_slot["item"])
+            if original in self.inventory.player.equipped_items:
+                self.inventory.player.unequip_item(original)
                 self.inventory.player.equip_item(enhanced_item["item"])
                 
             # Consume ingredients
@@ -104,28 +112,30 @@ class EnhancerUI:
             return True
         return False
 
-    def draw(self):
-        """Draw the enhancer UI"""
-        # Background
-        self.screen.fill((30, 30, 30))
+    def draw_background(self, surface):
+        """Static part of the screen, painted once"""
+        surface.fill((30, 30, 30))
         title = self.font.render("Item Enhancer", True, (255, 255, 255))
-        self.screen.blit(title, (c.SCREEN_WIDTH//2 - title.get_width()//2, 20))
+        surface.blit(title, (c.SCREEN_WIDTH//2 - title.get_width()//2, 20))
+
+        inventory_label = self.font.render("Inventory", True, (255, 255, 255))
+        surface.blit(inventory_label, (self.inventory_start_x, self.inventory_start_y - 25))
+        hotbar_label = self.font.render("Hotbar", True, (255, 255, 255))
+        surface.blit(hotbar_label, (self.hotbar_start_x, self.hotbar_start_y - 25))
 
-        # Draw slots
-        pygame.draw.rect(self.screen, (70, 70, 70), self.item_slot)
-        pygame.draw.rect(self.screen, (70, 70, 70), self.ingredient_slot)
-        pygame.draw.rect(self.screen, (200, 200, 200), self.item_slot, 2)
-        pygame.draw.rect(self.screen, (200, 200, 200), self.ingredient_slot, 2)
+        # Draw enhance button
+        pygame.draw.rect(surface, (50, 150, 50), self.enhance_button)
+        pygame.draw.rect(surface, (200, 200, 200), self.enhance_button, 2)
+        enhance_text = self.font.render("Enhance", True, (255, 255, 255))
+        surface.blit(enhance_text, enhance_text.get_rect(center=self.enhance_button.center))
 
-        # Draw items in slots
-        if self.item_in_slot:
-            self.draw_item(self.item_in_slot, self.item_slot)
-        if self.ingredient_in_slot:
-            self.draw_item(self.ingredient_in_slot, self.ingredient_slot)
+    def draw(self):
+        """Draw the enhancer UI; only widgets whose state changed are repainted"""
+        self.ui_manager.retain(self.draw_background)
 
-        # Draw inventory section
-        inventory_label = self.font.render("Inventory", True, (255, 255, 255))
-        self.screen.blit(inventory_label, (self.inventory_start_x, self.inventory_start_y - 25))
+        # Draw enhancer slots
+        self.draw_slot("item", self.item_slot, self.item_in_slot)
+        self.draw_slot("ingredient", self.ingredient_slot, self.ingredient_in_slot)
 
         # Draw main inventory
         for i in range(len(self.inventory.main)):
@@ -134,42 +144,41 @@ class EnhancerUI:
             x = self.inventory_start_x + col * (self.slot_size + self.padding)
             y = self.inventory_start_y + row * (self.slot_size + self.padding)
             rect = pygame.Rect(x, y, self.slot_size, self.slot_size)
-            
-            pygame.draw.rect(self.screen, (70, 70, 70), rect)
-            pygame.draw.rect(self.screen, (200, 200, 200), rect, 2)
-            
-            slot = self.inventory.main[i]
-            if slot and slot.get("item"):
-                self.draw_item(slot, rect)
-
-        # Draw hotbar section
-        hotbar_label = self.font.render("Hotbar", True, (255, 255, 255))
-        self.screen.blit(hotbar_label, (self.hotbar_start_x, self.hotbar_start_y - 25))
+            self.draw_slot(f"inventory_{i}", rect, self.inventory.main[i])
 
         # Draw hotbar slots
         for i in range(len(self.inventory.hotbar)):
             x = self.hotbar_start_x + i * (self.slot_size + self.padding)
             rect = pygame.Rect(x, self.hotbar_start_y, self.slot_size, self.slot_size)
-            
-            pygame.draw.rect(self.screen, (70, 70, 70), rect)
-            pygame.draw.rect(self.screen, (200, 200, 200), rect, 2)
-            
-            if i == self.inventory.selected_hotbar_index:
-                pygame.draw.rect(self.screen, (255, 215, 0), rect.inflate(6, 6), 3)
-            
-            slot = self.inventory.hotbar[i]
-            if slot and slot.get("item"):
-                self.draw_item(slot, rect)
+            self.draw_slot(f"hotbar_{i}", rect, self.inventory.hotbar[i], i == self.inventory.selected_hotbar_index)
+
+        # Draw recipe hint if valid combination
+        recipe = self.can_enhance()
+        hint_text = None
+        if recipe:
+            hint_text = f"Click enhance to create: {self.item_in_slot['item'].name} {recipe['result_suffix']}"
+        hint_pos = (self.enhance_button.x, self.enhance_button.bottom + 10)
+        hint_rect = pygame.Rect(hint_pos, (c.SCREEN_WIDTH - hint_pos[0], self.font.get_linesize()))
+        self.ui_manager.draw_widget("hint", hint_rect, hint_text,
+                                    lambda surface: self.draw_hint(surface, hint_text, hint_pos))
+
+        # Draw debug log (last 5 messages)
+        messages = tuple(self.debug_log[-5:])
+        self.ui_manager.draw_widget("debug_log", (10, 10, self.item_slot.left - 20, 100), messages,
+                                    lambda surface: self.draw_debug_log(surface, messages))
 
         # Draw dragged item
         if self.dragging_item:
             mouse_pos = pygame.mouse.get_pos()
-            self.draw_item(self.dragging_item, pygame.Rect(
+            dragged = self.dragging_item
+            drag_rect = pygame.Rect(
                 mouse_pos[0] - self.slot_size//2,
                 mouse_pos[1] - self.slot_size//2,
                 self.slot_size,
                 self.slot_size
-            ))
+            )
+            self.ui_manager.draw_overlay(drag_rect, (dragged["item"], dragged["quantity"]),
+                                         lambda screen: self.draw_item(screen, dragged, drag_rect))
 
         # Draw tooltip if hovering over item
         if self.hovered_item and not self.dragging_item:
@@ -178,42 +187,40 @@ class EnhancerUI:
             # Add enhancement recipe info if applicable
             if self.hovered_item.id in [recipe["base_item"]["item_id"] for recipe in self.recipes.values()]:
                 tooltip_text += "\n\nCan be enhanced"
-            self.tooltip.draw(self.screen, tooltip_text, (mouse_pos[0] + 15, mouse_pos[1] + 15))
+            self.ui_manager.draw_tooltip(self.tooltip, tooltip_text, (mouse_pos[0] + 15, mouse_pos[1] + 15))
 
-        # Draw enhance button
-        pygame.draw.rect(self.screen, (50, 150, 50), self.enhance_button)
-        pygame.draw.rect(self.screen, (200, 200, 200), self.enhance_button, 2)
-        
-        # Draw button text
-        enhance_text = self.font.render("Enhance", True, (255, 255, 255))
-        text_rect = enhance_text.get_rect(center=self.enhance_button.center)
-        self.screen.blit(enhance_text, text_rect)
+    def draw_slot(self, slot_id, rect, slot, selected=False):
+        """Slot widget, repainted when its item, quantity or selection changes"""
+        def draw(surface):
+            pygame.draw.rect(surface, (70, 70, 70), rect)
+            pygame.draw.rect(surface, (200, 200, 200), rect, 2)
+            if selected:
+                pygame.draw.rect(surface, (255, 215, 0), rect.inflate(6, 6), 3)
+            self.draw_item(surface, slot, rect)
 
-        # Draw recipe hint if valid combination
-        recipe = self.can_enhance()
-        if recipe:
-            hint_text = f"Click enhance to create: {self.item_in_slot['item'].name} {recipe['result_suffix']}"
-            hint_surface = self.font.render(hint_text, True, (0, 255, 0))
-            self.screen.blit(hint_surface, (self.enhance_button.x, self.enhance_button.bottom + 10))
+        state = (slot.get("item"), slot.get("quantity"), selected) if slot else (None, 0, selected)
+        self.ui_manager.draw_widget(slot_id, rect.inflate(6, 6), state, draw)
 
-        # Draw debug log (last 5 messages)
+    def draw_hint(self, surface, hint_text, pos):
+        if hint_text:
+            surface.blit(self.font.render(hint_text, True, (0, 255, 0)), pos)
+
+    def draw_debug_log(self, surface, messages):
         debug_y = 10
-        for message in self.debug_log[-5:]:
+        for message in messages:
             debug_surface = self.font.render(message, True, (255, 255, 0))
-            self.screen.blit(debug_surface, (10, debug_y))
+            surface.blit(debug_surface, (10, debug_y))
             debug_y += 20
 
-    def draw_item(self, slot, rect):
+    def draw_item(self, surface, slot, rect):
         """Draw an item in a slot"""
         if slot and slot["item"]:
             tx, ty = slot["item"].texture_coords
-            texture_rect = pygame.Rect(tx * c.BLOCK_SIZE, ty * c.BLOCK_SIZE, c.BLOCK_SIZE, c.BLOCK_SIZE)
-            item_img = self.atlas.subsurface(texture_rect)
-            item_img = pygame.transform.scale(item_img, (self.slot_size, self.slot_size))
-            self.screen.blit(item_img, rect.topleft)
+            item_img = ICON_CACHE.icon(self.atlas, (tx, ty), self.slot_size)
+            surface.blit(item_img, rect.topleft)
             if slot["quantity"] > 1:
                 quantity = self.font.render(str(slot["quantity"]), True, (255, 255, 255))
-                self.screen.blit(quantity, (rect.right - quantity.get_width() - 5, rect.bottom - quantity.get_height() - 5))
+                surface.blit(quantity, (rect.right - quantity.get_width() - 5, rect.bottom - quantity.get_height() - 5))
 
     def handle_event(self, event):
         """Handle UI events"""
@@ -545,5 +552,5 @@ class EnhancerUI:
             self.enhancer_block.ingredient_slot = self.ingredient_in_slot
 
             self.draw()
-            pygame.display.flip()
+            self.ui_manager.present()
             clock.tick(60)
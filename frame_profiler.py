@@ -0,0 +1,198 @@
+import csv
+import os
+import time
+from collections import deque
+import pygame
+import config as c
+from text_cache import TEXT_CACHE
+
+# Named phases of the main loop, in the order they are stacked in the graph
+PHASES = ("input", "physics", "water", "autosave", "mob_ai", "spawners", "farms",
+          "chunk_render", "lighting", "hud", "flip")
+
+PHASE_COLORS = {
+    "input": (230, 230, 230),
+    "physics": (70, 130, 255),
+    "water": (0, 200, 220),
+    "autosave": (60, 90, 200),
+    "mob_ai": (255, 80, 80),
+    "spawners": (255, 150, 0),
+    "farms": (120, 220, 60),
+    "chunk_render": (190, 90, 255),
+    "lighting": (255, 230, 60),
+    "hud": (255, 120, 200),
+    "flip": (140, 140, 140),
+    "other": (80, 80, 80),
+}
+
+# Histogram bucket upper bounds in milliseconds; the last bucket is open-ended
+HISTOGRAM_BUCKETS = (0.25, 0.5, 1, 2, 4, 8, 16.7, 33.3)
+
+class FrameProfiler:
+    """Times named phases of each frame and keeps a rolling history.
+
+    Call begin_frame() once per frame, wrap each phase in start(name)/stop(name)
+    (a phase may be started several times per frame; its times accumulate) and
+    call end_frame() after the flip. Time not covered by a phase is reported
+    as "other".
+    """
+
+    def __init__(self, phases=PHASES, history=c.PROFILER_HISTORY):
+        self.phases = list(phases)
+        self.columns = self.phases + ["other"]
+        self.history = deque(maxlen=history)  # (total_ms, {phase: ms}) per frame
+        self.frame_count = 0
+        self.visible = False
+        self.current = dict.fromkeys(self.phases, 0.0)
+        self._starts = {}
+        self._frame_start = None
+        self._graph = None
+        self.graph_height = 100
+        self.graph_scale_ms = 33.3  # Frame time shown at the top of the graph
+
+    def begin_frame(self):
+        """Start timing a new frame"""
+        self._frame_start = time.perf_counter()
+        for phase in self.phases:
+            self.current[phase] = 0.0
+
+    def start(self, phase):
+        """Start (or resume) timing a phase"""
+        self._starts[phase] = time.perf_counter()
+
+    def stop(self, phase):
+        """Stop timing a phase and add the elapsed time to this frame"""
+        self.current[phase] += time.perf_counter() - self._starts.pop(phase)
+
+    def end_frame(self):
+        """Close the frame and push its timings into the history"""
+        if self._frame_start is None:
+            return
+        total_ms = (time.perf_counter() - self._frame_start) * 1000
+        timings = {phase: seconds * 1000 for phase, seconds in self.current.items()}
+        timings["other"] = max(0.0, total_ms - sum(timings.values()))
+        self.history.append((total_ms, timings))
+        self.frame_count += 1
+        self._frame_start = None
+        if self.visible:
+            self._scroll_graph(timings)
+
+    def toggle(self):
+        """Show or hide the overlay"""
+        self.visible = not self.visible
+        self._graph = None  # Rebuilt from history on next draw
+
+    def phase_samples(self, phase):
+        """All recorded timings (ms) of a phase within the rolling window"""
+        return [timings[phase] for _, timings in self.history]
+
+    def histogram(self, phase):
+        """Bucket counts of a phase's timings over the rolling window"""
+        counts = [0] * (len(HISTOGRAM_BUCKETS) + 1)
+        for value in self.phase_samples(phase):
+            for i, bound in enumerate(HISTOGRAM_BUCKETS):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            else:
+                counts[-1] += 1
+        return counts
+
+    def summary(self, phase):
+        """Return (average, p95, max) in ms for a phase over the rolling window"""
+        samples = sorted(self.phase_samples(phase))
+        if not samples:
+            return 0.0, 0.0, 0.0
+        p95 = samples[min(len(samples) - 1, int(0.95 * len(samples)))]
+        return sum(samples) / len(samples), p95, samples[-1]
+
+    def dump_csv(self, path=None):
+        """Write the rolling per-frame timings to CSV and return the file path"""
+        if path is None:
+            os.makedirs(c.PROFILER_DUMP_DIR, exist_ok=True)
+            path = os.path.join(c.PROFILER_DUMP_DIR, f"frame_times_{time.strftime('%Y%m%d_%H%M%S')}.csv")
+        first_frame = self.frame_count - len(self.history)
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame", "total_ms"] + [f"{name}_ms" for name in self.columns])
+            for offset, (total_ms, timings) in enumerate(self.history):
+                writer.writerow([first_frame + offset, f"{total_ms:.3f}"] +
+                                [f"{timings[name]:.3f}" for name in self.columns])
+        return path
+
+    def _scroll_graph(self, timings):
+        """Shift the cached graph left by one pixel and draw the newest frame"""
+        if self._graph is None:
+            return
+        width = self._graph.get_width()
+        self._graph.scroll(-1, 0)
+        pygame.draw.line(self._graph, (0, 0, 0, 160), (width - 1, 0), (width - 1, self.graph_height))
+        self._draw_column(width - 1, timings)
+
+    def _draw_column(self, x, timings):
+        """Draw one frame as a stacked bar at column x of the graph"""
+        scale = self.graph_height / self.graph_scale_ms
+        bottom = self.graph_height
+        for name in self.columns:
+            height = timings[name] * scale
+            if height <= 0:
+                continue
+            top = max(0, bottom - height)
+            pygame.draw.line(self._graph, PHASE_COLORS[name], (x, int(bottom)), (x, int(top)))
+            bottom = top
+            if bottom <= 0:
+                break
+
+    def _rebuild_graph(self):
+        """Redraw the whole graph from the history"""
+        width = self.history.maxlen
+        self._graph = pygame.Surface((width, self.graph_height), pygame.SRCALPHA)
+        self._graph.fill((0, 0, 0, 160))
+        start = width - len(self.history)
+        for offset, (_, timings) in enumerate(self.history):
+            self._draw_column(start + offset, timings)
+
+    def draw(self, screen, pos=(5, 110)):
+        """Draw the overlay: stacked frame-time graph plus per-phase statistics"""
+        if not self.visible:
+            return
+        if self._graph is None:
+            self._rebuild_graph()
+
+        x, y = pos
+        line_height = 14
+        histogram_width = len(HISTOGRAM_BUCKETS) + 1
+        panel = pygame.Surface((self._graph.get_width() + 10,
+                                self.graph_height + 30 + line_height * len(self.columns)), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 140))
+        panel.blit(self._graph, (5, 5))
+
+        # Reference lines for 60 and 30 FPS frame budgets
+        for budget_ms in (16.7, 33.3):
+            line_y = 5 + self.graph_height - int(budget_ms * self.graph_height / self.graph_scale_ms)
+            if line_y >= 5:
+                pygame.draw.line(panel, (255, 255, 255, 90), (5, line_y), (5 + self._graph.get_width(), line_y))
+
+        totals = sorted(total for total, _ in self.history)
+        frame_avg = sum(totals) / len(totals) if totals else 0.0
+        header = f"frame avg {frame_avg:.2f} ms  max {totals[-1] if totals else 0.0:.2f} ms   (avg / p95 / max)"
+        TEXT_CACHE.draw(panel, header, 18, (255, 255, 255), topleft=(5, self.graph_height + 10))
+
+        row_y = self.graph_height + 10 + line_height
+        for name in self.columns:
+            avg, p95, peak = self.summary(name)
+            pygame.draw.rect(panel, PHASE_COLORS[name], (5, row_y + 2, 8, 8))
+            text = f"{name:<12} {avg:6.2f} {p95:6.2f} {peak:6.2f}"
+            TEXT_CACHE.draw(panel, text, 18, (255, 255, 255), topleft=(18, row_y))
+
+            # Mini histogram: one bar per bucket, height relative to the fullest bucket
+            counts = self.histogram(name)
+            most = max(counts) or 1
+            hist_x = panel.get_width() - histogram_width * 4 - 5
+            for i, count in enumerate(counts):
+                bar = int(10 * count / most)
+                if bar:
+                    pygame.draw.rect(panel, PHASE_COLORS[name], (hist_x + i * 4, row_y + 11 - bar, 3, bar))
+            row_y += line_height
+
+        screen.blit(panel, (x, y))
@@ -1,7 +1,10 @@
 import pygame
 import config as c
 from ui_tooltip import Tooltip, get_item_tooltip
+from ui_manager import UIManager
 import random  # Add this import
+from text_cache import TEXT_CACHE
+from icon_cache import ICON_CACHE
 
 class FurnaceUI:
     def __init__(self, screen, player_inventory, furnace_block, atlas):
@@ -9,7 +12,7 @@ class FurnaceUI:
         self.player_inventory = player_inventory
         self.furnace = furnace_block
         self.atlas = atlas
-        self.font = pygame.font.SysFont(None, 24)
+        self.font = TEXT_CACHE.font(24)
         self.running = True
         self.dragging_item = None
         self.drag_source = None
@@ -79,12 +82,13 @@ class FurnaceUI:
         self.hotbar_start_y = self.inventory_start_y + 4 * (self.slot_size + self.padding) + self.padding
 
         # Add labels for sections
-        self.font = pygame.font.SysFont(None, 24)
+        self.font = TEXT_CACHE.font(24)
         self.input_label = self.font.render("Input", True, (255, 255, 255))
         self.fuel_label = self.font.render("Fuel", True, (255, 255, 255))
         self.output_label = self.font.render("Output", True, (255, 255, 255))
         self.tooltip = Tooltip(self.font)
         self.hovered_item = None
+        self.ui_manager = UIManager(screen)
 
         # Add glow effect properties
         self.glow_colors = [
@@ -353,7 +357,7 @@ class FurnaceUI:
         else:
             self.swap_items(slot_type, slot, dict(target_item))
 
-    def draw_smelting_glow(self):
+    def draw_smelting_glow(self, surface):
         """Draw glow effect synchronized with smelting progress"""
         if not self.furnace.script.is_burning:
             return
@@ -398,14 +402,14 @@ class FurnaceUI:
             pygame.draw.line(fuel_glow, color, (0, i), (self.slot_size, i))
         
         # Draw glow surfaces under slots
-        self.screen.blit(input_glow, self.input_rect.topleft, special_flags=pygame.BLEND_RGBA_ADD)
-        self.screen.blit(fuel_glow, self.fuel_rect.topleft, special_flags=pygame.BLEND_RGBA_ADD)
+        surface.blit(input_glow, self.input_rect.topleft, special_flags=pygame.BLEND_RGBA_ADD)
+        surface.blit(fuel_glow, self.fuel_rect.topleft, special_flags=pygame.BLEND_RGBA_ADD)
         
         # Draw ember particles from fuel slot
         if self.furnace.script.is_burning:
-            self.draw_ember_particles(burn_progress)
+            self.draw_ember_particles(surface, burn_progress)
 
-    def draw_ember_particles(self, burn_progress):
+    def draw_ember_particles(self, surface, burn_progress):
         """Draw floating ember particles based on burn progress"""
         num_particles = int(5 * burn_progress)
         for _ in range(num_particles):
@@ -415,105 +419,73 @@ class FurnaceUI:
             alpha = int(255 * burn_progress * random.random())
             
             pygame.draw.circle(
-                self.screen,
+                surface,
                 (255, 200, 0, alpha),
                 (x, y),
                 size
             )
 
-    def draw(self):
-        """Draw the furnace UI"""
-        # Draw UI background
-        self.screen.fill((30, 30, 30))
+    def progress_rects(self):
+        """Burn time and melt progress bars"""
+        burn_height = int((self.furnace.script.burn_time_remaining / 1000) * self.slot_size)
+        burn_rect = pygame.Rect(self.fuel_rect.right + 10, 
+                              self.fuel_rect.bottom - burn_height,
+                              10, burn_height)
+        melt_width = int((self.furnace.script.melt_progress / 1000) * (self.output_rect.left - self.input_rect.right - 20))
+        melt_rect = pygame.Rect(self.input_rect.right + 10,
+                              self.input_rect.centery - 5,
+                              melt_width, 10)
+        return burn_rect, melt_rect
+
+    def draw_progress(self, surface, burn_rect, melt_rect):
+        """Progress indicators and glow of a burning furnace"""
+        pygame.draw.rect(surface, (255, 128, 0), burn_rect)
+        pygame.draw.rect(surface, (255, 0, 0), melt_rect)
+        self.draw_smelting_glow(surface)
+
+    def draw_background(self, surface):
+        """Static part of the screen, painted once"""
+        surface.fill((30, 30, 30))
         overlay = pygame.Surface((c.SCREEN_WIDTH, c.SCREEN_HEIGHT), pygame.SRCALPHA)
         overlay.fill((0, 0, 0, 200))
-        self.screen.blit(overlay, (0, 0))
+        surface.blit(overlay, (0, 0))
 
         # Draw furnace interface
-        pygame.draw.rect(self.screen, (139, 69, 19), self.furnace_rect)
-        pygame.draw.rect(self.screen, (101, 67, 33), self.furnace_rect, 2)
-
-        # Draw slots
-        slots = [
-            (self.input_rect, self.furnace.script.input_slot),
-            (self.fuel_rect, self.furnace.script.fuel_slot),
-            (self.output_rect, self.furnace.script.output_slot)
-        ]
-
-        for rect, slot in slots:
-            # Draw slot background
-            pygame.draw.rect(self.screen, (50, 50, 50), rect)
-            pygame.draw.rect(self.screen, (100, 100, 100), rect, 1)
-            
-            # Draw item in slot if present
-            if slot and slot.get("item"):
-                item = slot["item"]
-                tx, ty = item.texture_coords
-                texture_rect = pygame.Rect(tx * c.BLOCK_SIZE, ty * c.BLOCK_SIZE, c.BLOCK_SIZE, c.BLOCK_SIZE)
-                item_texture = self.atlas.subsurface(texture_rect)  # Changed from self.texture_atlas to self.atlas
-                scaled_texture = pygame.transform.scale(item_texture, (self.slot_size-8, self.slot_size-8))
-                self.screen.blit(scaled_texture, (rect.x+4, rect.y+4))
-                
-                # Draw quantity if more than 1
-                if slot["quantity"] > 1:
-                    quantity_text = self.font.render(str(slot["quantity"]), True, (255, 255, 255))
-                    self.screen.blit(quantity_text, (rect.x + rect.width - 20, rect.y + rect.height - 20))
-
-        # Get current mouse position and update hovered item at start of draw
-        mouse_pos = pygame.mouse.get_pos()
-        self.get_slot_at_pos(mouse_pos)  # This updates self.hovered_item
+        pygame.draw.rect(surface, (139, 69, 19), self.furnace_rect)
+        pygame.draw.rect(surface, (101, 67, 33), self.furnace_rect, 2)
 
         # Create single translucent background
         bg_overlay = pygame.Surface((c.SCREEN_WIDTH, c.SCREEN_HEIGHT), pygame.SRCALPHA)
         bg_overlay.fill((0, 0, 0, 160))  # Reduced opacity (160 instead of 180)
-        self.screen.blit(bg_overlay, (0, 0))
-
-        # Draw slots with semi-transparent backgrounds
-        slot_bg = (70, 70, 70, 200)
-        slot_border = (200, 200, 200, 255)
+        surface.blit(bg_overlay, (0, 0))
 
         # Draw section labels
-        self.screen.blit(self.input_label, (self.input_rect.centerx - self.input_label.get_width()//2, 
-                                          self.input_rect.top - 25))
-        self.screen.blit(self.fuel_label, (self.fuel_rect.centerx - self.fuel_label.get_width()//2, 
-                                         self.fuel_rect.top - 25))
-        self.screen.blit(self.output_label, (self.output_rect.centerx - self.output_label.get_width()//2, 
-                                           self.output_rect.top - 25))
+        surface.blit(self.input_label, (self.input_rect.centerx - self.input_label.get_width()//2, 
+                                        self.input_rect.top - 25))
+        surface.blit(self.fuel_label, (self.fuel_rect.centerx - self.fuel_label.get_width()//2, 
+                                       self.fuel_rect.top - 25))
+        surface.blit(self.output_label, (self.output_rect.centerx - self.output_label.get_width()//2, 
+                                         self.output_rect.top - 25))
 
-        # Draw furnace slots
-        slots = [
-            (self.input_rect, self.furnace.input_slot),
-            (self.fuel_rect, self.furnace.fuel_slot),
-            (self.output_rect, self.furnace.output_slot)
-        ]
+        inventory_label = self.font.render("Inventory", True, (255, 255, 255))
+        surface.blit(inventory_label, (self.inventory_start_x + self.max_width//2 - inventory_label.get_width()//2, 
+                                       self.inventory_start_y - 25))
+        hotbar_label = self.font.render("Hotbar", True, (255, 255, 255))
+        surface.blit(hotbar_label, (self.hotbar_start_x + self.max_width//2 - hotbar_label.get_width()//2, 
+                                    self.hotbar_start_y - 25))
 
-        for rect, slot in slots:
-            pygame.draw.rect(self.screen, slot_bg, rect)
-            pygame.draw.rect(self.screen, slot_border, rect, 2)
-            if slot and slot["item"]:
-                item = slot["item"]
-                tx, ty = item.texture_coords
-                texture_rect = pygame.Rect(tx * c.BLOCK_SIZE, ty * c.BLOCK_SIZE, c.BLOCK_SIZE, c.BLOCK_SIZE)
-                item_img = self.atlas.subsurface(texture_rect)
-                item_img = pygame.transform.scale(item_img, (self.slot_size, self.slot_size))
-                self.screen.blit(item_img, rect.topleft)
-                if slot["quantity"] > 1:
-                    quantity = self.font.render(str(slot["quantity"]), True, (255, 255, 255))
-                    self.screen.blit(quantity, (rect.right - quantity.get_width() - 5, rect.bottom - quantity.get_height() - 5))
+    def draw(self):
+        """Draw the furnace UI; only slots whose contents changed are repainted"""
+        self.ui_manager.retain(self.draw_background)
 
-        # Draw progress indicators if furnace is burning
-        if self.furnace.script.is_burning:
-            burn_height = int((self.furnace.script.burn_time_remaining / 1000) * self.slot_size)
-            burn_rect = pygame.Rect(self.fuel_rect.right + 10, 
-                                  self.fuel_rect.bottom - burn_height,
-                                  10, burn_height)
-            pygame.draw.rect(self.screen, (255, 128, 0), burn_rect)
-
-            melt_width = int((self.furnace.script.melt_progress / 1000) * (self.output_rect.left - self.input_rect.right - 20))
-            melt_rect = pygame.Rect(self.input_rect.right + 10,
-                                  self.input_rect.centery - 5,
-                                  melt_width, 10)
-            pygame.draw.rect(self.screen, (255, 0, 0), melt_rect)
+        # Get current mouse position and update hovered item at start of draw
+        mouse_pos = pygame.mouse.get_pos()
+        self.get_slot_at_pos(mouse_pos)  # This updates self.hovered_item
+
+        # Draw furnace slots
+        self.draw_slot("input", self.input_rect, self.furnace.input_slot)
+        self.draw_slot("fuel", self.fuel_rect, self.furnace.fuel_slot)
+        self.draw_slot("output", self.output_rect, self.furnace.output_slot)
 
         # Draw main inventory
         for i in range(len(self.player_inventory.main)):
@@ -522,75 +494,53 @@ class FurnaceUI:
             x = self.inventory_start_x + col * (self.slot_size + self.padding)
             y = self.inventory_start_y + row * (self.slot_size + self.padding)
             rect = pygame.Rect(x, y, self.slot_size, self.slot_size)
-            
-            # Draw slot
-            pygame.draw.rect(self.screen, slot_bg, rect)
-            pygame.draw.rect(self.screen, slot_border, rect, 2)
-            
-            # Draw item if present
-            slot = self.player_inventory.main[i]
-            if slot and slot["item"]:
-                item = slot["item"]
-                tx, ty = item.texture_coords
-                texture_rect = pygame.Rect(tx * c.BLOCK_SIZE, ty * c.BLOCK_SIZE, c.BLOCK_SIZE, c.BLOCK_SIZE)
-                item_img = self.atlas.subsurface(texture_rect)
-                item_img = pygame.transform.scale(item_img, (self.slot_size, self.slot_size))
-                self.screen.blit(item_img, rect.topleft)
-                if slot["quantity"] > 1:
-                    quantity = self.font.render(str(slot["quantity"]), True, (255, 255, 255))
-                    self.screen.blit(quantity, (rect.right - quantity.get_width() - 5, rect.bottom - quantity.get_height() - 5))
-
-        # Draw inventory title
-        inventory_label = self.font.render("Inventory", True, (255, 255, 255))
-        self.screen.blit(inventory_label, (self.inventory_start_x + self.max_width//2 - inventory_label.get_width()//2, 
-                                         self.inventory_start_y - 25))
-
-        # Draw hotbar section
-        hotbar_label = self.font.render("Hotbar", True, (255, 255, 255))
-        self.screen.blit(hotbar_label, (self.hotbar_start_x + self.max_width//2 - hotbar_label.get_width()//2, 
-                                      self.hotbar_start_y - 25))
+            self.draw_slot(f"inventory_{i}", rect, self.player_inventory.main[i])
 
         # Draw hotbar slots
         for i in range(len(self.player_inventory.hotbar)):
             x = self.hotbar_start_x + i * (self.slot_size + self.padding)
-            y = self.hotbar_start_y
-            rect = pygame.Rect(x, y, self.slot_size, self.slot_size)
-            
-            # Draw slot background
-            pygame.draw.rect(self.screen, slot_bg, rect)
-            pygame.draw.rect(self.screen, slot_border, rect, 2)
-            if i == self.player_inventory.selected_hotbar_index:
-                pygame.draw.rect(self.screen, (255, 215, 0), rect.inflate(6, 6), 3)
-            
-            # Draw item if present
-            slot = self.player_inventory.hotbar[i]
-            if slot and slot.get("item"):
-                item = slot["item"]
-                tx, ty = item.texture_coords
-                texture_rect = pygame.Rect(tx * c.BLOCK_SIZE, ty * c.BLOCK_SIZE, c.BLOCK_SIZE, c.BLOCK_SIZE)
-                item_img = self.atlas.subsurface(texture_rect)
-                item_img = pygame.transform.scale(item_img, (self.slot_size, self.slot_size))
-                self.screen.blit(item_img, rect.topleft)
-                if slot["quantity"] > 1:
-                    quantity = self.font.render(str(slot["quantity"]), True, (255, 255, 255))
-                    self.screen.blit(quantity, (rect.right - quantity.get_width() - 5, rect.bottom - quantity.get_height() - 5))
+            rect = pygame.Rect(x, self.hotbar_start_y, self.slot_size, self.slot_size)
+            self.draw_slot(f"hotbar_{i}", rect, self.player_inventory.hotbar[i],
+                           i == self.player_inventory.selected_hotbar_index)
 
-        # Draw glow effects before items
-        self.draw_smelting_glow()
+        # A burning furnace animates its progress bars, glow and embers every frame
+        if self.furnace.script.is_burning:
+            burn_rect, melt_rect = self.progress_rects()
+            self.ui_manager.draw_overlay(self.furnace_rect.unionall([burn_rect, melt_rect]), pygame.time.get_ticks(),
+                                         lambda screen: self.draw_progress(screen, burn_rect, melt_rect))
 
         # Draw dragged item
         if self.dragging_item and self.dragging_item["item"]:
-            mx, my = pygame.mouse.get_pos()
-            tx, ty = self.dragging_item["item"].texture_coords
-            texture_rect = pygame.Rect(tx * c.BLOCK_SIZE, ty * c.BLOCK_SIZE, c.BLOCK_SIZE, c.BLOCK_SIZE)
-            item_img = self.atlas.subsurface(texture_rect)
-            item_img = pygame.transform.scale(item_img, (self.slot_size, self.slot_size))
-            self.screen.blit(item_img, (mx - self.slot_size//2, my - self.slot_size//2))
+            mx, my = mouse_pos
+            item = self.dragging_item["item"]
+            tx, ty = item.texture_coords
+            item_img = ICON_CACHE.icon(self.atlas, (tx, ty), self.slot_size)
+            drag_rect = item_img.get_rect(topleft=(mx - self.slot_size//2, my - self.slot_size//2))
+            self.ui_manager.draw_overlay(drag_rect, item, lambda screen: screen.blit(item_img, drag_rect))
 
         # Draw tooltip last (after dragged item)
         if self.hovered_item and not self.dragging_item:
             tooltip_text = get_item_tooltip(self.hovered_item)
-            self.tooltip.draw(self.screen, tooltip_text, (mouse_pos[0] + 15, mouse_pos[1] + 15))
+            self.ui_manager.draw_tooltip(self.tooltip, tooltip_text, (mouse_pos[0] + 15, mouse_pos[1] + 15))
+
+    def draw_slot(self, slot_id, rect, slot, selected=False):
+        """Slot widget, repainted when its item, quantity or selection changes"""
+        def draw(surface):
+            pygame.draw.rect(surface, (70, 70, 70, 200), rect)
+            pygame.draw.rect(surface, (200, 200, 200, 255), rect, 2)
+            if selected:
+                pygame.draw.rect(surface, (255, 215, 0), rect.inflate(6, 6), 3)
+            if slot and slot.get("item"):
+                item = slot["item"]
+                tx, ty = item.texture_coords
+                item_img = ICON_CACHE.icon(self.atlas, (tx, ty), self.slot_size)
+                surface.blit(item_img, rect.topleft)
+                if slot["quantity"] > 1:
+                    quantity = self.font.render(str(slot["quantity"]), True, (255, 255, 255))
+                    surface.blit(quantity, (rect.right - quantity.get_width() - 5, rect.bottom - quantity.get_height() - 5))
+
+        state = (slot.get("item"), slot.get("quantity"), selected) if slot else (None, 0, selected)
+        self.ui_manager.draw_widget(slot_id, rect.inflate(6, 6), state, draw)
 
     def run(self):
         clock = pygame.time.Clock()
@@ -602,4 +552,4 @@ class FurnaceUI:
                     self.running = False
                 self.handle_event(event)
             self.draw()
-            pygame.display.flip()
+            self.ui_manager.present()
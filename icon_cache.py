@@ -0,0 +1,36 @@
+import weakref
+import pygame
+import config as c
+
+class IconCache:
+    """Item icons cut out of a texture atlas and scaled once per (coords, size)
+
+    Inventories, hotbars and dropped items draw the same few icons every
+    frame; they get ready-to-blit surfaces from here instead of slicing and
+    scaling the atlas each time.
+    """
+
+    def __init__(self):
+        self.icons = weakref.WeakKeyDictionary()  # atlas -> {(coords, size): surface}
+        self.stats = {'hits': 0, 'misses': 0}
+
+    def icon(self, atlas, coords, size):
+        """The atlas texture at ``coords`` scaled to ``size`` x ``size``"""
+        icons = self.icons.get(atlas)
+        if icons is None:
+            icons = self.icons[atlas] = {}
+        key = (tuple(coords), size)
+        icon = icons.get(key)
+        if icon is not None:
+            self.stats['hits'] += 1
+            return icon
+        self.stats['misses'] += 1
+        tx, ty = coords
+        image = atlas.subsurface(pygame.Rect(tx * c.BLOCK_SIZE, ty * c.BLOCK_SIZE, c.BLOCK_SIZE, c.BLOCK_SIZE))
+        icon = pygame.transform.scale(image, (size, size))
+        if pygame.display.get_surface() is not None:
+            icon = icon.convert_alpha()  # Blits faster in the display's pixel format
+        icons[key] = icon
+        return icon
+
+ICON_CACHE = IconCache()
@@ -1,12 +1,13 @@
 import pygame
 import sys
 from config import SCREEN_WIDTH, SCREEN_HEIGHT  # import screen dimensions
+from text_cache import TEXT_CACHE
 
 class InGameMenu:
     def __init__(self, screen):
         self.screen = screen
         self.clock = pygame.time.Clock()
-        self.font = pygame.font.SysFont(None, 48)
+        self.font = TEXT_CACHE.font(48)
         # New option added in the list.
         self.options = ["Return to Game", "Toggle Screen Mode", "Main Menu"]
         self.selected = 0
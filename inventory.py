@@ -3,6 +3,11 @@ import config as c
 from item import Item  # assumed item module
 from block import BLOCK_MAP, AIR  # added import to get blocks
 from registry import REGISTRY  # Add this import
+from logger import get_logger, DEBUG
+from text_cache import TEXT_CACHE
+from icon_cache import ICON_CACHE
+
+log = get_logger("inventory")
 
 class Inventory:
     def __init__(self):
@@ -11,6 +16,7 @@ class Inventory:
         self.main = [{"item": None, "quantity": 0} for _ in range(32)]
         self.selected_hotbar_index = 0
         self.player = None  # Add reference to player
+        self.dirty = False  # Changed since the player data was last saved
         
         # Initialize hotbar with blocks from registry
         def fill_hotbar():
@@ -26,7 +32,7 @@ class Inventory:
             for i, block in enumerate(blocks_to_add):
                 if i < 9 and block.item_variant:  # Double check item_variant exists
                     self.hotbar[i] = {"item": block.item_variant, "quantity": 64}
-                    print(f"Added {block.name} to hotbar slot {i}")
+                    log.debug("Added %s to hotbar slot %d", block.name, i)
 
         # Fill hotbar with initial blocks
         fill_hotbar()
@@ -35,7 +41,12 @@ class Inventory:
         """Set player reference for modifier updates"""
         self.player = player
 
+    def mark_dirty(self):
+        """Record that the contents changed and need saving"""
+        self.dirty = True
+
     def fill_empty_hotbar_slot(self, item_variant, quantity=1):
+        self.dirty = True
         for slot in self.hotbar:
             if slot["item"] is None:
                 slot["item"] = item_variant
@@ -43,61 +54,65 @@ class Inventory:
                 break
 
     def add_item_to_hotbar(self, item_variant, quantity=1):
+        self.dirty = True
         self.hotbar.append({"item": item_variant, "quantity": quantity})
 
     def add_item(self, item, quantity=1):
         """Add an item to the inventory"""
-        self.log_debug(f"Adding {quantity} of {item.name}")
+        log.debug("Adding %d of %s", quantity, item.name)
+        self.dirty = True
         
         # First check existing stacks that aren't full
         for slot in self.main + self.hotbar:
             if slot and slot.get("item") and slot["item"].id == item.id:
-                self.log_debug(f"Found matching slot with {slot['quantity']} items")
+                log.debug("Found matching slot with %d items", slot["quantity"])
                 if slot["quantity"] < slot["item"].stack_size:
                     space = slot["item"].stack_size - slot["quantity"]
                     add_amount = min(space, quantity)
                     slot["quantity"] += add_amount
                     quantity -= add_amount
-                    self.log_debug(f"Added {add_amount} to existing stack, {quantity} remaining")
+                    log.debug("Added %d to existing stack, %d remaining", add_amount, quantity)
                     if quantity <= 0:
                         return True
 
         # Debug empty slot detection
-        empty_slots = sum(1 for slot in self.main if not slot or not slot.get("item"))
-        self.log_debug(f"Found {empty_slots} empty slots in main inventory")
+        if log.isEnabledFor(DEBUG):
+            empty_slots = sum(1 for slot in self.main if not slot or not slot.get("item"))
+            log.debug("Found %d empty slots in main inventory", empty_slots)
 
         # If we still have items to add, find empty slots
         for i in range(len(self.main)):
             if not self.main[i] or not self.main[i].get("item"):
-                self.log_debug(f"Found empty main inventory slot {i}")
+                log.debug("Found empty main inventory slot %d", i)
                 stack_size = min(item.stack_size, quantity)
                 self.main[i] = {"item": item, "quantity": stack_size}
                 quantity -= stack_size
-                self.log_debug(f"Created new stack of {stack_size} in slot {i}, {quantity} remaining")
+                log.debug("Created new stack of %d in slot %d, %d remaining", stack_size, i, quantity)
                 if quantity <= 0:
                     return True
 
         # Try hotbar if main inventory is full
         for i in range(len(self.hotbar)):
             if not self.hotbar[i] or not self.hotbar[i].get("item"):
-                self.log_debug(f"Found empty hotbar slot {i}")
+                log.debug("Found empty hotbar slot %d", i)
                 stack_size = min(item.stack_size, quantity)
                 self.hotbar[i] = {"item": item, "quantity": stack_size}
                 quantity -= stack_size
-                self.log_debug(f"Created new stack of {stack_size} in hotbar {i}, {quantity} remaining")
+                log.debug("Created new stack of %d in hotbar %d, %d remaining", stack_size, i, quantity)
                 if quantity <= 0:
                     return True
 
-        self.log_debug(f"Could not add all items, {quantity} remaining")
+        log.debug("Could not add all items, %d remaining", quantity)
         return quantity == 0
 
     def log_debug(self, message):
         """Add debug logging"""
-        print(f"[Inventory Debug] {message}")
+        log.debug("%s", message)
 
     def update_quantity(self, slot, amount):
         """Update the quantity of an item in a given slot."""
         if slot and "item" in slot and slot["item"]:
+            self.dirty = True
             slot["quantity"] += amount
             if slot["quantity"] <= 0:
                 slot["item"] = None
@@ -105,12 +120,13 @@ class Inventory:
                 # Update modifiers if this was the selected item
                 if self.player and slot == self.get_selected_item():
                     self.player.update_modifiers(self)
-                    print("Updated modifiers after item depletion")
+                    log.debug("Updated modifiers after item depletion")
 
     def remove_item(self, slot_id, amount=1):
         """Remove items from a given slot id (1-indexed)"""
         container, index = self.slot_id_to_slot(slot_id)
         if container[index]:
+            self.dirty = True
             if container[index]["quantity"] > amount:
                 container[index]["quantity"] -= amount
             else:
@@ -131,19 +147,21 @@ class Inventory:
     def select_hotbar_slot(self, index):
         if 0 <= index < len(self.hotbar):
             self.selected_hotbar_index = index
+            self.dirty = True
             # Update modifiers when changing selected item
             if self.player:
                 self.player.update_modifiers(self)
-                print(f"Updated modifiers for hotbar selection {index}")
+                log.debug("Updated modifiers for hotbar selection %d", index)
 
     def equip_armor(self, slot_index, item):
         """Handle armor equipping with modifier updates"""
         if 0 <= slot_index < len(self.armor):
             old_item = self.armor[slot_index]
             self.armor[slot_index] = item
+            self.dirty = True
             if self.player:
                 self.player.update_modifiers(self)
-                print(f"Updated modifiers for armor change in slot {slot_index}")
+                log.debug("Updated modifiers for armor change in slot %d", slot_index)
             return old_item
         return None
 
@@ -162,6 +180,7 @@ class Inventory:
         """Set item in a slot in main inventory."""
         if 0 <= slot_index < len(self.main):
             self.main[slot_index] = item_data
+            self.dirty = True
             return True
         return False
 
@@ -184,15 +203,10 @@ class Inventory:
             if slot and "item" in slot and slot["item"]:
                 item = slot["item"]
                 tx, ty = item.texture_coords
-                block_size = c.BLOCK_SIZE
-                texture_rect = pygame.Rect(tx * block_size, ty * block_size, block_size, block_size)
-                item_img = atlas.subsurface(texture_rect)
-                item_img = pygame.transform.scale(item_img, (slot_size, slot_size))
+                item_img = ICON_CACHE.icon(atlas, (tx, ty), slot_size)
                 surface.blit(item_img, rect.topleft)
                 if slot.get("quantity", 0) > 1:
-                    font = pygame.font.SysFont(None, 24)
-                    amount_surf = font.render(str(slot["quantity"]), True, (255, 255, 255))
-                    surface.blit(amount_surf, (rect.right - amount_surf.get_width(), rect.bottom - amount_surf.get_height()))
+                    TEXT_CACHE.draw(surface, str(slot["quantity"]), 24, (255, 255, 255), bottomright=rect.bottomright)
 
     def draw_inventory(self, screen, texture_atlas, x, y):
         """Draw the main inventory grid (excluding hotbar)."""
@@ -216,20 +230,17 @@ class Inventory:
                 item = slot["item"]
                 quantity = slot["quantity"]
                 tx, ty = item.texture_coords
-                texture_rect = pygame.Rect(tx * 16, ty * 16, 16, 16)  # Assuming 16x16 textures
-                item_texture = texture_atlas.subsurface(texture_rect)
-                scaled_texture = pygame.transform.scale(item_texture, (slot_size-8, slot_size-8))
+                scaled_texture = ICON_CACHE.icon(texture_atlas, (tx, ty), slot_size-8)
                 screen.blit(scaled_texture, (slot_x+4, slot_y+4))
                 
                 # Draw quantity if more than 1
                 if quantity > 1:
-                    font = pygame.font.SysFont(None, 24)
-                    quantity_text = font.render(str(quantity), True, (255, 255, 255))
-                    screen.blit(quantity_text, (slot_x + slot_size - 20, slot_y + slot_size - 20))
+                    TEXT_CACHE.draw(screen, str(quantity), 24, (255, 255, 255), topleft=(slot_x + slot_size - 20, slot_y + slot_size - 20))
 
     def refill_hotbar(self):
         """Refill empty hotbar with default blocks"""
         if not any(slot and slot.get("item") for slot in self.hotbar):
+            self.dirty = True
             # Get all blocks that have item variants
             blocks = []
             for block_id in sorted(BLOCK_MAP.keys()):
@@ -243,7 +254,7 @@ class Inventory:
             for i, block in enumerate(blocks):
                 if i < 9 and block.item_variant:
                     self.hotbar[i] = {"item": block.item_variant, "quantity": 64}
-                    print(f"Refilled hotbar slot {i} with {block.name}")
+                    log.debug("Refilled hotbar slot %d with %s", i, block.name)
 
     def has_items(self, required_items):
         """
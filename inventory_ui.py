@@ -3,6 +3,8 @@ import config as c
 from item import Item  # Ensure Item is imported
 from ui_tooltip import Tooltip, get_item_tooltip
 from ui_manager import UIManager
+from text_cache import TEXT_CACHE
+from icon_cache import ICON_CACHE
 
 class InventoryUI:
     def __init__(self, screen, inventory, atlas):
@@ -11,7 +13,7 @@ class InventoryUI:
         self.atlas = atlas
         self.slot_size = 50  # Changed from 40 to 50 to match hotbar
         self.padding = 10
-        self.font = pygame.font.SysFont(None, 24)
+        self.font = TEXT_CACHE.font(24)
         self.running = True
         self.dragging_item = None
         self.dragging_index = None
@@ -27,13 +29,7 @@ class InventoryUI:
         self.selected_slot = None  # Add this line to initialize selected_slot
         self.texture_atlas = atlas  # Add this line to fix texture_atlas reference
 
-        # Add frame tracking variables
-        self._last_frame_items = {}
-        self._last_frame_hotbar = {}
-
         self.ui_manager = UIManager(screen)
-        self.inventory_batch = self.ui_manager.create_batch('inventory')
-        self.hotbar_batch = self.ui_manager.create_batch('hotbar')
 
     def can_equip_in_armor_slot(self, item, slot_index):
         """Check if an item can be equipped in the given armor slot"""
@@ -82,9 +78,7 @@ class InventoryUI:
                     try:
                         tx, ty = item.texture_coords
                         # Updated scaling to match new slot size
-                        texture_rect = pygame.Rect(tx * 16, ty * 16, 16, 16)
-                        item_texture = self.texture_atlas.subsurface(texture_rect)
-                        scaled_texture = pygame.transform.scale(item_texture, (slot_size-8, slot_size-8))
+                        scaled_texture = ICON_CACHE.icon(self.texture_atlas, (tx, ty), slot_size-8)
                         self.screen.blit(scaled_texture, (x+4, y+4))
                         
                         # Update quantity text position for new size
@@ -118,7 +112,7 @@ class InventoryUI:
                 elif event.type == pygame.MOUSEMOTION:
                     self.update_drag(event.pos)
             self.draw()
-            pygame.display.flip()
+            self.ui_manager.present()
 
     def start_drag(self, mouse_pos):
         for container, top_left, columns in [
@@ -210,15 +204,12 @@ class InventoryUI:
         self.dragging_container = None
         self.dragging_index = None
 
-    def draw(self):
-        """Draw the inventory UI with batched rendering"""
-        self.ui_manager.begin_frame()
-        
-        # Draw background
-        self.screen.fill((30, 30, 30))
+    def draw_background(self, surface):
+        """Static part of the screen, painted once"""
+        surface.fill((30, 30, 30))
         bg_overlay = pygame.Surface((c.SCREEN_WIDTH, c.SCREEN_HEIGHT), pygame.SRCALPHA)
         bg_overlay.fill((0, 0, 0, 200))
-        self.screen.blit(bg_overlay, (0, 0))
+        surface.blit(bg_overlay, (0, 0))
 
         # Draw section titles
         title_color = (200, 200, 200)
@@ -227,84 +218,65 @@ class InventoryUI:
         hotbar_title = self.font.render("Hotbar", True, title_color)
 
         # Draw titles
-        self.screen.blit(armor_title, (c.SCREEN_WIDTH//2 - armor_title.get_width()//2, 70))
-        self.screen.blit(inventory_title, (c.SCREEN_WIDTH//2 - inventory_title.get_width()//2, 220))
-        self.screen.blit(hotbar_title, (c.SCREEN_WIDTH//2 - hotbar_title.get_width()//2, 
-                                      c.SCREEN_HEIGHT - self.slot_size - 70))
+        surface.blit(armor_title, (c.SCREEN_WIDTH//2 - armor_title.get_width()//2, 70))
+        surface.blit(inventory_title, (c.SCREEN_WIDTH//2 - inventory_title.get_width()//2, 220))
+        surface.blit(hotbar_title, (c.SCREEN_WIDTH//2 - hotbar_title.get_width()//2, 
+                                    c.SCREEN_HEIGHT - self.slot_size - 70))
 
-        # First pass: Draw all slot backgrounds
-        # Draw armor slot backgrounds
+        # Slot backgrounds
         for i in range(len(self.inventory.armor)):
             pos = self._get_armor_pos(i)
-            pygame.draw.rect(self.screen, (60, 60, 80), (*pos, self.slot_size, self.slot_size))
-            pygame.draw.rect(self.screen, (120, 120, 140), (*pos, self.slot_size, self.slot_size), 1)
-
-        # Draw inventory slot backgrounds
+            pygame.draw.rect(surface, (60, 60, 80), (*pos, self.slot_size, self.slot_size))
+            pygame.draw.rect(surface, (120, 120, 140), (*pos, self.slot_size, self.slot_size), 1)
         for i in range(len(self.inventory.main)):
             pos = self._get_inventory_pos(i)
-            pygame.draw.rect(self.screen, (50, 50, 50), (*pos, self.slot_size, self.slot_size))
-            pygame.draw.rect(self.screen, (100, 100, 100), (*pos, self.slot_size, self.slot_size), 1)
-
-        # Draw hotbar slot backgrounds
+            pygame.draw.rect(surface, (50, 50, 50), (*pos, self.slot_size, self.slot_size))
+            pygame.draw.rect(surface, (100, 100, 100), (*pos, self.slot_size, self.slot_size), 1)
         for i in range(len(self.inventory.hotbar)):
             pos = self._get_hotbar_pos(i)
-            pygame.draw.rect(self.screen, (50, 50, 50), (*pos, self.slot_size, self.slot_size))
-            pygame.draw.rect(self.screen, (100, 100, 100), (*pos, self.slot_size, self.slot_size), 1)
-            if i == self.inventory.selected_hotbar_index:
-                pygame.draw.rect(self.screen, (255, 215, 0), 
-                               (pos[0]-2, pos[1]-2, self.slot_size+4, self.slot_size+4), 2)
+            pygame.draw.rect(surface, (50, 50, 50), (*pos, self.slot_size, self.slot_size))
+            pygame.draw.rect(surface, (100, 100, 100), (*pos, self.slot_size, self.slot_size), 1)
+
+    def draw(self):
+        """Draw the inventory UI; only slots whose contents changed are repainted"""
+        self.ui_manager.retain(self.draw_background)
 
-        # Second pass: Draw items and quantities
-        # Draw armor slots
         for i, slot in enumerate(self.inventory.armor):
-            if slot is None:
-                slot = {"item": None, "quantity": 0}
-            slot_id = f"armor_slot_{i}"
-            surface = self._render_armor_slot(slot, i)
-            self.ui_manager.draw_ui_element(self.inventory_batch, slot_id, surface, 
-                                          self._get_armor_pos(i), True)
-
-        # Draw inventory slots
+            self._draw_slot(f"armor_slot_{i}", self._get_armor_pos(i), slot,
+                            lambda slot, i=i: self._render_armor_slot(slot, i))
         for i, slot in enumerate(self.inventory.main):
-            if slot is None:
-                slot = {"item": None, "quantity": 0}
-            slot_id = f"inv_slot_{i}"
-            surface = self._render_slot(slot, i)
-            self.ui_manager.draw_ui_element(self.inventory_batch, slot_id, surface, 
-                                          self._get_inventory_pos(i), True)
-
-        # Draw hotbar slots
+            self._draw_slot(f"inv_slot_{i}", self._get_inventory_pos(i), slot,
+                            lambda slot, i=i: self._render_slot(slot, i))
         for i, slot in enumerate(self.inventory.hotbar):
-            if slot is None:
-                slot = {"item": None, "quantity": 0}
-            slot_id = f"hotbar_slot_{i}"
-            surface = self._render_hotbar_slot(slot, i)
-            self.ui_manager.draw_ui_element(self.hotbar_batch, slot_id, surface,
-                                          self._get_hotbar_pos(i), True)
-
-        # Update cached states
-        self._last_frame_items = {
-            i: dict(slot) if slot is not None else {"item": None, "quantity": 0} 
-            for i, slot in enumerate(self.inventory.main)
-        }
-        for i, slot in enumerate(self.inventory.armor):
-            self._last_frame_items[f"armor_{i}"] = dict(slot) if slot is not None else {"item": None, "quantity": 0}
-        self._last_frame_hotbar = {
-            i: dict(slot) if slot is not None else {"item": None, "quantity": 0} 
-            for i, slot in enumerate(self.inventory.hotbar)
-        }
+            self._draw_slot(f"hotbar_slot_{i}", self._get_hotbar_pos(i), slot,
+                            lambda slot, i=i: self._render_hotbar_slot(slot, i),
+                            selected=i == self.inventory.selected_hotbar_index)
 
         # Draw dragged item last
-        if self.dragging_item:
-            mx, my = pygame.mouse.get_pos()
-            self._render_dragged_item(mx, my)
+        mx, my = pygame.mouse.get_pos()
+        if self.dragging_item and self.dragging_item.get("item"):
+            drag_rect = (mx - self.slot_size//2, my - self.slot_size//2, self.slot_size, self.slot_size)
+            self.ui_manager.draw_overlay(drag_rect, self.dragging_item["item"],
+                                         lambda screen: self._render_dragged_item(mx, my))
 
         # Draw tooltip if hovering over an item
-        mouse_pos = pygame.mouse.get_pos()
-        self.get_slot_at_pos(mouse_pos)  # Updates self.hovered_item
+        self.get_slot_at_pos((mx, my))  # Updates self.hovered_item
         if self.hovered_item and not self.dragging_item:
-            tooltip_text = get_item_tooltip(self.hovered_item)
-            self.tooltip.draw(self.screen, tooltip_text, (mouse_pos[0] + 15, mouse_pos[1] + 15))
+            self.ui_manager.draw_tooltip(self.tooltip, get_item_tooltip(self.hovered_item), (mx + 15, my + 15))
+
+    def _draw_slot(self, slot_id, pos, slot, render, selected=False):
+        """Slot widget at ``pos``, repainted when its item, quantity or selection changes"""
+        if slot is None:
+            slot = {"item": None, "quantity": 0}
+        rect = pygame.Rect(pos[0] - 2, pos[1] - 2, self.slot_size + 4, self.slot_size + 4)
+
+        def draw(surface):
+            surface.blit(render(slot), pos)
+            if selected:
+                pygame.draw.rect(surface, (255, 215, 0), rect, 2)
+
+        state = (slot.get("item"), slot.get("quantity"), selected)
+        self.ui_manager.draw_widget(slot_id, rect, state, draw)
 
     def draw_hotbar_ui(self):
         # Draw hotbar with visual effect for the selected slot.
@@ -324,10 +296,7 @@ class InventoryUI:
             if slot and "item" in slot and slot["item"]:
                 item = slot["item"]
                 tx, ty = item.texture_coords
-                block_size = c.BLOCK_SIZE
-                texture_rect = pygame.Rect(tx * block_size, ty * block_size, block_size, block_size)
-                item_img = self.atlas.subsurface(texture_rect)
-                item_img = pygame.transform.scale(item_img, (slot_size, slot_size))
+                item_img = ICON_CACHE.icon(self.atlas, (tx, ty), slot_size)
                 self.screen.blit(item_img, rect.topleft)
                 if slot.get("quantity", 0) > 1:
                     amount_surf = self.font.render(str(slot["quantity"]), True, (255, 255, 255))
@@ -418,9 +387,7 @@ class InventoryUI:
             item = slot["item"]
             if hasattr(item, 'texture_coords'):
                 tx, ty = item.texture_coords
-                texture_rect = pygame.Rect(tx * c.BLOCK_SIZE, ty * c.BLOCK_SIZE, c.BLOCK_SIZE, c.BLOCK_SIZE)
-                item_texture = self.atlas.subsurface(texture_rect)
-                scaled_texture = pygame.transform.scale(item_texture, (self.slot_size-8, self.slot_size-8))
+                scaled_texture = ICON_CACHE.icon(self.atlas, (tx, ty), self.slot_size-8)
                 surface.blit(scaled_texture, (4, 4))
                 
                 if slot["quantity"] > 1:
@@ -436,10 +403,6 @@ class InventoryUI:
         # Draw slot background
         pygame.draw.rect(surface, (50, 50, 50, 200), (0, 0, self.slot_size, self.slot_size))
         
-        # Highlight selected slot
-        if index == self.inventory.selected_hotbar_index:
-            pygame.draw.rect(surface, (255, 215, 0), (-2, -2, self.slot_size+4, self.slot_size+4), 2)
-        
         pygame.draw.rect(surface, (100, 100, 100, 255), (0, 0, self.slot_size, self.slot_size), 1)
         
         # Draw item if present
@@ -447,9 +410,7 @@ class InventoryUI:
             item = slot["item"]
             if hasattr(item, 'texture_coords'):
                 tx, ty = item.texture_coords
-                texture_rect = pygame.Rect(tx * c.BLOCK_SIZE, ty * c.BLOCK_SIZE, c.BLOCK_SIZE, c.BLOCK_SIZE)
-                item_texture = self.atlas.subsurface(texture_rect)
-                scaled_texture = pygame.transform.scale(item_texture, (self.slot_size-8, self.slot_size-8))
+                scaled_texture = ICON_CACHE.icon(self.atlas, (tx, ty), self.slot_size-8)
                 surface.blit(scaled_texture, (4, 4))
                 
                 if slot["quantity"] > 1:
@@ -480,9 +441,7 @@ class InventoryUI:
         item = self.dragging_item["item"]
         if hasattr(item, 'texture_coords'):
             tx, ty = item.texture_coords
-            texture_rect = pygame.Rect(tx * c.BLOCK_SIZE, ty * c.BLOCK_SIZE, c.BLOCK_SIZE, c.BLOCK_SIZE)
-            item_texture = self.atlas.subsurface(texture_rect)
-            scaled_texture = pygame.transform.scale(item_texture, (self.slot_size, self.slot_size))
+            scaled_texture = ICON_CACHE.icon(self.atlas, (tx, ty), self.slot_size)
             self.screen.blit(scaled_texture, (mx - self.slot_size//2, my - self.slot_size//2))
 
     def _render_armor_slot(self, slot, index):
@@ -505,9 +464,7 @@ class InventoryUI:
             item = slot["item"]
             if hasattr(item, 'texture_coords'):
                 tx, ty = item.texture_coords
-                texture_rect = pygame.Rect(tx * c.BLOCK_SIZE, ty * c.BLOCK_SIZE, c.BLOCK_SIZE, c.BLOCK_SIZE)
-                item_texture = self.atlas.subsurface(texture_rect)
-                scaled_texture = pygame.transform.scale(item_texture, (self.slot_size-8, self.slot_size-8))
+                scaled_texture = ICON_CACHE.icon(self.atlas, (tx, ty), self.slot_size-8)
                 surface.blit(scaled_texture, (4, 4))
         
         return surface
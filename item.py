@@ -1,3 +1,4 @@
+import copy
 import pygame
 import config as c
 import os  # Add this import at the top
@@ -263,6 +264,37 @@ def get_item_tooltip(item):
         
     return '\n'.join(lines)
 
+# Compact slot records used by block entities: [item id, quantity], plus
+# [modifiers, suffix] for enhanced items. None stands for an empty slot.
+def slot_to_record(slot):
+    if not slot or not slot.get("item"):
+        return None
+    item = slot["item"]
+    if getattr(item, "enhanced_suffix", ""):
+        return [item.id, slot["quantity"], dict(item.modifiers), item.enhanced_suffix]
+    return [item.id, slot["quantity"]]
+
+def block_item(item_id):
+    """Item variant of block ``item_id``; block items are not in ITEM_REGISTRY"""
+    from registry import REGISTRY  # registry imports this module
+    return getattr(REGISTRY.get_block(item_id), "item_variant", None)
+
+def record_to_slot(record, item_registry):
+    if not record:
+        return {"item": None, "quantity": 0}
+    item = item_registry.get(record[0])
+    if item is None:
+        item = block_item(record[0])
+    if item is None:
+        return {"item": None, "quantity": 0}
+    if len(record) > 2:
+        base_name = item.name
+        item = copy.copy(item)  # Enhanced items are not shared with the registry
+        item.modifiers = dict(record[2])
+        item.enhanced_suffix = record[3]
+        item.name = f"{base_name} {record[3]}"
+    return {"item": item, "quantity": record[1]}
+
 # Also register any tool items
 for tool in [ITEM_PICKAXE, ITEM_AXE, ITEM_SHOVEL, ITEM_SWORD]:
     if tool.id not in ITEM_REGISTRY:
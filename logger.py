@@ -0,0 +1,85 @@
+"""Leveled, per-subsystem logging.
+
+Every subsystem gets a child of the "game" logger:
+
+    from logger import get_logger
+    log = get_logger("inventory")
+    log.debug("Adding %d of %s", quantity, item.name)
+
+Pass arguments separately instead of pre-formatting with f-strings: a
+disabled call then costs a cached level check and nothing is formatted.
+Wrap multi-line dumps in ``if log.isEnabledFor(DEBUG):``.
+
+Levels come from LOG_LEVEL / LOG_LEVELS in config.py and can be changed at
+runtime with the console command ``log <subsystem|all> <level>``.
+"""
+import logging
+import config as c
+
+DEBUG = logging.DEBUG
+INFO = logging.INFO
+WARNING = logging.WARNING
+ERROR = logging.ERROR
+
+ROOT_NAME = "game"
+LEVEL_NAMES = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+# Every name the game passes to get_logger; add new subsystems here so set_level accepts them
+SUBSYSTEMS = ("chunks", "farming", "furnace", "inventory", "save", "world", "world_item")
+
+_root = logging.getLogger(ROOT_NAME)
+_configured = False
+
+def parse_level(level):
+    """Convert a level name or number to a logging level"""
+    if isinstance(level, int):
+        return level
+    name = str(level).upper()
+    if name not in LEVEL_NAMES:
+        raise ValueError(f"Unknown log level: {level}")
+    return getattr(logging, name)
+
+def configure(default=None, levels=None):
+    """Install the output handler and apply levels from config"""
+    global _configured
+    if not _configured:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("[%(name)s] %(levelname)s: %(message)s"))
+        _root.addHandler(handler)
+        _root.propagate = False
+        _configured = True
+    _root.setLevel(parse_level(default or c.LOG_LEVEL))
+    for subsystem, level in (c.LOG_LEVELS if levels is None else levels).items():
+        check_subsystem(subsystem)
+        get_logger(subsystem).setLevel(parse_level(level))
+
+def get_logger(subsystem):
+    """Return the logger for a subsystem, e.g. get_logger("furnace")"""
+    if not _configured:
+        configure()
+    return logging.getLogger(f"{ROOT_NAME}.{subsystem}")
+
+def check_subsystem(subsystem):
+    """Raise ValueError for a name no subsystem logs under, e.g. a typo in ``log chunk debug``"""
+    if subsystem not in subsystems():
+        raise ValueError(f"Unknown log subsystem: {subsystem} (known: {', '.join(subsystems())})")
+
+def set_level(subsystem, level):
+    """Change a subsystem's level at runtime; "all" resets every override"""
+    level = parse_level(level)
+    if subsystem == "all":
+        _root.setLevel(level)
+        for name in subsystems():
+            get_logger(name).setLevel(logging.NOTSET)
+    else:
+        check_subsystem(subsystem)
+        get_logger(subsystem).setLevel(level)
+
+def subsystems():
+    """Names of all subsystems: the known ones and any other that has requested a logger"""
+    prefix = ROOT_NAME + "."
+    requested = (name[len(prefix):] for name in logging.root.manager.loggerDict if name.startswith(prefix))
+    return sorted(set(SUBSYSTEMS).union(requested))
+
+def effective_levels():
+    """Map each known subsystem to the name of its effective level"""
+    return {name: logging.getLevelName(get_logger(name).getEffectiveLevel()) for name in subsystems()}
@@ -3,11 +3,13 @@ import math
 import random
 import time
 import block as b
-from worldgen import generate_chunk
 import config as c
 from sound_manager import SoundManager
 from character import Character
 from save_manager import SaveManager
+from chunk_store import ChunkStore
+from background_save import BackgroundSaver
+from autosave import Autosave
 from item import Item, IRON_PICKAXE, IRON_SWORD, IRON_AXE, APPLE, WATER_BOTTLE
 from world_item import WorldItem
 from crafting_ui import CraftingUI
@@ -23,11 +25,20 @@ from ui.progress_bar import ProgressBar
 from collections import deque
 from typing import Dict, Set
 import psutil
-import cProfile
+from frame_profiler import FrameProfiler
+from profile_capture import ProfileCapture
 from async_chunk_manager import AsyncChunkManager
-from texture_manager import TextureManager
+from texture_manager import TextureManager, tint_variants
+from chunk_raster import ChunkRasterizer, ChunkTile
+from surface_pool import SurfacePool
+from animation_clock import ANIMATION_CLOCK
+from text_cache import TEXT_CACHE
 import inventory
 import inventory_ui
+from registry import REGISTRY
+from logger import get_logger
+
+log = get_logger("world")
 
 class World:
     def __init__(self):
@@ -35,17 +46,17 @@ class World:
 
     def add_entity(self, entity):
         self.entities.append(entity)
-        print(f"Entity added to world: {entity}")
+        log.debug("Entity added to world: %s", entity)
 
     def update(self, dt, world_info):
         for entity in self.entities:
             entity.update(dt, world_info)
-            print(f"[DEBUG] Updated entity: {entity}")
+            log.debug("Updated entity: %s", entity)
 
     def draw(self, surface, cam_offset_x, cam_offset_y):
         for entity in self.entities:
             entity.draw(surface, cam_offset_x, cam_offset_y)
-            print(f"[DEBUG] Drew entity: {entity}")
+            log.debug("Drew entity: %s", entity)
 
 def create_light_mask(radius):
     mask = pygame.Surface((radius*2, radius*2), flags=pygame.SRCALPHA)
@@ -62,6 +73,75 @@ def create_light_mask(radius):
 # Precompute the light mask once (radius = 100)
 global_light_mask = create_light_mask(100)
 
+def update_water(world_chunks, current_chunk, chunk_width, world_height, frame_count):
+    """Advance the water simulation by one tick.
+
+    Chunks next to the player flow every tick, distant chunks every 15th tick.
+    Returns the indices of the chunks whose blocks changed.
+    """
+    changed = set()
+    for ci in list(world_chunks.keys()):
+        distance_from_player = abs(current_chunk - ci)
+        if distance_from_player < 2 or frame_count % 15 == 0:
+            chunk = world_chunks[ci]
+            # First pass: Check for downward flow
+            for y in range(world_height - 2, -1, -1):
+                for x in range(chunk_width - 1, -1, -1):
+                    if chunk[y][x] == b.WATER:
+                        # Check directly below first
+                        if y + 1 < world_height and chunk[y + 1][x] == b.AIR:
+                            chunk[y + 1][x] = b.WATER
+                            chunk[y][x] = b.AIR
+                            changed.add(ci)
+                            continue
+                        
+                        # Check diagonal down-left and down-right
+                        for dx in [-1, 1]:
+                            new_x = x + dx
+                            new_ci = ci
+                            
+                            # Handle chunk boundaries
+                            if new_x >= chunk_width:
+                                new_ci = ci + 1
+                                new_x = 0
+                            elif new_x < 0:
+                                new_ci = ci - 1
+                                new_x = chunk_width - 1
+
+                            if new_ci in world_chunks:
+                                if y + 1 < world_height and world_chunks[new_ci][y + 1][new_x] == b.AIR:
+                                    world_chunks[new_ci][y + 1][new_x] = b.WATER
+                                    chunk[y][x] = b.AIR
+                                    changed.update((ci, new_ci))
+                                    break
+
+            # Second pass: Handle horizontal flow
+            for y in range(world_height - 1, -1, -1):
+                for x in range(chunk_width - 1, -1, -1):
+                    if chunk[y][x] == b.WATER:
+                        # Only spread horizontally if we can't go down
+                        if y + 1 >= world_height or (chunk[y + 1][x] != b.AIR and chunk[y + 1][x] != b.WATER):
+                            # Try to spread horizontally
+                            for dx in [-1, 1]:
+                                new_x = x + dx
+                                new_ci = ci
+                                
+                                # Handle chunk boundaries
+                                if new_x >= chunk_width:
+                                    new_ci = ci + 1
+                                    new_x = 0
+                                elif new_x < 0:
+                                    new_ci = ci - 1
+                                    new_x = chunk_width - 1
+
+                                if new_ci in world_chunks and world_chunks[new_ci][y][new_x] == b.AIR:
+                                    # Only spread if there's support below
+                                    if y + 1 >= world_height or world_chunks[new_ci][y + 1][new_x] != b.AIR:
+                                        world_chunks[new_ci][y][new_x] = b.WATER
+                                        changed.add(new_ci)
+                                        # Don't remove source block for horizontal spread
+    return changed
+
 class ChunkManager:
     def __init__(self, chunk_width, view_distance):
         self.chunk_width = chunk_width
@@ -70,10 +150,18 @@ class ChunkManager:
         self.visible_chunks = set()
         self.chunk_load_queue = deque()
         self.chunk_unload_queue = deque()
-        self.cached_surfaces = {}
-        self.last_render_time = {}
+        self.tiles = {}  # chunk index -> {tile row: ChunkTile}
+        self.surface_pool = SurfacePool(on_evict=self._evict_tile)
+        self.tile_height = c.CHUNK_TILE_ROWS * c.BLOCK_SIZE
         self.stats = {
             'chunks_rendered': 0,
+            'tiles_rendered': 0,
+            'tiles_cached': 0,
+            'surface_pool_mb': 0,
+            'surfaces_allocated': 0,
+            'surfaces_reused': 0,
+            'tiles_evicted': 0,
+            'cells_animated': 0,
             'blocks_rendered': 0,
             'render_time': 0,
             'memory_usage': 0
@@ -82,6 +170,10 @@ class ChunkManager:
         self.async_manager = AsyncChunkManager(chunk_width, view_distance)
         self.texture_manager = TextureManager()
         self.texture_manager.load_atlas("texture_atlas.png")
+        # Chunks are drawn with each block's own tint, so those are the only variants baked
+        self.texture_manager.bake_tints(tint_variants(REGISTRY.block_lut()))
+        self.texture_manager.pin_block_textures(REGISTRY.block_lut())
+        self.rasterizer = ChunkRasterizer(self.texture_manager, REGISTRY.block_lut())
 
     def update_visible_chunks(self, camera_x, screen_width):
         """Calculate which chunks should be visible"""
@@ -89,6 +181,7 @@ class ChunkManager:
         right_chunk = (camera_x + screen_width//2) // (self.chunk_width * c.BLOCK_SIZE) + 1
         
         new_visible = set(range(left_chunk - 1, right_chunk + 1))
+        self.surface_pool.begin_frame()
         
         # Queue chunks to load/unload
         for chunk_idx in new_visible - self.visible_chunks:
@@ -98,70 +191,81 @@ class ChunkManager:
         
         self.visible_chunks = new_visible
 
-    def render_chunk(self, chunk_index, chunk, texture_atlas):
-        """Optimized chunk rendering with texture manager"""
-        if chunk_index in self.cached_surfaces:
-            last_update = self.last_render_time.get(chunk_index, 0)
-            if time.time() - last_update < 0.016:  # Reduced from 1.0 to ~1 frame at 60fps
-                return self.cached_surfaces[chunk_index]
-
-        surface = pygame.Surface((self.chunk_width * c.BLOCK_SIZE, c.WORLD_HEIGHT * c.BLOCK_SIZE), pygame.SRCALPHA)
-        
-        # Pre-calculate block size to avoid repeated lookups
-        block_size = c.BLOCK_SIZE
-        
-        # Group blocks by texture coordinates and tint
-        render_batches = {}
-        for y, row in enumerate(chunk):
-            for x, block in enumerate(row):
-                if block != b.AIR:
-                    # Convert texture coordinates to tuple if they're a list
-                    coords = tuple(block.texture_coords) if isinstance(block.texture_coords, list) else block.texture_coords
-                    # Ensure tint has alpha channel
-                    tint = None
-                    if hasattr(block, 'tint') and block.tint:
-                        if len(block.tint) == 3:
-                            tint = (*block.tint, 128)  # Add alpha if missing
-                        else:
-                            tint = block.tint
-                    key = (coords, tint)
-            for x, y in positions:
-                surface.blit(texture, (x, y))
-
-        self.cached_surfaces[chunk_index] = surface
-        self.last_render_time[chunk_index] = time.time()
-        return surface
-
-    def process_queues(self, world_chunks, seed):
+    def render_chunk(self, chunk_index, chunk, texture_atlas, top=0, bottom=None):
+        """Tiles of a chunk between pixel rows ``top`` and ``bottom`` as (surface, y) pairs
+
+        Only these tiles are rasterized, and only if their blocks changed since
+        they were last drawn; tiles off screen are left alone until scrolled to.
+        """
+        rows = c.CHUNK_TILE_ROWS
+        if bottom is None:
+            bottom = len(chunk) * c.BLOCK_SIZE
+        first = max(0, top // self.tile_height)
+        last = min((len(chunk) + rows - 1) // rows, -(-bottom // self.tile_height))
+        tiles = self.tiles.setdefault(chunk_index, {})
+        visible = []
+        for row in range(first, last):
+            band = chunk[row * rows:(row + 1) * rows]
+            tile = tiles.get(row)
+            if tile is None:
+                tile = tiles[row] = ChunkTile(self.surface_pool.acquire(
+                    (chunk_index, row), (self.chunk_width * c.BLOCK_SIZE, len(band) * c.BLOCK_SIZE)))
+            else:
+                self.surface_pool.touch((chunk_index, row))
+            if not tile.is_current(band):
+                self.rasterizer.render_tile(tile, band, ANIMATION_CLOCK if c.ANIMATE_BLOCKS else None)
+                self.stats['tiles_rendered'] += 1
+            if c.ANIMATE_BLOCKS:
+                self.stats['cells_animated'] += self.rasterizer.animate(tile, ANIMATION_CLOCK)
+            visible.append((tile.surface, row * self.tile_height))
+        return visible
+
+    def process_queues(self, world_chunks, seed, chunk_store):
         """Process chunk loading/unloading queues"""
         # Request chunks asynchronously
         current_chunk = max(world_chunks.keys()) if world_chunks else 0
         self.async_manager.request_chunks(current_chunk, seed)
         
-        # Get any completed chunks
+        # Get any completed chunks; never replace a chunk that is already loaded
         new_chunks = self.async_manager.get_ready_chunks()
-        world_chunks.update(new_chunks)
+        for chunk_idx, chunk in new_chunks.items():
+            if chunk_idx not in world_chunks:
+                world_chunks[chunk_idx] = chunk_store.adopt(chunk_idx, chunk)
         
         # Process unload queue
         while self.chunk_unload_queue and len(world_chunks) > self.view_distance * 2:
             chunk_idx = self.chunk_unload_queue.popleft()
             if chunk_idx in world_chunks:
-                del world_chunks[chunk_idx]
-            if chunk_idx in self.cached_surfaces:
-                del self.cached_surfaces[chunk_idx]
-            if chunk_idx in self.last_render_time:
-                del self.last_render_time[chunk_idx]
+                chunk_store.unload(chunk_idx, world_chunks.pop(chunk_idx))
+            self.release_tiles(chunk_idx)
 
     def update_stats(self):
         """Update performance statistics"""
         self.stats['memory_usage'] = psutil.Process().memory_info().rss / 1024 / 1024  # MB
         self.stats['chunks_rendered'] = len(self.visible_chunks)
+        self.stats['texture_hit_rate'] = self.texture_manager.texture_cache.hit_rate()
+        self.stats['tiles_cached'] = sum(len(tiles) for tiles in self.tiles.values())
+        self.stats['surface_pool_mb'] = self.surface_pool.memory_mb()
+        self.stats['surfaces_allocated'] = self.surface_pool.stats['allocated']
+        self.stats['surfaces_reused'] = self.surface_pool.stats['reused']
+        self.stats['tiles_evicted'] = self.surface_pool.stats['evicted']
 
     def invalidate_chunk(self, chunk_index):
-        """Mark a chunk for re-rendering with immediate update flag"""
-        if chunk_index in self.cached_surfaces:
-            del self.cached_surfaces[chunk_index]
-            self.last_render_time[chunk_index] = 0  # Force immediate update
+        """Redraw every tile of a chunk the next time it is shown
+
+        Tiles notice changed blocks themselves; this is for changes they cannot see.
+        """
+        self.release_tiles(chunk_index)
+
+    def release_tiles(self, chunk_index):
+        """Return the surfaces of a chunk's tiles to the pool"""
+        for row in self.tiles.pop(chunk_index, {}):
+            self.surface_pool.release((chunk_index, row))
+
+    def _evict_tile(self, key):
+        """The pool took back a tile's surface; it is rendered again when next shown"""
+        chunk_index, row = key
+        self.tiles.get(chunk_index, {}).pop(row, None)
 
 def main():
     pygame.init()
@@ -195,6 +299,12 @@ def main():
 
     # Use a dict to store chunks by index
     world_chunks = {}
+    # Unloaded chunks go to disk (and a small LRU) instead of being regenerated
+    chunk_store = ChunkStore(save_manager, seed, chunk_width, world_height)
+    # Saves are snapshotted here and written on a worker thread
+    background_saver = BackgroundSaver(save_manager)
+    # Dirty chunks and player data are written every AUTOSAVE_INTERVAL, a few chunks per frame
+    autosave = Autosave(save_manager, chunk_store, background_saver)
     # New: dictionary to record water flow directions:
     # Keys: (ci, x, y), Value: -1 (flow left) or 1 (flow right)
     water_flow = {}
@@ -220,6 +330,7 @@ def main():
     
     # Create ActionModeController instance.
     action_mode_controller = ActionModeController(texture_atlas, player_inventory)
+    action_mode_controller.chunk_store = chunk_store
 
     # Instantiate parallax background BEFORE creating console.
     parallax = ParallaxBackground(c.SCREEN_WIDTH, c.SCREEN_HEIGHT)
@@ -233,7 +344,7 @@ def main():
     mobs = [Mob(200, 100)]
 
     # Create the Console instance
-    console = Console(pygame.font.SysFont(None, 24), c.SCREEN_WIDTH, c.SCREEN_HEIGHT, player, player_inventory, mobs)
+    console = Console(TEXT_CACHE.font(24), c.SCREEN_WIDTH, c.SCREEN_HEIGHT, player, player_inventory, mobs)
     # NEW: Connect console callbacks using the already created parallax instance.
     console.callbacks['setweather'] = parallax.set_weather
     console.callbacks['setday'] = lambda: world_time.__setitem__(0, 0)
@@ -265,27 +376,44 @@ def main():
     health_bar = ProgressBar(10, c.SCREEN_HEIGHT - 90, 200, 20, color=(255, 50, 50))
     hunger_bar = ProgressBar(10, c.SCREEN_HEIGHT - 60, 200, 20, color=(139, 69, 19))
     thirst_bar = ProgressBar(10, c.SCREEN_HEIGHT - 30, 200, 20, color=(0, 191, 255))
+    save_bar = ProgressBar(c.SCREEN_WIDTH - 210, 10, 200, 20, color=(80, 160, 255))
 
     # Add chunk manager
     chunk_manager = ChunkManager(chunk_width, view_distance)
     
     # Add performance monitoring variables
     frame_times = deque(maxlen=60)
-    profiler = cProfile.Profile()
+    profile_capture = ProfileCapture(output=console.write)
+    console.manager.profile_capture = profile_capture
+    frame_profiler = FrameProfiler()
     show_debug = False
 
+    def set_block(chunk_index, local_x, world_y, block):
+        """Change a block and mark its chunk for saving"""
+        world_chunks[chunk_index][world_y][local_x] = block
+        chunk_store.mark_dirty(chunk_index)
+
+    def quit_game():
+        """Persist modified chunks and shut down"""
+        background_saver.stop()
+        chunk_store.stop()
+        chunk_store.save_loaded(world_chunks)
+        save_manager.close()
+        chunk_manager.async_manager.cleanup()
+        pygame.quit()
+
     def handle_block_break(chunk_index, local_x, world_y, block, player_inventory):
         """Handle block breaking logic"""
         selected = player_inventory.get_selected_item()
         if selected and hasattr(selected["item"], "effective_against") and selected["item"].effective_against:
             tool = selected["item"]
             if block.name in tool.effective_against:
-                world_chunks[chunk_index][world_y][local_x] = b.AIR
+                set_block(chunk_index, local_x, world_y, b.AIR)
                 if block.item_variant and block != b.AIR:
                     player_inventory.add_item(block.item_variant, 1)
                 return True
         else:
-            world_chunks[chunk_index][world_y][local_x] = b.AIR
+            set_block(chunk_index, local_x, world_y, b.AIR)
             if block.item_variant and block != b.AIR:
                 player_inventory.add_item(block.item_variant, 1)
             return True
@@ -314,7 +442,7 @@ def main():
         
         if (world_chunks[chunk_index][world_y][local_x] == b.AIR and 
             not player.rect.colliderect(block_world_rect)):
-            world_chunks[chunk_index][world_y][local_x] = block_to_place
+            set_block(chunk_index, local_x, world_y, block_to_place)
             player_inventory.update_quantity(selected, -1)
             return True
             
@@ -323,6 +451,8 @@ def main():
     while True:
         start_time = time.time()
         dt = clock.tick(60)  # milliseconds since last frame
+        ANIMATION_CLOCK.update(dt)
+        frame_profiler.begin_frame()
         # Reset placement flags when mouse buttons are released:
         mouse_buttons = pygame.mouse.get_pressed()
         if not mouse_buttons[0] and not mouse_buttons[2]:
@@ -352,6 +482,7 @@ def main():
                 brightness = 0.2
 
         # Event handling
+        frame_profiler.start("input")
         for event in pygame.event.get():
             # Handle death menu events first if active
             if death_menu and not player.is_alive:
@@ -374,7 +505,7 @@ def main():
                 continue
 
             if event.type == pygame.QUIT:
-                pygame.quit()
+                quit_game()
                 return
             # Modified MOUSEBUTTONDOWN handling for movement mode attacks:
             elif event.type == pygame.MOUSEBUTTONDOWN:
@@ -398,12 +529,14 @@ def main():
                                         # Check for hoe type
                                         if item_obj.type == "hoe" and not block.tilled:
                                             block.till()
+                                            chunk_store.mark_dirty(chunk_index)
                                             print(f"Tilled soil at ({world_x}, {world_y})")
                                             continue
                                         # Handle seed planting
                                         elif hasattr(item_obj, 'is_seed') and item_obj.is_seed:
                                             if block.tilled and hasattr(block, 'plant_seed'):
                                                 if block.plant_seed(item_obj):
+                                                    chunk_store.mark_dirty(chunk_index)
                                                     player_inventory.update_quantity(selected, -1)
                                                     print(f"Planted {item_obj.name}")
                                                     continue
@@ -451,7 +584,7 @@ def main():
                                             print(f"Debug: Target block: {target_block.name}")
                                             if target_block.name.lower() in [t.lower() for t in effective_list]:
                                                 print("Axe hit", target_block.name, "-> breaking block.")
-                                                world_chunks[chunk_index][world_y][local_x] = b.AIR
+                                                set_block(chunk_index, local_x, world_y, b.AIR)
                                                 if target_block.drop_item:
                                                     player_inventory.add_item(target_block.drop_item, 1)
                                                     print(f"Added {target_block.drop_item.name} to inventory.")
@@ -473,7 +606,7 @@ def main():
                                             print(f"Debug: Target block: {target_block.name}")
                                             if target_block.name.lower() in [t.lower() for t in effective_list]:
                                                 print("Pickaxe hit", target_block.name, "-> breaking block.")
-                                                world_chunks[chunk_index][world_y][local_x] = b.AIR
+                                                set_block(chunk_index, local_x, world_y, b.AIR)
                                                 if target_block.drop_item:
                                                     player_inventory.add_item(target_block.drop_item, 1)
                                                     print(f"Added {target_block.drop_item.name} to inventory.")
@@ -509,12 +642,14 @@ def main():
                                 # Check specifically for hoe type
                                 if item.type == "hoe" and not block.tilled:
                                     block.till()
+                                    chunk_store.mark_dirty(chunk_index)
                                     print(f"Tilled soil at ({world_x}, {world_y})")
                                     continue
                                 # Handle seed planting
                                 elif hasattr(item, 'is_seed') and item.is_seed and block.tilled:
                                     if hasattr(block, 'plant_seed'):
                                         if block.plant_seed(item):
+                                            chunk_store.mark_dirty(chunk_index)
                                             player_inventory.update_quantity(selected, -1)
                                             print(f"Planted {item.name}")
                                             continue
@@ -532,6 +667,10 @@ def main():
                         elif isinstance(block, b.EnhancerBlock):  # Add this section
                             enhancer_ui = EnhancerUI(screen, player_inventory, texture_atlas)
                             enhancer_ui.run()
+                        if isinstance(block, (b.StorageBlock, b.FurnaceBlock, b.EnhancerBlock)):
+                            # The UIs move items between the block and the inventory directly
+                            chunk_store.mark_dirty(chunk_index)
+                            player_inventory.mark_dirty()
             if event.type == pygame.KEYDOWN:
                 # New: Press "n" to cycle weather for testing instead of "w"
                 if event.key == pygame.K_n:
@@ -544,6 +683,12 @@ def main():
                     else:
                         parallax.set_weather("rain")
                     print("Weather set to:", parallax.weather)
+                # F3 toggles the performance overlay, F4 dumps frame timings to CSV
+                if event.key == pygame.K_F3:
+                    show_debug = not show_debug
+                    frame_profiler.toggle()
+                if event.key == pygame.K_F4:
+                    print("Frame timings written to", frame_profiler.dump_csv())
                 if event.key == pygame.K_m:
                     action_mode = not action_mode
                     print("Action mode:", action_mode)
@@ -552,7 +697,7 @@ def main():
                     ingame_menu = InGameMenu(screen)
                     selection = ingame_menu.run()
                     if selection == "Quit Game":
-                        pygame.quit()
+                        quit_game()
                         return
                 if event.key == pygame.K_SPACE:
                     center_x = int((player.rect.x + player.rect.width/2) // block_size)
@@ -569,15 +714,24 @@ def main():
                             sound_manager.play_jump()  # play jump sound
                 if event.key == pygame.K_o:
                     # Save current state (world + player)
-                    print("Saving game state...")
-                    save_manager.save_all(world_chunks, player, player_inventory)
-                    print("Game state saved.")
+                    print("Saving game state in the background...")
+                    saved_chunks = chunk_store.dirty_chunks(world_chunks)
+                    background_saver.start(world_chunks, player, player_inventory, saved_chunks,
+                                           on_failed=lambda chunks=saved_chunks: autosave.save_failed(chunks))
+                    if c.SAVE_FORMAT == "region":
+                        chunk_store.mark_saved(saved_chunks)
+                    autosave.mark_player_saved(player, player_inventory)
                 if event.key == pygame.K_p:
                     # Load saved world and player data
-                    loaded_world, loaded_player = save_manager.load_all(b.BLOCK_MAP)
-                    if loaded_world:
+                    # Only the player's surroundings are decoded right away; the rest streams in as needed
+                    background_saver.wait()  # Never load a half-written save
+                    loaded_world, loaded_player = save_manager.load_all(b.BLOCK_MAP, chunk_indices=())
+                    if loaded_world is not None:
                         world_chunks.clear()
+                        chunk_store.reset()
                         world_chunks.update(loaded_world)
+                        for ci in list(loaded_world) + list(save_manager.json_chunks):
+                            chunk_store.mark_dirty(ci)  # Older JSON saves are not in the region files yet
                     if loaded_player:
                         pdata = loaded_player.get("player", {})
                         player.rect.x = pdata.get("x", player.rect.x)
@@ -611,20 +765,25 @@ def main():
                     # Open full inventory UI when 'i' is pressed.
                     inv_ui = inventory_ui.InventoryUI(screen, player_inventory, texture_atlas)
                     inv_ui.run()
+                    player_inventory.mark_dirty()
                 if event.key == pygame.K_q:  # open Crafting UI when "q" is pressed
                     crafting_ui = CraftingUI(screen, player_inventory, texture_atlas)
                     crafting_ui.run()
+                    player_inventory.mark_dirty()
                 # Update hotbar selection on number key press.
                 if pygame.K_1 <= event.key <= pygame.K_9:
                     slot_index = event.key - pygame.K_1
                     player_inventory.select_hotbar_slot(slot_index)
         
+        frame_profiler.stop("input")
+
         # Check for death and create menu
         if player.death_triggered:
             death_menu = DeathMenu(c.SCREEN_WIDTH, c.SCREEN_HEIGHT)
             player.death_triggered = False
 
         # Update horizontal movement and animations (pass dt to update)
+        frame_profiler.start("physics")
         if not action_mode:
             keys = pygame.key.get_pressed()
             player.update(keys, dt, player_inventory)
@@ -664,6 +823,7 @@ def main():
                             new_rect.top = block_rect.bottom
                             player_vy = 0
         player.rect.y = new_rect.y
+        frame_profiler.stop("physics")
 
         # Remove duplicate vertical movement update:
         # Commented out because vertical collision resolution already adjusted player's y position.
@@ -672,13 +832,24 @@ def main():
         # Calculate current chunk index based on player.rect.x
         current_chunk = player.rect.x // (chunk_width * block_size)
         
-        # Load new chunks within view_distance and unload out-of-range chunks
-        for ci in range(current_chunk - view_distance, current_chunk + view_distance + 1):
+        # Load new chunks within view_distance and unload out-of-range chunks.
+        # The player's own chunk and its neighbours load now, the rest stream in nearest first.
+        for ci, chunk in chunk_store.collect():
+            if ci not in world_chunks:
+                world_chunks[ci] = chunk
+        for ci in sorted(range(current_chunk - view_distance, current_chunk + view_distance + 1),
+                         key=lambda ci: abs(ci - current_chunk)):
             if ci not in world_chunks:
-                world_chunks[ci] = generate_chunk(ci, chunk_width, world_height, seed)
+                distance = abs(ci - current_chunk)
+                if distance <= c.CHUNK_SYNC_RADIUS:
+                    world_chunks[ci] = chunk_store.load(ci)
+                else:
+                    chunk = chunk_store.request(ci, distance)
+                    if chunk is not None:
+                        world_chunks[ci] = chunk
         for ci in list(world_chunks.keys()):
             if ci < current_chunk - view_distance or ci > current_chunk + view_distance:
-                del world_chunks[ci]
+                chunk_store.unload(ci, world_chunks.pop(ci))
         
         # Update camera offset to follow player in all directions.
         cam_offset_x = player.rect.x - (c.SCREEN_WIDTH // 2)  # updated dynamic centering
@@ -726,12 +897,12 @@ def main():
                     if selected and hasattr(selected["item"], "effective_against") and selected["item"].effective_against:
                         tool = selected["item"]
                         if block.name in tool.effective_against:
-                            world_chunks[chunk_index][world_y][local_x] = b.AIR
+                            set_block(chunk_index, local_x, world_y, b.AIR)
                             if block.item_variant and block != b.AIR:
                                 player_inventory.add_item(block.item_variant, 1)
                             broken = True
                     else:
-                        world_chunks[chunk_index][world_y][local_x] = b.AIR
+                        set_block(chunk_index, local_x, world_y, b.AIR)
                         if block.item_variant and block != b.AIR:
                             player_inventory.add_item(block.item_variant, 1)
                         broken = True
@@ -765,7 +936,7 @@ def main():
                                 if isinstance(block_to_place, (b.StorageBlock, b.FurnaceBlock)):
                                     block_to_place = block_to_place.create_instance()
                                 
-                                world_chunks[chunk_index][world_y][local_x] = block_to_place
+                                set_block(chunk_index, local_x, world_y, block_to_place)
                                 placed_water = True
                                 print(f"Block placed: {block_to_place.name} at ({world_x}, {world_y})")
                                 player_inventory.update_quantity(selected, -1)
@@ -775,6 +946,7 @@ def main():
                         else:
                             print(f"Cannot place non-block item: {item_obj.name}")
         # Apply gravity and update vertical position
+        frame_profiler.start("physics")
         player.rect.y += player_vy
         # Check both bottom-left and bottom-right corners for water
         foot_left_x = player.rect.x + 2
@@ -821,8 +993,10 @@ def main():
         # Update player; pass world_info and mobs for optimized attack collision detection.
         keys = pygame.key.get_pressed()
         player.update(keys, dt, in_water, world_info, mobs, player_inventory)
+        frame_profiler.stop("physics")
         
         # Update mobs; pass world_info and player (not inventory) for collision detection.
+        frame_profiler.start("mob_ai")
         for mob in mobs:
             mob.update(dt, world_info, player)  # Changed from player_inventory to player
 
@@ -833,8 +1007,10 @@ def main():
                 for item in dropped_items:
                     player_inventory.add_item(item)
                 mobs.remove(mob)
+        frame_profiler.stop("mob_ai")
 
         # Head collision detection (for upward jumps)
+        frame_profiler.start("physics")
         if player_vy < 0:
             head_x = player.rect.x + player.rect.width // 2
             head_y = player.rect.y  # top of player
@@ -860,91 +1036,49 @@ def main():
             player.on_ground = True  # mark as grounded
         else:
             player.on_ground = False
+        frame_profiler.stop("physics")
 
         # Water simulation update:
-        for ci in list(world_chunks.keys()):
-            distance_from_player = abs(current_chunk - ci)
-            if distance_from_player < 2 or update_frame_count % 15 == 0:
-                chunk = world_chunks[ci]
-                # First pass: Check for downward flow
-                for y in range(world_height - 2, -1, -1):
-                    for x in range(chunk_width - 1, -1, -1):
-                        if chunk[y][x] == b.WATER:
-                            # Check directly below first
-                            if y + 1 < world_height and chunk[y + 1][x] == b.AIR:
-                                chunk[y + 1][x] = b.WATER
-                                chunk[y][x] = b.AIR
-                                continue
-                            
-                            # Check diagonal down-left and down-right
-                            for dx in [-1, 1]:
-                                new_x = x + dx
-                                new_ci = ci
-                                
-                                # Handle chunk boundaries
-                                if new_x >= chunk_width:
-                                    new_ci = ci + 1
-                                    new_x = 0
-                                elif new_x < 0:
-                                    new_ci = ci - 1
-                                    new_x = chunk_width - 1
-
-                                if new_ci in world_chunks:
-                                    if y + 1 < world_height and world_chunks[new_ci][y + 1][new_x] == b.AIR:
-                                        world_chunks[new_ci][y + 1][new_x] = b.WATER
-                                        chunk[y][x] = b.AIR
-                                        break
-
-                # Second pass: Handle horizontal flow
-                for y in range(world_height - 1, -1, -1):
-                    for x in range(chunk_width - 1, -1, -1):
-                        if chunk[y][x] == b.WATER:
-                            # Only spread horizontally if we can't go down
-                            if y + 1 >= world_height or (chunk[y + 1][x] != b.AIR and chunk[y + 1][x] != b.WATER):
-                                # Try to spread horizontally
-                                for dx in [-1, 1]:
-                                    new_x = x + dx
-                                    new_ci = ci
-                                    
-                                    # Handle chunk boundaries
-                                    if new_x >= chunk_width:
-                                        new_ci = ci + 1
-                                        new_x = 0
-                                    elif new_x < 0:
-                                        new_ci = ci - 1
-                                        new_x = chunk_width - 1
-
-                                    if new_ci in world_chunks and world_chunks[new_ci][y][new_x] == b.AIR:
-                                        # Only spread if there's support below
-                                        if y + 1 >= world_height or world_chunks[new_ci][y + 1][new_x] != b.AIR:
-                                            world_chunks[new_ci][y][new_x] = b.WATER
-                                            # Don't remove source block for horizontal spread
+        frame_profiler.start("water")
+        for ci in update_water(world_chunks, current_chunk, chunk_width, world_height, update_frame_count):
+            chunk_store.mark_dirty(ci)
+        frame_profiler.stop("water")
 
         # Update world items: pass world_info for collision detection.
+        frame_profiler.start("physics")
         for world_item in world_items:
             world_item.update(dt, world_info)
+        frame_profiler.stop("physics")
 
         # Update visible chunks based on camera position
         chunk_manager.update_visible_chunks(player.rect.x, c.SCREEN_WIDTH)
         
         # Process chunk loading/unloading
-        chunk_manager.process_queues(world_chunks, seed)
+        chunk_manager.process_queues(world_chunks, seed, chunk_store)
+
+        # Snapshot a few dirty chunks if an autosave pass is running
+        frame_profiler.start("autosave")
+        autosave.update(dt, world_chunks, player, player_inventory)
+        frame_profiler.stop("autosave")
 
         # Clear screen and draw background
         screen.fill((135, 206, 235))
         parallax.draw(screen, cam_offset_x, dt)
 
         # Batch render visible chunks
+        frame_profiler.start("chunk_render")
         render_start = time.time()
         chunks_rendered = 0
         for chunk_index in chunk_manager.visible_chunks:
-            if chunk_index in world_chunks:
-                chunk_surface = chunk_manager.render_chunk(chunk_index, world_chunks[chunk_index], texture_atlas)
-                screen.blit(chunk_surface, 
-                          (chunk_index * chunk_width * block_size - cam_offset_x,
-                           -cam_offset_y))
+            chunk_x = chunk_index * chunk_width * block_size - cam_offset_x
+            # visible_chunks keeps a margin of loaded chunks on both sides that need no drawing
+            if chunk_index in world_chunks and -chunk_width * block_size < chunk_x < c.SCREEN_WIDTH:
+                tiles = chunk_manager.render_chunk(chunk_index, world_chunks[chunk_index], texture_atlas,
+                                                   cam_offset_y, cam_offset_y + c.SCREEN_HEIGHT)
+                screen.blits([(surface, (chunk_x, y - cam_offset_y)) for surface, y in tiles], doreturn=False)
                 chunks_rendered += 1
         chunk_manager.stats['render_time'] = time.time() - render_start
+        frame_profiler.stop("chunk_render")
 
         # Render world items
         for world_item in world_items:
@@ -959,13 +1093,20 @@ def main():
                 mob.draw(screen, cam_offset_x, cam_offset_y)
         
         # New: Render HUD for health, hunger, and thirst.
+        frame_profiler.start("hud")
         health_bar.draw(screen, player.health, "Health")
         hunger_bar.draw(screen, player.hunger, "Hunger")
         thirst_bar.draw(screen, player.thirst, "Thirst")
+        if background_saver.busy:
+            done, total = background_saver.progress
+            save_bar.max_value = max(1, total)
+            save_bar.draw(screen, done, "Saving")
+        frame_profiler.stop("hud")
         
         # Remove old overlay code.
         
         # New: Optimized Lightmap rendering
+        frame_profiler.start("lighting")
         lightmap = pygame.Surface((c.SCREEN_WIDTH, c.SCREEN_HEIGHT), flags=pygame.SRCALPHA)
         ambient_darkness = int((1 - brightness) * 250)
         lightmap.fill((0, 0, 0, ambient_darkness))
@@ -983,18 +1124,15 @@ def main():
         lightmap.blit(lightning_effect, (0, 0), special_flags=pygame.BLEND_RGBA_ADD)
         # Blit the final lightmap over the scene.
         screen.blit(lightmap, (0, 0))
+        frame_profiler.stop("lighting")
         
         # Player coordinate debug text at top left
-        font = pygame.font.SysFont(None, 24)  # reusing font instance
-
+        frame_profiler.start("hud")
         current_chunk = player.rect.x // (chunk_width * block_size)
         player_coord = f"Player: X: {player.rect.x}, Y: {player.rect.y}, Z: {current_chunk}"
-        coord_surface = font.render(player_coord, True, (255,165,0))  # changed to orange
-        coord_rect = coord_surface.get_rect(topleft=(5, 5))
-        screen.blit(coord_surface, coord_rect)
+        TEXT_CACHE.draw(screen, player_coord, 24, (255, 165, 0), topleft=(5, 5))  # changed to orange
         
         # Debug text rendering at top-right corner
-        font = pygame.font.SysFont(None, 24)
         mode_text = "Mode: Action" if action_mode else "Mode: Movement"
         debug_lines = [mode_text]
         if action_mode:
@@ -1008,25 +1146,23 @@ def main():
             debug_lines.append(f"Z: {chunk_index}")
         y_offset = 5
         for line in debug_lines:
-            text_surface = font.render(line, True, (255,165,0))  # changed to orange
-            text_rect = text_surface.get_rect(topright=(screen.get_width() - 5, y_offset))
-            screen.blit(text_surface, text_rect)
+            text_rect = TEXT_CACHE.draw(screen, line, 24, (255, 165, 0), topright=(screen.get_width() - 5, y_offset))
             y_offset += text_rect.height + 2
 
         # Add FPS debug display at top middle.
         fps = int(clock.get_fps())
         fps_text = f"FPS: {fps}"
-        fps_surface = pygame.font.SysFont(None, 24).render(fps_text, True, (255, 255, 0))
-        fps_rect = fps_surface.get_rect(center=(c.SCREEN_WIDTH//2, 10))
-        screen.blit(fps_surface, fps_rect)
+        TEXT_CACHE.draw(screen, fps_text, 24, (255, 255, 0), center=(c.SCREEN_WIDTH//2, 10))
 
         # Draw hotbar UI
         player_inventory.draw_hotbar(screen, texture_atlas)
 
         # Draw console on top of the game if active
         console.draw(screen)
+        frame_profiler.stop("hud")
 
         # Check for player proximity to spawner blocks and spawn entities
+        frame_profiler.start("spawners")
         for ci, chunk in world_chunks.items():
             for y, row in enumerate(chunk):
                 for x, block_obj in enumerate(row):
@@ -1063,30 +1199,42 @@ def main():
                                     last_spawn_time[(ci, x, y)] = current_time
                                     print(f"Spawned fallback mob at ({spawner_x}, {spawner_y})")
 
+        frame_profiler.stop("spawners")
+
         # Draw death menu last (after console)
         if death_menu and not player.is_alive:
             death_menu.draw(screen)
 
         # Add plant growth updates to the game loop
+        frame_profiler.start("farms")
         for ci, chunk in world_chunks.items():
             for y, row in enumerate(chunk):
                 for x, block_obj in enumerate(row):
                     if isinstance(block_obj, b.FarmingBlock):
-                        block_obj.update(dt)
+                        if block_obj.update(dt):
+                            chunk_store.mark_dirty(ci)  # The plant grew a stage
+        frame_profiler.stop("farms")
 
         # Draw performance stats if debug mode is on
+        frame_profiler.start("hud")
         if show_debug:
-            stats_surface = pygame.Surface((200, 100), pygame.SRCALPHA)
+            if update_frame_count % 30 == 0:
+                chunk_manager.update_stats()
+            stats_surface = pygame.Surface((200, 10 + 20 * len(chunk_manager.stats)), pygame.SRCALPHA)
             stats_surface.fill((0, 0, 0, 128))
             y = 5
             for stat, value in chunk_manager.stats.items():
-                text = f"{stat}: {value:.2f}"
-                text_surf = font.render(text, True, (255, 255, 255))
-                stats_surface.blit(text_surf, (5, y))
+                TEXT_CACHE.draw(stats_surface, f"{stat}: {value:.2f}", 24, (255, 255, 255), topleft=(5, y))
                 y += 20
             screen.blit(stats_surface, (5, 5))
+            frame_profiler.draw(screen, pos=(5, 5 + stats_surface.get_height() + 5))
+        frame_profiler.stop("hud")
 
+        frame_profiler.start("flip")
         pygame.display.flip()
+        frame_profiler.stop("flip")
+        frame_profiler.end_frame()
+        profile_capture.end_frame()
         
         # Update frame time tracking
         frame_time = time.time() - start_time
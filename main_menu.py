@@ -1,10 +1,11 @@
 import pygame
+from text_cache import TEXT_CACHE
 
 class MainMenu:
     def __init__(self, screen):
         self.screen = screen
         self.clock = pygame.time.Clock()
-        self.font = pygame.font.SysFont(None, 48)
+        self.font = TEXT_CACHE.font(48)
         self.options = ["Start Game", "Quit"]
         self.selected = 0
 
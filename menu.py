@@ -1,11 +1,12 @@
 import pygame
 from settings import Settings
+from text_cache import TEXT_CACHE
 
 class Menu:
     def __init__(self, screen):
         self.screen = screen
         self.clock = pygame.time.Clock()
-        self.font = pygame.font.SysFont(None, 36)
+        self.font = TEXT_CACHE.font(36)
         self.options = ["New Game", "Load Game", "Options", "Quit"]
         self.selected = 0
         self.settings = Settings()
@@ -0,0 +1,98 @@
+import cProfile
+import os
+import pstats
+import time
+import config as c
+
+class ProfileCapture:
+    """On-demand cProfile sessions driven from the in-game console.
+
+    A session either runs until stop() or, when started with a frame count,
+    stops itself after that many calls to end_frame().
+    """
+
+    def __init__(self, output=print):
+        self.output = output  # Callable receiving one line of text
+        self.profiler = None
+        self.active = False
+        self.frames_remaining = None
+        self.frames_captured = 0
+        self.started_at = 0
+
+    def start(self, frames=None):
+        """Begin a new session, optionally limited to a number of frames"""
+        if self.active:
+            self.output("Profiler already running; use 'profile stop' first")
+            return False
+        self.profiler = cProfile.Profile()
+        self.frames_remaining = frames
+        self.frames_captured = 0
+        self.started_at = time.perf_counter()
+        self.active = True
+        self.profiler.enable()
+        if frames:
+            self.output(f"Profiling the next {frames} frames")
+        else:
+            self.output("Profiling started")
+        return True
+
+    def stop(self, path=None):
+        """End the session, write the .prof file and print a top-N summary"""
+        if not self.active:
+            self.output("Profiler is not running")
+            return None
+        self.profiler.disable()
+        self.active = False
+        elapsed = time.perf_counter() - self.started_at
+
+        path = self._resolve_path(path)
+        self.profiler.dump_stats(path)
+        self.output(f"Profiled {self.frames_captured} frames ({elapsed:.2f}s) -> {path}")
+        for line in self.summary():
+            self.output(line)
+        return path
+
+    def end_frame(self):
+        """Count a finished frame and stop the session if its window is over"""
+        if not self.active:
+            return
+        self.frames_captured += 1
+        if self.frames_remaining is not None:
+            self.frames_remaining -= 1
+            if self.frames_remaining <= 0:
+                self.stop()
+
+    def status(self):
+        """Describe the current session"""
+        if not self.active:
+            return "Profiler idle"
+        if self.frames_remaining is not None:
+            return f"Profiling: {self.frames_captured} frames captured, {self.frames_remaining} to go"
+        return f"Profiling: {self.frames_captured} frames captured"
+
+    def summary(self, top_n=None, sort=None):
+        """Return the heaviest functions of the last session as text lines"""
+        if self.profiler is None:
+            return []
+        top_n = top_n or c.PROFILE_TOP_N
+        sort = sort or c.PROFILE_SORT
+        stats = pstats.Stats(self.profiler)
+        sort_index = {"tottime": 2, "cumulative": 3}.get(sort, 2)
+        rows = sorted(stats.stats.items(), key=lambda entry: entry[1][sort_index], reverse=True)
+
+        lines = [f"{'self ms':>9} {'cum ms':>9} {'calls':>8}  function (by {sort})"]
+        for (filename, line, func), (_, calls, tottime, cumtime, _) in rows[:top_n]:
+            location = f" ({os.path.basename(filename)}:{line})" if line else ""  # Built-ins have no file
+            lines.append(f"{tottime * 1000:9.1f} {cumtime * 1000:9.1f} {calls:8d}  {func}{location}")
+        return lines
+
+    def _resolve_path(self, path):
+        """Default to the profile directory and ensure a .prof extension"""
+        if not path:
+            path = f"profile_{time.strftime('%Y%m%d_%H%M%S')}.prof"
+        if not path.endswith(".prof"):
+            path += ".prof"
+        if not os.path.dirname(path):
+            path = os.path.join(c.PROFILER_DUMP_DIR, path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        return path
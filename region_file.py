@@ -0,0 +1,355 @@
+"""Region files: many chunks per file with random access to each chunk.
+
+Chunk ``ci`` lives in region ``ci // REGION_SIZE`` at slot ``ci % REGION_SIZE``
+(negative chunk indices map to negative regions). A region file is a sequence
+of SECTOR_SIZE byte sectors:
+
+    sector 0     header: magic, format version, then one (first sector,
+                 sector count) entry per slot; (0, 0) means the slot is empty
+    sector 1..   chunk records: uint32 length, uint8 compression, uint32
+                 crc32 of the stored data (version 2), data
+
+Reading or rewriting one chunk only touches the header entry and that chunk's
+sectors, so the cost of a save scales with the chunks that changed.
+
+Writes never touch the sectors a header entry on disk points at: a new copy
+goes to free sectors, and the header entries are only switched over in
+flush(), after the data itself. A crash therefore leaves every slot on a
+complete old or new copy, and the checksum catches the rest (a torn sector,
+a bad disk), so one damaged chunk can be regenerated on its own. Reads go
+through a read-only memory map of the file: a chunk is decompressed straight
+from the mapped pages, and only the pages of the chunks actually read are
+ever loaded, however large the region file grows.
+"""
+import mmap
+import os
+import struct
+import zlib
+import config as c
+from logger import get_logger
+
+log = get_logger("save")
+
+MAGIC = b"RGN1"
+FORMAT_VERSION = 2
+SECTOR_SIZE = 512
+REGION_SIZE = c.REGION_SIZE
+
+COMPRESSION_NONE = 0
+COMPRESSION_ZLIB = 1
+CHECKSUM_FLAG = 0x80  # Set on the compression byte of records that carry a crc32 (version 2)
+
+HEADER_PREFIX = struct.Struct("<4sHH")  # magic, version, slot count
+HEADER_ENTRY = struct.Struct("<II")     # first sector, sector count
+RECORD_HEADER = struct.Struct("<IB")    # data length + 1, compression type
+RECORD_CHECKSUM = struct.Struct("<I")   # crc32 of the stored data
+HEADER_SECTORS = -(-(HEADER_PREFIX.size + HEADER_ENTRY.size * REGION_SIZE) // SECTOR_SIZE)
+
+class RegionFormatError(Exception):
+    """Raised when a region file is truncated or not a region file"""
+
+class ChunkCorruptError(RegionFormatError):
+    """Raised when a single chunk record is damaged; the rest of the region is fine"""
+
+def region_coords(ci):
+    """Return (region index, slot) for a chunk index"""
+    return ci // REGION_SIZE, ci % REGION_SIZE
+
+def region_filename(region):
+    return f"r.{region}.rgn"
+
+class RegionFile:
+    """One region file opened for random-access chunk reads and writes"""
+
+    def __init__(self, path):
+        self.path = path
+        exists = os.path.exists(path)
+        self.file = open(path, "r+b" if exists else "w+b")
+        self.entries = [(0, 0)] * REGION_SIZE
+        self.version = FORMAT_VERSION
+        self._map = None         # Read-only mmap of the file, replaced when the file outgrows it
+        self._unflushed = False  # Writes still in the file object's buffer
+        self._committed = {}     # slot -> entry still in the header on disk, until flush() switches it
+        try:
+            if exists and os.path.getsize(path) > 0:
+                self._read_header()
+            else:
+                self._write_header()
+        except Exception:
+            self.file.close()
+            raise
+
+    def _read_header(self):
+        self.file.seek(0)
+        data = self.file.read(HEADER_SECTORS * SECTOR_SIZE)
+        if len(data) < HEADER_PREFIX.size + HEADER_ENTRY.size * REGION_SIZE:
+            raise RegionFormatError(f"{self.path}: truncated header")
+        magic, version, slots = HEADER_PREFIX.unpack_from(data)
+        if magic != MAGIC or slots != REGION_SIZE:
+            raise RegionFormatError(f"{self.path}: not a region file")
+        if version > FORMAT_VERSION:
+            raise RegionFormatError(f"{self.path}: unsupported region version {version}")
+        self.version = version
+        self.entries = [HEADER_ENTRY.unpack_from(data, HEADER_PREFIX.size + i * HEADER_ENTRY.size)
+                        for i in range(REGION_SIZE)]
+
+    def _write_header(self):
+        header = bytearray(HEADER_SECTORS * SECTOR_SIZE)
+        HEADER_PREFIX.pack_into(header, 0, MAGIC, FORMAT_VERSION, REGION_SIZE)
+        for i, entry in enumerate(self.entries):
+            HEADER_ENTRY.pack_into(header, HEADER_PREFIX.size + i * HEADER_ENTRY.size, *entry)
+        self.file.seek(0)
+        self.file.write(header)
+
+    def _write_entry(self, slot):
+        """Rewrite a single header entry in place"""
+        self.file.seek(HEADER_PREFIX.size + slot * HEADER_ENTRY.size)
+        self.file.write(HEADER_ENTRY.pack(*self.entries[slot]))
+
+    def has_chunk(self, slot):
+        return self.entries[slot][1] > 0
+
+    def slots(self):
+        """Slots that currently hold a chunk"""
+        return [slot for slot, (_, count) in enumerate(self.entries) if count > 0]
+
+    def _view(self, end):
+        """Memoryview of the mapped file, remapped if it does not reach ``end`` yet"""
+        if self._unflushed:
+            self.file.flush()  # The map only sees what reached the OS
+            self._unflushed = False
+        if self._map is None or len(self._map) < end:
+            size = os.fstat(self.file.fileno()).st_size
+            if size < end:
+                return None
+            # The old map is not closed: a reader on another thread may still hold a view of it
+            self._map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        return memoryview(self._map)
+
+    def read(self, slot):
+        """Return the decompressed payload stored in a slot, or None"""
+        first, count = self.entries[slot]
+        if count == 0:
+            return None
+        start = first * SECTOR_SIZE
+        view = self._view(start + count * SECTOR_SIZE)
+        if view is None:
+            raise RegionFormatError(f"{self.path}: slot {slot} points past the end of the file")
+        length, compression = RECORD_HEADER.unpack_from(view, start)
+        offset = start + RECORD_HEADER.size
+        checksum = None
+        if compression & CHECKSUM_FLAG:
+            (checksum,) = RECORD_CHECKSUM.unpack_from(view, offset)
+            offset += RECORD_CHECKSUM.size
+            compression &= ~CHECKSUM_FLAG
+        if length == 0 or offset + length - 1 > start + count * SECTOR_SIZE:
+            raise ChunkCorruptError(f"{self.path}: slot {slot} has a bad record length")
+        data = view[offset:offset + length - 1]
+        if checksum is not None and zlib.crc32(data) != checksum:
+            raise ChunkCorruptError(f"{self.path}: slot {slot} fails its checksum")
+        if compression == COMPRESSION_ZLIB:
+            try:
+                return zlib.decompress(data)
+            except zlib.error as e:
+                raise ChunkCorruptError(f"{self.path}: slot {slot} does not decompress: {e}") from None
+        if compression == COMPRESSION_NONE:
+            return bytes(data)
+        raise ChunkCorruptError(f"{self.path}: slot {slot} has unknown compression {compression}")
+
+    def write(self, slot, payload, compression=COMPRESSION_ZLIB):
+        """Compress and store a payload
+
+        The new copy always goes to free sectors and the header entry on disk
+        is only switched over by flush(), so an interrupted save leaves the
+        old copy intact.
+        """
+        data = zlib.compress(payload, c.REGION_COMPRESSION_LEVEL) if compression == COMPRESSION_ZLIB else payload
+        record = (RECORD_HEADER.pack(len(data) + 1, compression | CHECKSUM_FLAG)
+                  + RECORD_CHECKSUM.pack(zlib.crc32(data)) + data)
+        count = -(-len(record) // SECTOR_SIZE)
+
+        first = self._allocate(count)
+        self.file.seek(first * SECTOR_SIZE)
+        self.file.write(record.ljust(count * SECTOR_SIZE, b"\0"))
+        self._set_entry(slot, (first, count))
+
+    def delete(self, slot):
+        """Drop a chunk; its sectors become free once the deletion is flushed"""
+        self._set_entry(slot, (0, 0))
+
+    def _set_entry(self, slot, entry):
+        self._committed.setdefault(slot, self.entries[slot])
+        self.entries[slot] = entry
+        self._unflushed = True
+
+    def _allocate(self, count):
+        """Find the first run of ``count`` free sectors (first fit, else append)
+
+        Sectors the header on disk still points at count as used until the
+        switch to their replacement has been flushed.
+        """
+        used = sorted((first, first + n) for first, n in self.entries + list(self._committed.values()) if n)
+        position = HEADER_SECTORS
+        for start, end in used:
+            if start - position >= count:
+                return position
+            position = max(position, end)
+        return position
+
+    def used_sectors(self):
+        return HEADER_SECTORS + sum(count for _, count in self.entries)
+
+    def total_sectors(self):
+        self.file.seek(0, os.SEEK_END)
+        return -(-self.file.tell() // SECTOR_SIZE)
+
+    def flush(self, sync=False):
+        """Write out buffered chunks, then point the header at them
+
+        With ``sync`` the chunk data is on the disk before the header entries
+        change, and the header is on the disk when this returns.
+        """
+        if self._committed:
+            self.file.flush()
+            if sync:
+                os.fsync(self.file.fileno())
+            if self.version < FORMAT_VERSION:
+                # Older readers cannot skip the checksums of the records written since
+                self.file.seek(0)
+                self.file.write(HEADER_PREFIX.pack(MAGIC, FORMAT_VERSION, REGION_SIZE))
+                self.version = FORMAT_VERSION
+            for slot in self._committed:
+                self._write_entry(slot)
+            self._committed.clear()
+        self.file.flush()
+        self._unflushed = False
+        if sync:
+            os.fsync(self.file.fileno())
+
+    def close(self):
+        self._map = None
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+
+class RegionStorage:
+    """All region files of one world directory, opened lazily"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.regions = {}
+
+    def _region(self, region, create=False):
+        if region not in self.regions:
+            path = os.path.join(self.directory, region_filename(region))
+            if not create and not os.path.exists(path):
+                return None
+            try:
+                self.regions[region] = RegionFile(path)
+            except RegionFormatError as e:
+                # Keep the damaged file for inspection; its chunks are regenerated
+                os.replace(path, path + ".corrupt")
+                log.warning("Region file %s is unreadable (%s); moved it to %s.corrupt", path, e, path)
+                if not create:
+                    return None
+                self.regions[region] = RegionFile(path)
+        return self.regions[region]
+
+    def has_chunk(self, ci):
+        region, slot = region_coords(ci)
+        region_file = self._region(region)
+        return region_file is not None and region_file.has_chunk(slot)
+
+    def read_chunk(self, ci):
+        """Return the stored payload of chunk ``ci``, or None if it was never saved"""
+        region, slot = region_coords(ci)
+        region_file = self._region(region)
+        if region_file is None:
+            return None
+        return region_file.read(slot)
+
+    def write_chunk(self, ci, payload):
+        region, slot = region_coords(ci)
+        self._region(region, create=True).write(slot, payload)
+
+    def delete_chunk(self, ci):
+        region, slot = region_coords(ci)
+        region_file = self._region(region)
+        if region_file is not None:
+            region_file.delete(slot)
+
+    def region_indices(self):
+        """Indices of every region file present on disk"""
+        regions = set(self.regions)
+        for name in os.listdir(self.directory):
+            if name.startswith("r.") and name.endswith(".rgn"):
+                try:
+                    regions.add(int(name[2:-4]))
+                except ValueError:
+                    continue
+        return sorted(regions)
+
+    def chunk_indices(self):
+        """Every chunk index stored in this world"""
+        indices = []
+        for region in self.region_indices():
+            region_file = self._region(region)
+            if region_file is None:
+                continue  # Unreadable file was moved aside; its chunks are regenerated
+            indices.extend(region * REGION_SIZE + slot for slot in region_file.slots())
+        return indices
+
+    def stored_size(self, ci):
+        """Bytes chunk ``ci`` occupies in its region file, 0 if it is not saved"""
+        region, slot = region_coords(ci)
+        region_file = self._region(region)
+        return region_file.entries[slot][1] * SECTOR_SIZE if region_file is not None else 0
+
+    def compact(self):
+        """Rewrite every region file with its chunks packed together; returns the bytes reclaimed
+
+        Free sectors are reused by later writes but never given back to the
+        file system; this is the offline way to shrink a world after chunks
+        were deleted. Region files left without chunks are removed.
+        """
+        reclaimed = 0
+        for region in self.region_indices():
+            region_file = self._region(region)
+            if region_file is None:
+                continue  # Unreadable file was moved aside to .corrupt
+            region_file.flush(sync=True)
+            path = region_file.path
+            before = os.path.getsize(path)
+            slots = region_file.slots()
+            if slots:
+                temp_path = path + ".tmp"
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                packed = RegionFile(temp_path)
+                for slot in slots:
+                    try:
+                        packed.write(slot, region_file.read(slot))
+                    except RegionFormatError as e:
+                        log.warning("Dropping unreadable chunk: %s", e)  # The game would regenerate it anyway
+                packed.flush(sync=True)
+                packed.close()
+            region_file.close()
+            del self.regions[region]
+            if slots:
+                os.replace(temp_path, path)
+                reclaimed += before - os.path.getsize(path)
+            else:
+                os.remove(path)
+                reclaimed += before
+        return reclaimed
+
+    def flush(self, sync=False):
+        """Flush buffered writes; with ``sync`` also wait until they reach the disk"""
+        for region_file in self.regions.values():
+            region_file.flush(sync)
+
+    def close(self):
+        for region_file in self.regions.values():
+            region_file.close()
+        self.regions.clear()
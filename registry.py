@@ -1,6 +1,7 @@
 class Registry:
     def __init__(self):
         self.blocks = {}
+        self._block_lut = None  # Built on first use by block_lut()
         self.items = {}
         
         # Create base items dictionary
@@ -47,6 +48,7 @@ class Registry:
             print(f"Created and registered item variant for {block.name}")
 
         self.blocks[str(block.id)] = block
+        self._block_lut = None
         return block
 
     def register_item(self, item):
@@ -68,6 +70,16 @@ class Registry:
             return self.blocks.get(str(block_id))
         return None
 
+    def block_lut(self):
+        """List indexed by block id for converting whole id grids at once; unknown ids map to AIR"""
+        if self._block_lut is None:
+            air = self.blocks.get("0")
+            lut = [air] * (max((int(key) for key in self.blocks), default=0) + 1)
+            for key, block in self.blocks.items():
+                lut[int(key)] = block
+            self._block_lut = lut
+        return self._block_lut
+
     def get_item(self, item_id):
         """Get an item by ID or name"""
         if isinstance(item_id, str):
@@ -1,24 +1,59 @@
+import copy
+import itertools
 import json
 import os
+import shutil
+import struct
+import threading
 import time
+import zlib
+from collections import OrderedDict
+import config as c
 from block import (
-    BLOCK_MAP, ENHANCER,
+    ENHANCER,
     StorageBlock, FurnaceBlock, EnhancerBlock
 )
 from item import ITEM_REGISTRY  # Just import ITEM_REGISTRY directly
 from registry import REGISTRY
+from region_file import RegionStorage, RegionFormatError
+from chunk_codec import (
+    snapshot_chunk, encode_snapshot, decode_chunk, chunk_ids, entity_records, load_entities,
+    ENTITY_BLOCK_TYPES, ChunkDecodeError
+)
+from worldgen import generate_chunk, GENERATOR_VERSION
+from save_schema import SCHEMA_VERSION, migrate, convert_json_to_region
+from logger import get_logger
+
+log = get_logger("save")
+
 
 class SaveManager:
-    def __init__(self, seed=None):
+    def __init__(self, seed=None, save_dir=None):
         self.seed = seed
         self.save_dir = "saves"
-        if self.seed is not None:
+        if save_dir is not None:
+            self.save_dir = save_dir
+        elif self.seed is not None:
             self.save_dir = os.path.join("saves", f"world_{self.seed}")
         if not os.path.exists(self.save_dir):
             os.makedirs(self.save_dir)
             
-        self.world_file = os.path.join(self.save_dir, "world.json")
-        self.player_file = os.path.join(self.save_dir, "player.json")
+        self.world_file = os.path.join(self.save_dir, f"world_{self.seed}.json")
+        self.player_file = os.path.join(self.save_dir, f"player_{self.seed}.json")
+        self.level_file = os.path.join(self.save_dir, "level.json")  # Save header, see save_schema
+        # Layout of the oldest saves, only read when migrating them
+        self.legacy_world_file = os.path.join(self.save_dir, "world.json")
+        self.legacy_player_file = os.path.join(self.save_dir, "player.json")
+        self.region_dir = os.path.join(self.save_dir, "region")
+        self.regions = None  # RegionStorage, opened on first use
+        self.lock = threading.RLock()  # Region files are shared with the background saver
+        self.saved_checksums = {}  # ci -> crc32 of the payload last written or read
+        # Chunk copies are numbered when taken, so an older copy written late never replaces a newer one
+        self.save_sequence = itertools.count(1)
+        self.written_sequence = {}  # ci -> number of the copy last stored
+        self.base_ids = OrderedDict()  # ci -> ids of the generated chunk, for delta saves
+        self.json_chunks = {}  # ci -> (id grid, entity records) from a JSON save, decoded when first needed
+        self.corrupt_chunks = set()  # Saved chunks that could not be read; regenerated and rewritten
         
         # Use ITEM_REGISTRY directly and add block variants
         self.item_registry = {}  # Start with empty registry
@@ -29,9 +64,9 @@ class SaveManager:
                 self.item_registry[item_id] = item
         
         # Add block item variants
-        for block_id, block in BLOCK_MAP.items():
-            if hasattr(block, 'item_variant') and block.item_variant is not None:
-                self.item_registry[block_id] = block.item_variant
+        for block in REGISTRY.blocks.values():
+            if getattr(block, 'item_variant', None) is not None:
+                self.item_registry.setdefault(block.id, block.item_variant)
 
         # Add debug output
         print("Initialized item registry with:")
@@ -57,137 +92,38 @@ class SaveManager:
             new_chunk.append(new_row)
         return new_chunk
 
-    def save_world(self, world_chunks):
-        # Convert each chunk to a grid of block IDs for serialization.
-        serializable = {}
-        for ci, chunk in world_chunks.items():
-            serializable[ci] = [[block.id if block else 0 for block in row] for row in chunk]
-        with open(self.world_file, "w") as f:
-            json.dump(serializable, f)
-        print(f"World saved to {self.world_file}.")
-
-    def load_world(self, block_map):
-        if os.path.exists(self.world_file):
-            with open(self.world_file, "r") as f:
-                data = json.load(f)
-            loaded_chunks = {}
-            for ci, grid in data.items():
-                # Reconstruct chunk using block_map to obtain Block objects by their id.
-                loaded_chunks[int(ci)] = [[block_map.get(block_id) for block_id in row] for row in grid]
-            return loaded_chunks
-        return None
-
-    def _slot_to_dict(self, slot):
-        if not slot or "item" not in slot or not slot["item"]:
-            return {"item_id": 0, "quantity": 0}
-        quantity = slot.get("quantity", 1)
-        return {
-            "item_id": slot["item"].id,
-            "quantity": quantity
-        }
+    def save_all(self, world_chunks, player, inventory, chunk_indices=None):
+        """Save both world and player data
 
-    def _dict_to_slot(self, slot_data, item_map):
-        if not slot_data or slot_data["item_id"] == 0:
-            return {"item": None, "quantity": 0}
-        item_id = slot_data.get("item_id")
-        quantity = slot_data.get("quantity", 1)
-        item_obj = item_map.get(item_id)
-        if item_obj:
-            return {
-                "item": item_obj,
-                "quantity": quantity
-            }
-        return {"item": None, "quantity": 0}
-
-    def save_player(self, player, inventory):
-        # Save key player properties and inventory.
-        player_data = {
-            "x": player.rect.x,
-            "y": player.rect.y,
-            "health": player.health,
-            "hunger": player.hunger,
-            "thirst": player.thirst
-            # ... add other player properties if needed...
-        }
-        inv_data = {
-            "hotbar": [self._slot_to_dict(slot) for slot in inventory.hotbar],
-            "armor": [self._slot_to_dict(slot) for slot in inventory.armor],
-            "main": [self._slot_to_dict(slot) for slot in inventory.main],
-            "selected_hotbar_index": inventory.selected_hotbar_index
-        }
-        data = {
-            "player": player_data,
-            "inventory": inv_data
-        }
-        with open(self.player_file, "w") as f:
-            json.dump(data, f)
-        print(f"Player data saved to {self.player_file}.")
-        print("Current hotbar items:")
-        for idx, slot in enumerate(inventory.hotbar):
-            if slot and "item" in slot and slot["item"]:
-                print(f"Slot {idx}: Item: {slot['item'].name}, Quantity: {slot['quantity']}")
-            else:
-                print(f"Slot {idx}: Empty slot")
-        print("Current armor items:")
-        for idx, slot in enumerate(inventory.armor):
-            if slot and "item" in slot and slot["item"]:
-                print(f"Slot {idx}: Item: {slot['item'].name}, Quantity: {slot['quantity']}")
-            else:
-                print(f"Slot {idx}: Empty slot")
-        print("Current main items:")
-        for idx, slot in enumerate(inventory.main):
-            if slot and "item" in slot and slot["item"]:
-                print(f"Slot {idx}: Item: {slot['item'].name}, Quantity: {slot['quantity']}")
-            else:
-                print(f"Slot {idx}: Empty slot")
-
-    def load_player(self, item_map):
-        if os.path.exists(self.player_file):
-            print(f"Loading player data from {self.player_file}.")
-            with open(self.player_file, "r") as f:
-                data = json.load(f)
-            if data:
-                inv = data.get("inventory", {})
-                if inv:
-                    inv["hotbar"] = [self._dict_to_slot(slot, item_map) for slot in inv.get("hotbar", [])]
-                    inv["armor"] = [self._dict_to_slot(slot, item_map) for slot in inv.get("armor", [])]
-                    inv["main"] = [self._dict_to_slot(slot, item_map) for slot in inv.get("main", [])]
-                data["inventory"] = inv
-                print("Loaded hotbar items:")
-                for idx, slot in enumerate(inv.get("hotbar", [])):
-                    if slot and "item" in slot and slot["item"]:
-                        print(f"Slot {idx}: Item: {slot['item'].name}, Quantity: {slot['quantity']}")
-                    else:
-                        print(f"Slot {idx}: Empty slot")
-                print("Loaded armor items:")
-                for idx, slot in enumerate(inv.get("armor", [])):
-                    if slot and "item" in slot and slot["item"]:
-                        print(f"Slot {idx}: Item: {slot['item'].name}, Quantity: {slot['quantity']}")
-                    else:
-                        print(f"Slot {idx}: Empty slot")
-                print("Loaded main items:")
-                for idx, slot in enumerate(inv.get("main", [])):
-                    if slot and "item" in slot and slot["item"]:
-                        print(f"Slot {idx}: Item: {slot['item'].name}, Quantity: {slot['quantity']}")
-                    else:
-                        print(f"Slot {idx}: Empty slot")
-            return data
+        With region files, ``chunk_indices`` limits the chunks considered to
+        those known to have changed; by default every loaded chunk is checked.
+        """
+        return self.write_snapshot(self.snapshot(world_chunks, player, inventory, chunk_indices))
+
+    def snapshot(self, world_chunks, player, inventory, chunk_indices=None):
+        """Copy everything a save writes; cheap enough for the main thread"""
+        snapshot = {'player': self.player_snapshot(player, inventory)}
+        if c.SAVE_FORMAT == "region":
+            if chunk_indices is None:
+                chunk_indices = list(world_chunks)
+            snapshot['chunks'] = [self.chunk_snapshot(ci, world_chunks[ci])
+                                  for ci in chunk_indices if ci in world_chunks]
         else:
-            print(f"Player file {self.player_file} does not exist.")
-        return None
+            snapshot['world'] = {
+                'metadata': {
+                    'seed': self.seed,
+                    'created_at': time.strftime("%Y-%m-%d %H:%M:%S")
+                },
+                **self.serialize_world(world_chunks)
+            }
+        return snapshot
 
-    def save_all(self, world_chunks, player, inventory):
-        """Save both world and player data"""
-        # Create save data structure
-        world_data = {
-            'metadata': {
-                'seed': self.seed,
-                'created_at': time.strftime("%Y-%m-%d %H:%M:%S")
-            },
-            'chunks': self.serialize_world(world_chunks)
-        }
+    def chunk_snapshot(self, ci, chunk):
+        """One entry of snapshot()['chunks']; the base terrain is regenerated by the writer if not remembered"""
+        return (ci, snapshot_chunk(chunk), self.base_ids.get(ci), next(self.save_sequence))
 
-        player_data = {
+    def player_snapshot(self, player, inventory):
+        return {
             'metadata': {
                 'seed': self.seed,
                 'created_at': time.strftime("%Y-%m-%d %H:%M:%S")
@@ -202,17 +138,196 @@ class SaveManager:
             'inventory': self.serialize_inventory(inventory)
         }
 
-        # Save to files with consistent naming
-        world_file = os.path.join(self.save_dir, f'world_{self.seed}.json')
-        player_file = os.path.join(self.save_dir, f'player_{self.seed}.json')
-        
-        with open(world_file, 'w') as f:
-            json.dump(world_data, f)
-        with open(player_file, 'w') as f:
-            json.dump(player_data, f)
-            
-        print(f"Saved world to {world_file}")
-        print(f"Saved player data to {player_file}")
+    def write_snapshot(self, snapshot, progress=None):
+        """Encode, compress and write a snapshot(); safe to run on a worker thread
+
+        ``progress(done, total)`` is called after each unit written.
+        Returns the number of chunks that had to be rewritten.
+        """
+        chunks = snapshot.get('chunks', [])
+        total = len(chunks) + 1
+        written = 0
+        for done, (ci, chunk_snapshot, base_ids, sequence) in enumerate(chunks, 1):
+            if self.write_chunk_snapshot(ci, chunk_snapshot, base_ids, sequence):
+                written += 1
+            if progress:
+                progress(done, total)
+
+        if 'world' in snapshot:
+            self.write_json_atomic(self.world_file, snapshot['world'])
+            self.write_level("json")
+            print(f"Saved world to {self.world_file}")
+        else:
+            with self.lock:
+                self.region_storage().flush(sync=True)
+            self.write_level("region")
+            print(f"Saved {written} changed chunks to {self.region_dir}")
+
+        self.write_json_atomic(self.player_file, snapshot['player'])
+        print(f"Saved player data to {self.player_file}")
+        if progress:
+            progress(total, total)
+        return written
+
+    def write_json_atomic(self, path, data):
+        """Write JSON to a temporary file and rename it over ``path``
+
+        The previous copy is kept as ``path.bak`` for read_json() to fall back on.
+        """
+        temp_path = path + ".tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(data, f)
+            f.flush()
+            os.fsync(f.fileno())
+        if os.path.exists(path):
+            backup_path = path + ".bak"
+            if os.path.exists(backup_path):
+                os.remove(backup_path)
+            try:
+                os.link(path, backup_path)  # The old file stays intact under its second name
+            except OSError:
+                shutil.copyfile(path, backup_path)
+        os.replace(temp_path, path)
+
+    def read_json(self, path):
+        """Load a JSON save file, or its previous copy if the file is damaged"""
+        try:
+            with open(path, 'r') as f:
+                return json.load(f)
+        except ValueError as e:
+            backup_path = path + ".bak"
+            if not os.path.exists(backup_path):
+                raise
+            log.warning("%s is damaged (%s); loading the previous save from %s", path, e, backup_path)
+            with open(backup_path, 'r') as f:
+                return json.load(f)
+
+    def region_storage(self):
+        """Open the world's region files on first use"""
+        with self.lock:
+            if self.regions is None:
+                self.regions = RegionStorage(self.region_dir)
+            return self.regions
+
+    def world_seed(self):
+        return self.seed if self.seed is not None else c.SEED
+
+    def generate_base(self, ci):
+        """Generate the untouched terrain of a chunk"""
+        chunk = generate_chunk(ci, c.CHUNK_WIDTH, c.WORLD_HEIGHT, self.world_seed())
+        self.remember_base(ci, chunk)
+        return chunk
+
+    def remember_base(self, ci, chunk):
+        """Record a freshly generated chunk so a later delta save need not regenerate it"""
+        ids = chunk_ids(chunk)
+        with self.lock:  # Chunk loader workers remember bases too
+            self.base_ids[ci] = ids
+            self.base_ids.move_to_end(ci)
+            while len(self.base_ids) > c.DELTA_BASE_CACHE:
+                self.base_ids.popitem(last=False)
+
+    def _base_ids(self, ci):
+        with self.lock:
+            ids = self.base_ids.get(ci)
+            if ids is not None:
+                self.base_ids.move_to_end(ci)
+                return ids
+        return chunk_ids(self.generate_base(ci))
+
+    def save_chunk(self, ci, chunk):
+        """Write one chunk to its region file; returns False if it was unchanged"""
+        sequence = next(self.save_sequence)
+        base_ids = self._base_ids(ci) if c.CHUNK_SAVE_MODE == "delta" else None
+        return self.write_chunk_snapshot(ci, snapshot_chunk(chunk), base_ids, sequence)
+
+    def write_chunk_snapshot(self, ci, chunk_snapshot, base_ids=None, sequence=None):
+        """Encode and store one chunk snapshot unless the stored copy is identical or newer
+
+        ``sequence`` is the number the copy got from save_sequence when it was
+        taken. The background saver and unloading chunks both write chunks, in
+        whatever order their threads get the lock; a copy older than the one
+        already stored is skipped.
+        """
+        if c.CHUNK_SAVE_MODE != "delta":
+            base_ids = None
+        elif base_ids is None:
+            # Not remembered; regenerate without touching the cache (may run off the main thread)
+            base_ids = chunk_ids(generate_chunk(ci, c.CHUNK_WIDTH, c.WORLD_HEIGHT, self.world_seed()))
+        payload = encode_snapshot(chunk_snapshot, base_ids)
+        checksum = zlib.crc32(payload)
+        with self.lock:
+            if sequence is not None:
+                if sequence < self.written_sequence.get(ci, 0):
+                    return False
+                self.written_sequence[ci] = sequence
+            regions = self.region_storage()
+            if self.saved_checksums.get(ci) == checksum and regions.has_chunk(ci):
+                return False
+            regions.write_chunk(ci, payload)
+            self.saved_checksums[ci] = checksum
+            self.json_chunks.pop(ci, None)  # The region copy is newer now
+            self.corrupt_chunks.discard(ci)
+        return True
+
+    def load_chunk(self, ci):
+        """Read a single chunk from the region files, or None if it was never saved
+
+        Safe to call from the chunk loader's worker threads; only the file
+        access holds the lock, decoding runs in parallel with the game.
+        A chunk that fails its checksum or does not decode is reported and
+        treated as never saved, so it is regenerated instead of failing the load.
+        """
+        try:
+            with self.lock:
+                saved = self.json_chunks.get(ci)
+                if saved is not None:
+                    payload = None
+                else:
+                    payload = self.region_storage().read_chunk(ci)
+                    if payload is None:
+                        return None
+                    self.saved_checksums[ci] = zlib.crc32(payload)
+            if saved is not None:
+                return self.deserialize_chunk(*saved)
+            return decode_chunk(payload, self.item_registry, base=lambda: self.generate_base(ci))
+        except (RegionFormatError, ChunkDecodeError, struct.error, ValueError, KeyError, IndexError, TypeError) as e:
+            log.warning("Saved chunk %d is corrupt (%s); regenerating it", ci, e)
+            with self.lock:
+                self.corrupt_chunks.add(ci)
+            return None
+
+    def has_saved_chunk(self, ci):
+        with self.lock:
+            return ci in self.json_chunks or self.region_storage().has_chunk(ci)
+
+    def saved_chunk_indices(self):
+        with self.lock:
+            return self.region_storage().chunk_indices()
+
+    def flush(self):
+        with self.lock:
+            self.region_storage().flush()
+
+    def write_level(self, save_format):
+        """Write the save header: schema version, format and world metadata"""
+        level = self.read_level() or {'seed': self.seed, 'created_at': time.strftime("%Y-%m-%d %H:%M:%S")}
+        level['schema_version'] = SCHEMA_VERSION
+        level['format'] = save_format
+        level['generator_version'] = GENERATOR_VERSION  # Delta chunks are only valid for this terrain
+        level['saved_at'] = time.strftime("%Y-%m-%d %H:%M:%S")
+        self.write_json_atomic(self.level_file, level)
+
+    def read_level(self):
+        if not os.path.exists(self.level_file):
+            return None
+        return self.read_json(self.level_file)
+
+    def close(self):
+        with self.lock:
+            if self.regions is not None:
+                self.regions.close()
+                self.regions = None
 
     def serialize_inventory(self, inventory):
         """Convert inventory to serializable format"""
@@ -227,6 +342,8 @@ class SaveManager:
             item = slot['item']
             # Enhanced item data serialization
             item_data = {
+                'modifiers': dict(getattr(item, 'modifiers', {})),
+                'enhanced_suffix': getattr(item, 'enhanced_suffix', ""),
                 'item_id': item.id if hasattr(item, 'id') else 0,
                 'quantity': slot['quantity'],
                 'name': item.name if hasattr(item, 'name') else "",
@@ -253,8 +370,7 @@ class SaveManager:
             if not slot_data or slot_data.get('is_empty', True):
                 return {"item": None, "quantity": 0}
 
-            # Handle both old and new format
-            item_id = slot_data.get('item_id', 0)
+            item_id = slot_data['item_id']
             
             # First try getting from item registry
             item = None
@@ -267,6 +383,13 @@ class SaveManager:
                 if block and hasattr(block, 'item_variant'):
                     item = block.item_variant
 
+            # Enhanced items get their own copy so the registry item stays plain
+            if item and (slot_data['enhanced_suffix'] or slot_data['modifiers'] != item.modifiers):
+                item = copy.copy(item)
+                item.modifiers = dict(slot_data['modifiers'])
+                item.enhanced_suffix = slot_data['enhanced_suffix']
+                item.name = slot_data.get('name', item.name)
+
             # If we found an item, create the slot
             if item:
                 return {
@@ -284,144 +407,112 @@ class SaveManager:
             'selected_hotbar_index': inv_data.get('selected_hotbar_index', 0)
         }
 
-    def _serialize_inventory(self, slots):
-        """Convert inventory slots to serializable format"""
-        serialized = []
-        for slot in slots:
-            if slot and slot.get("item"):
-                # Include any enhancement data if present
-                modifiers = {}
-                enhanced_suffix = ""
-                if hasattr(slot["item"], "modifiers"):
-                    modifiers = slot["item"].modifiers
-                if hasattr(slot["item"], "enhanced_suffix"):
-                    enhanced_suffix = slot["item"].enhanced_suffix
-                
-                serialized.append({
-                    "item_id": slot["item"].id,
-                    "quantity": slot["quantity"],
-                    "modifiers": modifiers,
-                    "enhanced_suffix": enhanced_suffix
-                })
-            else:
-                serialized.append(None)
-        return serialized
-
-    def _deserialize_inventory(self, slots):
-        """Convert serialized inventory data back to proper format"""
-        deserialized = []
-        for slot_data in slots:
-            if slot_data is None:
-                deserialized.append(None)
-            else:
-                item_id = slot_data["item_id"]
-                if item_id in self.item_registry:
-                    item = self.item_registry[item_id]
-                    # Create a new instance for items that might have state
-                    if hasattr(item, "__dict__"):
-                        item = type(item)(item.id, item.name, item.texture_coords)
-                    
-                    # Apply any saved enhancements
-                    if "modifiers" in slot_data:
-                        item.modifiers = slot_data["modifiers"]
-                    if "enhanced_suffix" in slot_data and slot_data["enhanced_suffix"]:
-                        item.enhanced_suffix = slot_data["enhanced_suffix"]
-                        item.name = f"{item.name} {item.enhanced_suffix}"
-                    
-                    deserialized.append({
-                        "item": item,
-                        "quantity": slot_data["quantity"]
-                    })
-                else:
-                    print(f"Warning: Unknown item ID {item_id}")
-                    deserialized.append(None)
-        return deserialized
-
     def serialize_world(self, world_chunks):
-        """Convert world chunks to serializable format"""
-        serialized = {}
+        """Convert world chunks to serializable format
+
+        Returns ``{'chunks': {ci: id grid}, 'entities': {ci: entity records}}``;
+        the grids hold nothing but block ids, and only chunks that contain
+        chests, furnaces, enhancers or farmland get an entities entry.
+        """
+        chunks = {}
+        entities = {}
         for ci, chunk in world_chunks.items():
-            chunk_data = []
-            for row in chunk:
-                row_data = []
-                for block in row:
-                    if isinstance(block, (StorageBlock, FurnaceBlock, EnhancerBlock)):
-                        # Special blocks need their state saved
-                        block_data = block.to_dict()
-                        row_data.append(block_data)
-                    else:
-                        # Regular blocks just save their ID
-                        row_data.append(block.id)
-                chunk_data.append(row_data)
-            serialized[str(ci)] = chunk_data
-        return serialized
+            chunks[str(ci)] = [[block.id for block in row] for row in chunk]
+            records = entity_records(chunk, len(chunk[0]) if chunk else 0)
+            if records:
+                entities[str(ci)] = records
+        return {'chunks': chunks, 'entities': entities}
 
     def deserialize_world(self, world_data, block_map):
         """Convert saved world data back into Block objects"""
-        world_chunks = {}
-        for chunk_id, chunk_data in world_data.items():
-            chunk = []
-            for row in chunk_data:
-                new_row = []
-                for block_data in row:
-                    # Special handling for AIR blocks
-                    if block_data == 0 or block_data == "0":
-                        new_row.append(REGISTRY.get_block("0"))  # Get AIR block from registry
-                        continue
-                        
-                    # Handle other blocks
-                    if isinstance(block_data, (str, int)):
-                        block = REGISTRY.get_block(str(block_data))
-                        if block:
-                            if hasattr(block, 'create_instance'):
-                                block = block.create_instance()
-                            new_row.append(block)
-                        else:
-                            new_row.append(REGISTRY.get_block("0"))  # Fallback to AIR if block not found
-                    else:
-                        # Handle complex blocks (Storage, Furnace, etc.)
-                        block_id = str(block_data.get('id'))
-                        block = REGISTRY.get_block(block_id)
-                        if block and hasattr(block, 'create_instance'):
-                            block_instance = block.create_instance()
-                            if hasattr(block_instance, 'from_dict'):
-                                block_instance.from_dict(block_data, REGISTRY.items)
-                            new_row.append(block_instance)
-                        else:
-                            new_row.append(REGISTRY.get_block("0"))  # Fallback to AIR if invalid
-
-                chunk.append(new_row)
-            world_chunks[int(chunk_id)] = chunk
-        return world_chunks
-
-    def load_all(self, block_map):
-        """Load both world and player data"""
+        lut = REGISTRY.block_lut()
+        entities = world_data.get('entities', {})
+        return {int(chunk_id): self.deserialize_chunk(chunk_data, entities.get(chunk_id), lut)
+                for chunk_id, chunk_data in world_data['chunks'].items()}
+
+    def deserialize_chunk(self, chunk_data, entities=None, lut=None):
+        """Convert one saved id grid and its entity records back into Block objects
+
+        Plain ids go through the block lookup table; only blocks with their
+        own state (chests, furnaces, farmland, ...) get new instances.
+        """
+        lut = REGISTRY.block_lut() if lut is None else lut
+        air = lut[0]
+        chunk = []
+        for row in chunk_data:
+            new_row = []
+            for block_id in row:
+                block = lut[block_id] if 0 <= block_id < len(lut) else air  # Fallback to AIR if block not found
+                if isinstance(block, ENTITY_BLOCK_TYPES):
+                    block = block.create_instance()
+                new_row.append(block)
+            chunk.append(new_row)
+        if entities:
+            load_entities(chunk, len(chunk[0]), entities, self.item_registry, lut)
+        return chunk
+
+    def load_all(self, block_map, chunk_indices=None):
+        """Load both world and player data
+
+        Only ``chunk_indices`` are decoded (default: every saved chunk); the
+        rest can be fetched later with load_chunk, e.g. by the chunk loader.
+        """
         try:
-            world_file = os.path.join(self.save_dir, f'world_{self.seed}.json')
-            player_file = os.path.join(self.save_dir, f'player_{self.seed}.json')
-            
-            if not os.path.exists(world_file) or not os.path.exists(player_file):
-                print(f"Save files not found: {world_file} or {player_file}")
-                return None, None
+            with self.lock:
+                self.json_chunks = {}
+                self.corrupt_chunks.clear()
+            level = self.read_level()
+            if level is None or level.get('schema_version') != SCHEMA_VERSION:
+                level = migrate(self)  # Older saves are upgraded once and written back
+                if level is None:
+                    print(f"Save files not found in {self.save_dir}")
+                    return None, None
+            if level['format'] == "json" and c.SAVE_FORMAT == "region":
+                print(f"Converting {self.world_file} to region files")
+                convert_json_to_region(self)
+                level = self.read_level()
 
-            print(f"Loading world from {world_file}")
-            with open(world_file, 'r') as f:
-                world_data = json.load(f)
+            if level['format'] == "region":
+                world_seed = level.get('seed')
+                if level.get('generator_version', GENERATOR_VERSION) != GENERATOR_VERSION:
+                    print(f"Warning: save was written by terrain generator {level.get('generator_version')}, "
+                          f"current is {GENERATOR_VERSION}; delta-saved chunks may not match")
+                print(f"Loading world from {self.region_dir}")
+                if chunk_indices is None:
+                    chunk_indices = self.saved_chunk_indices()
+            else:
+                print(f"Loading world from {self.world_file}")
+                world_data = self.read_json(self.world_file)
+                world_seed = world_data.get('metadata', {}).get('seed')
+                # Only the requested chunks are decoded now, the rest by load_chunk when needed
+                entities = world_data.get('entities', {})
+                with self.lock:
+                    self.json_chunks = {int(ci): (grid, entities.get(ci))
+                                        for ci, grid in world_data['chunks'].items()}
+                if chunk_indices is None:
+                    chunk_indices = list(self.json_chunks)
+                chunk_indices = [ci for ci in chunk_indices if ci in self.json_chunks]
 
-            print(f"Loading player from {player_file}")
-            with open(player_file, 'r') as f:
-                player_data = json.load(f)
+            # Corrupt chunks come back as None and are left to the generator
+            world_chunks = {}
+            for ci in chunk_indices:
+                chunk = self.load_chunk(ci)
+                if chunk is not None:
+                    world_chunks[ci] = chunk
+
+            if not os.path.exists(self.player_file):
+                print(f"Save files not found: {self.player_file}")
+                return None, None
+
+            print(f"Loading player from {self.player_file}")
+            player_data = self.read_json(self.player_file)
 
             # Verify seeds match
-            world_seed = world_data.get('metadata', {}).get('seed')
             player_seed = player_data.get('metadata', {}).get('seed')
             
             if world_seed != self.seed or player_seed != self.seed:
                 print(f"Warning: Seed mismatch. World: {world_seed}, Player: {player_seed}, Current: {self.seed}")
 
-            # Get chunks from world data
-            world_chunks = self.deserialize_world(world_data['chunks'], block_map)
-            
             # Get inventory from player data
             if 'inventory' in player_data:
                 player_data['inventory'] = self.deserialize_inventory(player_data['inventory'])
@@ -0,0 +1,200 @@
+"""Save directory layouts and the migrations between them.
+
+``level.json`` is the header of a save directory: its ``schema_version`` and
+``format`` say exactly how the rest is laid out, so loading never guesses.
+Directories written before the header existed are recognised once by their
+files and upgraded one version at a time; the result is written back, so
+every later load takes the fast path.
+
+    0  world.json id grids + player.json (the old save_world / save_player)
+    1  world_<seed>.json + player_<seed>.json, or region files with a
+       level.json that has no schema_version; inventory slots lack modifiers
+    2  level.json carries schema_version and format; inventory slots keep
+       enhancement modifiers and suffix
+    3  JSON worlds keep pure id grids; chests, furnaces and enhancers are
+       compact entity records under ``entities`` instead of to_dict() cells
+
+Files a migration replaces are moved to ``legacy/`` instead of deleted.
+"""
+import json
+import os
+import shutil
+import time
+
+SCHEMA_VERSION = 3
+LEGACY_DIR = "legacy"
+
+class SaveSchemaError(Exception):
+    """Raised for saves written by a newer version of the game"""
+
+def detect_version(save_manager):
+    """Schema version of a save directory, or None if it holds no save"""
+    level = save_manager.read_level()
+    if level is not None:
+        return level.get('schema_version', 1)
+    if os.path.exists(save_manager.world_file):
+        return 1
+    if os.path.exists(save_manager.legacy_world_file):
+        return 0
+    return None
+
+def retire(save_manager, *paths):
+    """Move files a migration has replaced out of the way"""
+    legacy_dir = os.path.join(save_manager.save_dir, LEGACY_DIR)
+    os.makedirs(legacy_dir, exist_ok=True)
+    for path in paths:
+        for retired in (path, path + ".bak"):  # write_json_atomic keeps the previous copy
+            if os.path.exists(retired):
+                shutil.move(retired, os.path.join(legacy_dir, os.path.basename(retired)))
+
+def _read_json(path):
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def _metadata(save_manager):
+    return {'seed': save_manager.seed, 'created_at': time.strftime("%Y-%m-%d %H:%M:%S")}
+
+def _v0_slot(slot):
+    """save_player slot {item_id, quantity} -> v1 slot"""
+    item_id = (slot or {}).get('item_id', 0)
+    quantity = (slot or {}).get('quantity', 0)
+    return {'item_id': item_id, 'quantity': quantity, 'is_empty': item_id == 0 or quantity == 0}
+
+def migrate_0_to_1(save_manager):
+    """world.json + player.json -> world_<seed>.json + player_<seed>.json"""
+    grids = _read_json(save_manager.legacy_world_file)
+    save_manager.write_json_atomic(save_manager.world_file, {
+        'metadata': _metadata(save_manager),
+        'chunks': {str(ci): grid for ci, grid in grids.items()}
+    })
+    player = {'metadata': _metadata(save_manager), 'player': {}, 'inventory': {}}
+    if os.path.exists(save_manager.legacy_player_file):
+        data = _read_json(save_manager.legacy_player_file)
+        inventory = data.get('inventory', {})
+        player['player'] = data.get('player', {})
+        player['inventory'] = {key: [_v0_slot(slot) for slot in inventory.get(key, [])]
+                               for key in ('hotbar', 'armor', 'main')}
+        player['inventory']['selected_hotbar_index'] = inventory.get('selected_hotbar_index', 0)
+    save_manager.write_json_atomic(save_manager.player_file, player)
+    retire(save_manager, save_manager.legacy_world_file, save_manager.legacy_player_file)
+
+def _v1_slot(slot, item_registry):
+    """v1 slot -> v2 slot; v1 never saved enhancements, so items get their base modifiers"""
+    slot = dict(slot or {'item_id': 0, 'quantity': 0, 'is_empty': True})
+    slot.setdefault('is_empty', slot.get('item_id', 0) == 0)
+    if not slot['is_empty']:
+        item = item_registry.get(slot.get('item_id'))
+        slot.setdefault('modifiers', dict(getattr(item, 'modifiers', {})))
+        slot.setdefault('enhanced_suffix', "")
+    return slot
+
+def migrate_1_to_2(save_manager):
+    """Normalize inventory slots and write the schema header"""
+    if os.path.exists(save_manager.player_file):
+        player = _read_json(save_manager.player_file)
+        inventory = player.get('inventory', {})
+        for key in ('hotbar', 'armor', 'main'):
+            inventory[key] = [_v1_slot(slot, save_manager.item_registry) for slot in inventory.get(key, [])]
+        player['inventory'] = inventory
+        save_manager.write_json_atomic(save_manager.player_file, player)
+    # Before the header both layouts could sit side by side; the newer one wins
+    level = save_manager.read_level()
+    save_format = "json"
+    if level is not None:
+        save_format = level.get('format', "region")
+        if (os.path.exists(save_manager.world_file)
+                and os.path.getmtime(save_manager.world_file) > os.path.getmtime(save_manager.level_file)):
+            save_format = "json"
+    save_manager.write_level(save_format)
+
+def _v2_entity(index, cell, registry, item_registry):
+    """to_dict() cell of a v2 grid -> [cell, block id, record], or None if the block is gone"""
+    block = registry.get_block(str(cell.get('id')))
+    if block is None or not hasattr(block, 'to_record'):
+        return None
+    block = block.create_instance()
+    block.from_dict(cell, item_registry)
+    return [index, block.id, block.to_record()]
+
+def migrate_2_to_3(save_manager):
+    """Move block-entity state out of JSON id grids into entity records"""
+    save_format = save_manager.read_level()['format']
+    if save_format == "json" and os.path.exists(save_manager.world_file):
+        _compact_json_world(save_manager)
+    # Region chunks need nothing here: the chunk codec still reads version 2 payloads
+    save_manager.write_level(save_format)
+
+def _compact_json_world(save_manager):
+    # Needs the block types; save_manager imports this module before they are registered
+    from registry import REGISTRY
+    from item import ITEM_REGISTRY
+    # to_dict() slots name items by str(id)
+    item_registry = {str(item_id): item for item_id, item in ITEM_REGISTRY.items()}
+    for block in REGISTRY.blocks.values():  # Block items are only known as block variants
+        if getattr(block, 'item_variant', None) is not None:
+            item_registry.setdefault(str(block.id), block.item_variant)
+    world = _read_json(save_manager.world_file)
+    entities = world.setdefault('entities', {})
+    for ci, grid in world.get('chunks', {}).items():
+        width = len(grid[0]) if grid else 0
+        records = []
+        for y, row in enumerate(grid):
+            for x, cell in enumerate(row):
+                if isinstance(cell, dict):
+                    record = _v2_entity(y * width + x, cell, REGISTRY, item_registry)
+                    row[x] = record[1] if record else 0
+                    if record:
+                        records.append(record)
+        if records:
+            entities[ci] = records
+    save_manager.write_json_atomic(save_manager.world_file, world)
+
+MIGRATIONS = {
+    0: migrate_0_to_1,
+    1: migrate_1_to_2,
+    2: migrate_2_to_3,
+}
+
+def migrate(save_manager):
+    """Upgrade a save directory to SCHEMA_VERSION; returns its header, or None if there is no save"""
+    version = detect_version(save_manager)
+    if version is None:
+        return None
+    if version > SCHEMA_VERSION:
+        raise SaveSchemaError(f"{save_manager.save_dir} uses save schema {version}, "
+                              f"this version of the game reads up to {SCHEMA_VERSION}")
+    while version < SCHEMA_VERSION:
+        print(f"Upgrading save {save_manager.save_dir} from schema {version} to {version + 1}")
+        MIGRATIONS[version](save_manager)
+        version += 1
+    return save_manager.read_level()
+
+def convert_json_to_region(save_manager):
+    """Move the chunks of a JSON save into region files; returns the number of chunks"""
+    world = _read_json(save_manager.world_file)
+    count = 0
+    entities = world.get('entities', {})
+    for ci, grid in world.get('chunks', {}).items():
+        save_manager.save_chunk(int(ci), save_manager.deserialize_chunk(grid, entities.get(ci)))
+        count += 1
+    with save_manager.lock:
+        save_manager.region_storage().flush(sync=True)
+    save_manager.write_level("region")
+    retire(save_manager, save_manager.world_file)
+    return count
+
+def convert_region_to_json(save_manager):
+    """Move the chunks of a region save into a JSON world file; returns the number of chunks"""
+    world_chunks = {}
+    for ci in save_manager.saved_chunk_indices():
+        chunk = save_manager.load_chunk(ci)
+        if chunk is not None:
+            world_chunks[ci] = chunk
+    save_manager.write_json_atomic(save_manager.world_file, {
+        'metadata': _metadata(save_manager),
+        **save_manager.serialize_world(world_chunks)
+    })
+    save_manager.write_level("json")
+    save_manager.close()  # Release the region files before moving them
+    retire(save_manager, save_manager.region_dir)
+    return len(world_chunks)
@@ -1,3 +1,5 @@
+from item import slot_to_record, record_to_slot
+
 class BlockScript:
     def __init__(self, block):
         self.block = block
@@ -90,6 +92,14 @@ class BlockScript:
         print(f"[ENHANCER] Serializing state: {data}")
         return data
 
+    def to_record(self):
+        """Compact state: [input slot, ingredient slot]"""
+        return [slot_to_record(self.input_slot), slot_to_record(self.ingredient_slot)]
+
+    def from_record(self, record, item_registry):
+        self.input_slot = record_to_slot(record[0], item_registry)
+        self.ingredient_slot = record_to_slot(record[1], item_registry)
+
     def from_dict(self, data, item_registry):
         """Deserialize enhancer state"""
         if not data or 'slots' not in data:
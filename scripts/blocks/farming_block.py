@@ -1,4 +1,7 @@
 import pygame
+from logger import get_logger
+
+log = get_logger("farming")
 
 class BlockScript:
     def __init__(self, block):
@@ -12,7 +15,7 @@ class BlockScript:
         self.tilled_coords = (13, 1)    # Tilled soil
         self._set_texture(self.untilled_coords)
         
-        print(f"[FARM SCRIPT] Created new farming block script with texture: {self.block.texture_coords}")
+        log.debug("Created new farming block script with texture: %s", self.block.texture_coords)
         self._needs_texture_update = True  # Changed to True initially
         self._last_update_time = pygame.time.get_ticks()  # Initialize with current time
         self._update_interval = 1000  # Update every 1 second instead of every frame
@@ -20,7 +23,7 @@ class BlockScript:
     def _set_texture(self, coords):
         """Helper to update block texture"""
         self.block.texture_coords = coords
-        print(f"[FARM SCRIPT] Set texture to: {coords}")
+        log.debug("Set texture to: %s", coords)
 
     def update_texture(self):
         """Optimized texture update"""
@@ -48,35 +51,34 @@ class BlockScript:
 
     def till(self):
         """Handle tilling the farmland"""
-        print(f"[FARM SCRIPT] Till requested. Current state: tilled={self.tilled}")
+        log.debug("Till requested. Current state: tilled=%s", self.tilled)
         if not self.tilled:
-            print(f"[FARM SCRIPT] Tilling soil. Old texture: {self.block.texture_coords}")
+            log.debug("Tilling soil. Old texture: %s", self.block.texture_coords)
             self.tilled = True
             self._set_texture(self.tilled_coords)
-            print(f"[FARM SCRIPT] Tilled soil. New texture: {self.block.texture_coords}")
+            log.debug("Tilled soil. New texture: %s", self.block.texture_coords)
             return True
         else:
-            print(f"[FARM SCRIPT] Already tilled!")
+            log.debug("Already tilled!")
             return False
 
     def plant_seed(self, seed_item):
         """Plant a seed in the tilled farmland"""
-        print(f"[FARM DEBUG] Plant attempt - Block at {id(self)}")
-        print(f"[FARM DEBUG] Current state: tilled={self.tilled}, has_plant={self.plant is not None}")
+        log.debug("Plant attempt - block at %x: tilled=%s, has_plant=%s", id(self), self.tilled, self.plant is not None)
         
         if not hasattr(seed_item, 'plant_data'):
-            print(f"[FARM DEBUG] No plant data for seed: {seed_item.name}")
+            log.debug("No plant data for seed: %s", seed_item.name)
             return False
 
         if not self.tilled or self.plant:
-            print(f"[FARM DEBUG] Cannot plant: tilled={self.tilled}, has_plant={self.plant is not None}")
+            log.debug("Cannot plant: tilled=%s, has_plant=%s", self.tilled, self.plant is not None)
             return False
         
-        print(f"[FARM DEBUG] Planting {seed_item.name} in block {id(self)}")
-        self.plant = Plant(seed_item.plant_data)
+        log.debug("Planting %s in block %x", seed_item.name, id(self))
+        self.plant = Plant(seed_item.plant_data, seed_item.id)
         self._needs_texture_update = True  # Force texture update
         self.update_texture()  # Immediately update texture
-        print(f"[FARM DEBUG] Plant texture set to: {self.plant.get_texture_coords()}")
+        log.debug("Plant texture set to: %s", self.plant.get_texture_coords())
         return True
 
     def update(self, dt):
@@ -90,8 +92,7 @@ class BlockScript:
             
         self._last_update_time = current_time
         
-        # Add debug prints
-        print(f"[FARM DEBUG] Plant growing: Stage {self.plant.current_stage}, Time: {self.plant.time_in_stage}/{self.plant.growth_time}")
+        log.debug("Plant growing: stage %d, time %s/%s", self.plant.current_stage, self.plant.time_in_stage, self.plant.growth_time)
         
         if self.plant.update(dt):
             self._needs_texture_update = True
@@ -99,7 +100,7 @@ class BlockScript:
             old_coords = self.block.texture_coords
             new_coords = self.plant.get_texture_coords()
             self.block.texture_coords = new_coords
-            print(f"[FARM DEBUG] Plant grew! Stage: {self.plant.current_stage}, Texture: {old_coords} -> {new_coords}")
+            log.debug("Plant grew! Stage: %d, texture: %s -> %s", self.plant.current_stage, old_coords, new_coords)
             return True
         return False
 
@@ -109,13 +110,13 @@ class BlockScript:
             return None
             
         if not self.plant.is_fully_grown():
-            print("[FARM DEBUG] Plant not fully grown yet")
+            log.debug("Plant not fully grown yet")
             return None
 
         drops = self.plant.get_drops(tool)
         self.plant = None
         self._set_texture(self.tilled_coords)  # Return to tilled state
-        print(f"[FARM DEBUG] Harvested plant, got drops: {drops}")
+        log.debug("Harvested plant, got drops: %s", drops)
         return drops
 
     def to_dict(self):
@@ -131,6 +132,35 @@ class BlockScript:
             }
         return data
 
+    def to_record(self):
+        """Compact state: [tilled] or [tilled, seed, stage, time in stage]
+
+        The plant is stored by its seed's item id; plant_data is only written
+        out for plants whose seed is unknown.
+        """
+        if not self.plant:
+            return [int(self.tilled)]
+        seed = self.plant.seed_id if self.plant.seed_id is not None else self.plant.plant_data
+        return [int(self.tilled), seed, self.plant.current_stage, self.plant.time_in_stage]
+
+    def from_record(self, record, item_registry):
+        self.tilled = bool(record[0])
+        self.plant = None
+        if len(record) > 1:
+            seed, stage, time_in_stage = record[1:]
+            if isinstance(seed, dict):
+                self.plant = Plant(seed)
+            else:
+                seed_item = item_registry.get(seed)
+                if seed_item is None or not getattr(seed_item, 'plant_data', None):
+                    log.warning("Unknown seed %s in saved farmland", seed)
+                    return
+                self.plant = Plant(seed_item.plant_data, seed_item.id)
+            self.plant.current_stage = stage
+            self.plant.time_in_stage = time_in_stage
+        self._needs_texture_update = True
+        self.update_texture()
+
     def from_dict(self, data, item_registry):
         self.tilled = data.get('tilled', False)
         if data.get('plant'):
@@ -140,8 +170,9 @@ class BlockScript:
             self.plant.time_in_stage = plant_data['time_in_stage']
 
 class Plant:
-    def __init__(self, plant_data):
+    def __init__(self, plant_data, seed_id=None):
         self.plant_data = plant_data
+        self.seed_id = seed_id  # Item id of the seed, used to save the plant compactly
         self.growth_stages = plant_data['growth_stages']
         self.current_stage = 0
         self.growth_time = plant_data['growth_time']
@@ -161,16 +192,16 @@ class Plant:
         
         drops = []
         if 'drops' not in self.plant_data:
-            print("[FARM DEBUG] No drops specified in plant_data")
+            log.warning("No drops specified in plant_data")
             return []
             
         drop_data = self.plant_data['drops']
-        print(f"[FARM DEBUG] Processing drops: {drop_data}")
+        log.debug("Processing drops: %s", drop_data)
         
         # Process seed drops
         if 'seed' in drop_data and drop_data['seed']:
             seed_info = drop_data['seed']
-            print(f"[FARM DEBUG] Looking for seed item: {seed_info['id']}")
+            log.debug("Looking for seed item: %s", seed_info["id"])
             seed_item = REGISTRY.get_item(seed_info['id'])
             if seed_item:
                 # Handle random quantity ranges like "1-3"
@@ -182,15 +213,14 @@ class Plant:
                     quantity = int(quantity)
                     
                 drops.append((seed_item, quantity))
-                print(f"[FARM DEBUG] Found seed item: {seed_item.name}")
-                print(f"[FARM DEBUG] Adding seed drop: {seed_item.name} x{quantity}")
+                log.debug("Adding seed drop: %s x%d", seed_item.name, quantity)
             else:
-                print(f"[FARM DEBUG] Failed to find seed item: {seed_info['id']}")
+                log.warning("Failed to find seed item: %s", seed_info["id"])
 
         # Process crop drops if fully grown
         if self.is_fully_grown() and 'crop' in drop_data and drop_data['crop']:
             crop_info = drop_data['crop']
-            print(f"[FARM DEBUG] Looking for crop item: {crop_info['id']}")
+            log.debug("Looking for crop item: %s", crop_info["id"])
             crop_item = REGISTRY.get_item(crop_info['id'])
             if crop_item:
                 # Handle random quantity ranges
@@ -202,10 +232,9 @@ class Plant:
                     quantity = int(quantity)
                     
                 drops.append((crop_item, quantity))
-                print(f"[FARM DEBUG] Found crop item: {crop_item.name}")
-                print(f"[FARM DEBUG] Adding crop drop: {crop_item.name} x{quantity}")
+                log.debug("Adding crop drop: %s x%d", crop_item.name, quantity)
             else:
-                print(f"[FARM DEBUG] Failed to find crop item: {crop_info['id']}")
+                log.warning("Failed to find crop item: %s", crop_info["id"])
         
         return drops
 
@@ -214,12 +243,12 @@ class Plant:
         if self.current_stage >= len(self.growth_stages) - 1:
             return False
 
-        print(f"[FARM DEBUG] Growing... Time: {self.time_in_stage}/{self.growth_time}")
+        log.debug("Growing... time: %s/%s", self.time_in_stage, self.growth_time)
         self.time_in_stage += dt
         if self.time_in_stage >= self.growth_time:
             self.current_stage += 1
             self.time_in_stage = 0
-            print(f"[FARM DEBUG] Advanced to stage {self.current_stage}")
+            log.debug("Advanced to stage %d", self.current_stage)
             return True
         return False
 
@@ -1,4 +1,7 @@
-from item import FUEL_ITEMS, MELTABLE_ITEMS
+from item import FUEL_ITEMS, MELTABLE_ITEMS, slot_to_record, record_to_slot
+from logger import get_logger, DEBUG
+
+log = get_logger("furnace")
 
 class BlockScript:
     def __init__(self, block):
@@ -22,41 +25,26 @@ class BlockScript:
         """Check if item can be used as fuel"""
         # Check FUEL_ITEMS registry first, then item's burn_time attribute
         burn_time = FUEL_ITEMS.get(item.id, getattr(item, 'burn_time', 0))
-        print(f"Checking fuel: {item.name}, burn_time from FUEL_ITEMS={FUEL_ITEMS.get(item.id)}, from item={getattr(item, 'burn_time', 0)}")
+        log.debug("Checking fuel: %s, burn_time=%s", item.name, burn_time)
         return burn_time > 0
 
     def can_melt(self, item):
         """Check if item can be melted"""
         from item import MELTABLE_ITEMS
-        print(f"Checking meltable: {item.name}")
-        print(f"Available meltable items: {MELTABLE_ITEMS}")
-        print(f"Item ID: {item.id}, Found in meltables: {item.id in MELTABLE_ITEMS}")
+        log.debug("Checking meltable: %s (id %s), found: %s", item.name, item.id, item.id in MELTABLE_ITEMS)
         return item.id in MELTABLE_ITEMS
 
     def update(self, dt):
         """Process furnace smelting"""
-        print(f"\nFurnace Update:")
-        if self.input_slot and self.input_slot.get("item"):
-            print(f"Input: {self.input_slot['item'].name} x{self.input_slot['quantity']}")
-            print(f"Can melt: {self.can_melt(self.input_slot['item'])}")
-            if self.can_melt(self.input_slot['item']):
-                from item import MELTABLE_ITEMS
-                print(f"Melt result would be: {MELTABLE_ITEMS[self.input_slot['item'].id].name}")
-        else:
-            print("Input: Empty")
-            
-        if self.fuel_slot and self.fuel_slot.get("item"):
-            print(f"Fuel: {self.fuel_slot['item'].name} x{self.fuel_slot['quantity']}")
-        else:
-            print("Fuel: Empty")
-            
-        print(f"Is burning: {self.is_burning}")
-        print(f"Burn time remaining: {self.burn_time_remaining}")
-        print(f"Melt progress: {self.melt_progress}")
+        # Status dump is only built when furnace debugging is switched on
+        if log.isEnabledFor(DEBUG):
+            log.debug("Furnace update: input=%s, fuel=%s, burning=%s, burn_time=%s, progress=%s",
+                      self._describe_slot(self.input_slot), self._describe_slot(self.fuel_slot),
+                      self.is_burning, self.burn_time_remaining, self.melt_progress)
 
         # Check for fuel and input
         if not (self.input_slot and self.input_slot.get("item")):
-            print("No input - resetting furnace state")
+            log.debug("No input - resetting furnace state")
             self.is_burning = False
             self.melt_progress = 0
             return
@@ -64,29 +52,28 @@ class BlockScript:
         # Start new burn cycle if needed
         if not self.is_burning:
             if not (self.fuel_slot and self.fuel_slot.get("item")):
-                print("No fuel - waiting for fuel")
+                log.debug("No fuel - waiting for fuel")
                 return
 
             fuel_item = self.fuel_slot["item"]
             input_item = self.input_slot["item"]
             
-            print(f"Checking new burn cycle:")
-            print(f"Fuel: {fuel_item.name}, Input: {input_item.name}")
+            log.debug("Checking new burn cycle: fuel=%s, input=%s", fuel_item.name, input_item.name)
             
             if self.can_accept_fuel(fuel_item) and self.can_melt(input_item):
                 melt_result = MELTABLE_ITEMS[input_item.id]
-                print(f"Can melt {input_item.name} into {melt_result.name}")
+                log.debug("Can melt %s into %s", input_item.name, melt_result.name)
                 
                 # Check if output slot allows for melting
                 can_output = False
                 if not self.output_slot or not self.output_slot.get("item"):
                     can_output = True
                     self.output_slot = {"item": None, "quantity": 0}
-                    print("Output slot initialized")
+                    log.debug("Output slot initialized")
                 elif (self.output_slot["item"].id == melt_result.id and 
                       self.output_slot["quantity"] < self.output_slot["item"].stack_size):
                     can_output = True
-                    print("Output slot can stack more items")
+                    log.debug("Output slot can stack more items")
                 
                 if can_output:
                     self.is_burning = True
@@ -98,7 +85,7 @@ class BlockScript:
                     self.fuel_slot["quantity"] -= 1
                     if self.fuel_slot["quantity"] <= 0:
                         self.fuel_slot = {"item": None, "quantity": 0}
-                    print(f"Started burning: time={self.burn_time_remaining}")
+                    log.debug("Started burning: time=%s", self.burn_time_remaining)
 
         # Update max_burn_time when new fuel is added
         if self.fuel_slot and self.fuel_slot.get("item"):
@@ -110,33 +97,33 @@ class BlockScript:
         if self.is_burning and self.input_slot.get("item"):
             self.burn_time_remaining -= dt
             self.melt_progress += dt
-            print(f"Burning: progress={self.melt_progress}, remaining={self.burn_time_remaining}")
+            log.debug("Burning: progress=%s, remaining=%s", self.melt_progress, self.burn_time_remaining)
 
             if self.melt_progress >= 1000:  # 1 second to melt
                 input_item = self.input_slot["item"]
                 melt_result = MELTABLE_ITEMS[input_item.id]
-                print(f"Melt complete: creating {melt_result.name}")
+                log.debug("Melt complete: creating %s", melt_result.name)
                 
                 # Create or update output slot
                 if not self.output_slot or not self.output_slot.get("item"):
                     self.output_slot = {"item": melt_result, "quantity": 1}
-                    print("Created new output stack")
+                    log.debug("Created new output stack")
                 else:
                     self.output_slot["quantity"] += 1
-                    print(f"Added to existing stack: now {self.output_slot['quantity']}")
+                    log.debug("Added to existing stack: now %d", self.output_slot["quantity"])
 
                 # Update input slot
                 self.input_slot["quantity"] -= 1
                 if self.input_slot["quantity"] <= 0:
                     self.input_slot = {"item": None, "quantity": 0}
-                print("Consumed input item")
+                log.debug("Consumed input item")
 
                 self.melt_progress = 0
 
             # Check if burning should stop
             if self.burn_time_remaining <= 0:
                 self.is_burning = False
-                print("Burn cycle complete")
+                log.debug("Burn cycle complete")
 
     def to_dict(self):
         """Convert furnace state to dictionary for saving"""
@@ -149,12 +136,27 @@ class BlockScript:
             'max_burn_time': self.max_burn_time,
             'melt_progress': self.melt_progress
         }
-        print(f"Saving furnace state: {data}")  # Debug output
+        log.debug("Saving furnace state: %s", data)
         return data
 
+    def to_record(self):
+        """Compact state: [input, fuel, output, is_burning, burn_time_remaining, max_burn_time, melt_progress]"""
+        return [slot_to_record(self.input_slot), slot_to_record(self.fuel_slot), slot_to_record(self.output_slot),
+                int(self.is_burning), self.burn_time_remaining, self.max_burn_time, self.melt_progress]
+
+    def from_record(self, record, item_registry):
+        input_slot, fuel_slot, output_slot, is_burning, burn_time_remaining, max_burn_time, melt_progress = record
+        self.input_slot = record_to_slot(input_slot, item_registry)
+        self.fuel_slot = record_to_slot(fuel_slot, item_registry)
+        self.output_slot = record_to_slot(output_slot, item_registry)
+        self.is_burning = bool(is_burning)
+        self.burn_time_remaining = burn_time_remaining
+        self.max_burn_time = max_burn_time
+        self.melt_progress = melt_progress
+
     def from_dict(self, data, item_registry):
         """Load furnace state from dictionary"""
-        print(f"Loading furnace data: {data}")  # Debug output
+        log.debug("Loading furnace data: %s", data)
         
         # Initialize empty slots
         self.input_slot = {"item": None, "quantity": 0}
@@ -174,15 +176,21 @@ class BlockScript:
         self.max_burn_time = data.get("max_burn_time", 1000)  # Add this line
         self.melt_progress = data.get('melt_progress', 0)
         
-        print(f"Loaded furnace state:")
-        print(f"Input: {self.input_slot.get('item').name if self.input_slot.get('item') else 'None'}")
-        print(f"Fuel: {self.fuel_slot.get('item').name if self.fuel_slot.get('item') else 'None'}")
-        print(f"Output: {self.output_slot.get('item').name if self.output_slot.get('item') else 'None'}")
+        if log.isEnabledFor(DEBUG):
+            log.debug("Loaded furnace state: input=%s, fuel=%s, output=%s",
+                      self._describe_slot(self.input_slot), self._describe_slot(self.fuel_slot),
+                      self._describe_slot(self.output_slot))
+
+    def _describe_slot(self, slot):
+        """Short text form of a slot for debug output"""
+        if slot and slot.get("item"):
+            return f"{slot['item'].name} x{slot['quantity']}"
+        return "Empty"
 
     def _slot_to_dict(self, slot):
         """Helper to serialize a slot"""
         if slot and slot.get("item") and slot["item"] is not None:
-            print(f"Saving slot with item: {slot['item'].name} x{slot['quantity']}")  # Debug
+            log.debug("Saving slot with item: %s x%d", slot["item"].name, slot["quantity"])
             return {
                 'item_id': str(slot['item'].id),  # Convert ID to string
                 'quantity': slot['quantity']
@@ -193,14 +201,14 @@ class BlockScript:
         """Helper to deserialize a slot"""
         if slot_data and 'item_id' in slot_data:
             item_id = str(slot_data['item_id'])  # Ensure ID is string
-            print(f"Looking up item ID: {item_id} in registry")  # Debug
+            log.debug("Looking up item ID: %s in registry", item_id)
             item = item_registry.get(item_id)
             if item:
-                print(f"Found item: {item.name}")  # Debug
+                log.debug("Found item: %s", item.name)
                 return {
                     'item': item,
                     'quantity': slot_data['quantity']
                 }
             else:
-                print(f"Item not found for ID: {item_id}")  # Debug
+                log.warning("Item not found for ID: %s", item_id)
         return {"item": None, "quantity": 0}
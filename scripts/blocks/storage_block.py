@@ -1,3 +1,5 @@
+from item import slot_to_record, record_to_slot
+
 class BlockScript:
     def __init__(self, block):
         self.block = block
@@ -27,6 +29,16 @@ class BlockScript:
                 for slot_data in data['inventory']
             ]
 
+    def to_record(self):
+        """Compact state: [slot index, item id, quantity, ...] for occupied slots only"""
+        return [[i] + slot_to_record(slot) for i, slot in enumerate(self.inventory) if slot and slot.get("item")]
+
+    def from_record(self, record, item_registry):
+        self.inventory = [{"item": None, "quantity": 0} for _ in range(self.max_slots)]
+        for entry in record:
+            if 0 <= entry[0] < self.max_slots:
+                self.inventory[entry[0]] = record_to_slot(entry[1:], item_registry)
+
     def _slot_to_dict(self, slot):
         """Helper to serialize a slot"""
         if slot and slot.get("item"):
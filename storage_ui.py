@@ -1,6 +1,9 @@
 import pygame
 import config as c
 from ui_tooltip import Tooltip, get_item_tooltip
+from ui_manager import UIManager
+from text_cache import TEXT_CACHE
+from icon_cache import ICON_CACHE
 
 class StorageUI:
     def __init__(self, screen, player_inventory, storage_block, atlas):
@@ -8,7 +11,7 @@ class StorageUI:
         self.player_inventory = player_inventory
         self.storage = storage_block
         self.atlas = atlas
-        self.font = pygame.font.SysFont(None, 24)
+        self.font = TEXT_CACHE.font(24)
         self.running = True
         self.dragging_item = None
         self.drag_source = None
@@ -45,6 +48,8 @@ class StorageUI:
         self.inventory_label = self.font.render("Inventory", True, (255, 255, 255))
         self.hotbar_label = self.font.render("Hotbar", True, (255, 255, 255))
 
+        self.ui_manager = UIManager(screen)
+
     def handle_event(self, event):
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_ESCAPE:
@@ -190,24 +195,25 @@ class StorageUI:
 
         return slot_info
 
-    def draw(self):
-        # Get current mouse position and update hovered item
-        mouse_pos = pygame.mouse.get_pos()
-        self.get_slot_at_pos(mouse_pos)  # This updates self.hovered_item
-
+    def draw_background(self, surface):
+        """Static part of the screen, painted once over the game"""
         # Create single translucent background
         bg_overlay = pygame.Surface((c.SCREEN_WIDTH, c.SCREEN_HEIGHT), pygame.SRCALPHA)
         bg_overlay.fill((0, 0, 0, 160))  # Reduced opacity (160 instead of 180))
-        self.screen.blit(bg_overlay, (0, 0))
-
-        # Draw slots with semi-transparent backgrounds
-        slot_bg = (70, 70, 70, 200)
-        slot_border = (200, 200, 200, 255)
+        surface.blit(bg_overlay, (0, 0))
 
         # Draw section labels
-        self.screen.blit(self.storage_label, (self.storage_start_x, self.storage_start_y - 25))
-        self.screen.blit(self.inventory_label, (self.inventory_start_x, self.inventory_start_y - 25))
-        self.screen.blit(self.hotbar_label, (self.hotbar_start_x, self.hotbar_start_y - 25))
+        surface.blit(self.storage_label, (self.storage_start_x, self.storage_start_y - 25))
+        surface.blit(self.inventory_label, (self.inventory_start_x, self.inventory_start_y - 25))
+        surface.blit(self.hotbar_label, (self.hotbar_start_x, self.hotbar_start_y - 25))
+
+    def draw(self):
+        """Draw the storage UI; only slots whose contents changed are repainted"""
+        self.ui_manager.retain(self.draw_background)
+
+        # Get current mouse position and update hovered item
+        mouse_pos = pygame.mouse.get_pos()
+        self.get_slot_at_pos(mouse_pos)  # This updates self.hovered_item
 
         # Draw storage slots
         for i in range(27):
@@ -215,14 +221,8 @@ class StorageUI:
             col = i % 9
             x = self.storage_start_x + col * (self.slot_size + self.padding)
             y = self.storage_start_y + row * (self.slot_size + self.padding)
-            rect = pygame.Rect(x, y, self.slot_size, self.slot_size)
-            
-            pygame.draw.rect(self.screen, slot_bg, rect)
-            pygame.draw.rect(self.screen, slot_border, rect, 2)
-            
-            slot = self.storage.inventory[i]
-            if slot and slot.get("item"):
-                self.draw_item(slot, rect)
+            self.draw_slot(f"storage_{i}", pygame.Rect(x, y, self.slot_size, self.slot_size),
+                           self.storage.inventory[i])
 
         # Draw main inventory
         for i in range(32):
@@ -230,56 +230,50 @@ class StorageUI:
             col = i % 8
             x = self.inventory_start_x + col * (self.slot_size + self.padding)
             y = self.inventory_start_y + row * (self.slot_size + self.padding)
-            rect = pygame.Rect(x, y, self.slot_size, self.slot_size)
-            
-            pygame.draw.rect(self.screen, slot_bg, rect)
-            pygame.draw.rect(self.screen, slot_border, rect, 2)
-            
-            if i < len(self.player_inventory.main):
-                slot = self.player_inventory.main[i]
-                if slot and slot.get("item"):
-                    self.draw_item(slot, rect)
+            slot = self.player_inventory.main[i] if i < len(self.player_inventory.main) else None
+            self.draw_slot(f"inventory_{i}", pygame.Rect(x, y, self.slot_size, self.slot_size), slot)
 
         # Draw hotbar
         for i in range(9):
             x = self.hotbar_start_x + i * (self.slot_size + self.padding)
-            rect = pygame.Rect(x, self.hotbar_start_y, self.slot_size, self.slot_size)
-            
-            pygame.draw.rect(self.screen, slot_bg, rect)
-            pygame.draw.rect(self.screen, slot_border, rect, 2)
-            
-            if i == self.player_inventory.selected_hotbar_index:
-                pygame.draw.rect(self.screen, (255, 215, 0), rect.inflate(6, 6), 3)
-            
-            slot = self.player_inventory.hotbar[i]
-            if slot and slot.get("item"):
-                self.draw_item(slot, rect)
+            self.draw_slot(f"hotbar_{i}", pygame.Rect(x, self.hotbar_start_y, self.slot_size, self.slot_size),
+                           self.player_inventory.hotbar[i], i == self.player_inventory.selected_hotbar_index)
 
         # Draw dragged item
         if self.dragging_item and self.dragging_item.get("item"):
-            mx, my = pygame.mouse.get_pos()
+            mx, my = mouse_pos
             item = self.dragging_item["item"]
             tx, ty = item.texture_coords
-            texture_rect = pygame.Rect(tx * c.BLOCK_SIZE, ty * c.BLOCK_SIZE, c.BLOCK_SIZE, c.BLOCK_SIZE)
-            item_img = self.atlas.subsurface(texture_rect)
-            item_img = pygame.transform.scale(item_img, (self.slot_size, self.slot_size))
-            self.screen.blit(item_img, (mx - self.slot_size//2, my - self.slot_size//2))
+            item_img = ICON_CACHE.icon(self.atlas, (tx, ty), self.slot_size)
+            drag_rect = item_img.get_rect(topleft=(mx - self.slot_size//2, my - self.slot_size//2))
+            self.ui_manager.draw_overlay(drag_rect, item, lambda screen: screen.blit(item_img, drag_rect))
 
         # Draw tooltip last (after dragged item)
         if self.hovered_item and not self.dragging_item:
             tooltip_text = get_item_tooltip(self.hovered_item)
-            self.tooltip.draw(self.screen, tooltip_text, (mouse_pos[0] + 15, mouse_pos[1] + 15))
+            self.ui_manager.draw_tooltip(self.tooltip, tooltip_text, (mouse_pos[0] + 15, mouse_pos[1] + 15))
+
+    def draw_slot(self, slot_id, rect, slot, selected=False):
+        """Slot widget, repainted when its item, quantity or selection changes"""
+        def draw(surface):
+            pygame.draw.rect(surface, (70, 70, 70, 200), rect)
+            pygame.draw.rect(surface, (200, 200, 200, 255), rect, 2)
+            if selected:
+                pygame.draw.rect(surface, (255, 215, 0), rect.inflate(6, 6), 3)
+            if slot and slot.get("item"):
+                self.draw_item(surface, slot, rect)
+
+        state = (slot.get("item"), slot.get("quantity"), selected) if slot else (None, 0, selected)
+        self.ui_manager.draw_widget(slot_id, rect.inflate(6, 6), state, draw)
 
-    def draw_item(self, slot, rect):
+    def draw_item(self, surface, slot, rect):
         item = slot["item"]
         tx, ty = item.texture_coords
-        texture_rect = pygame.Rect(tx * c.BLOCK_SIZE, ty * c.BLOCK_SIZE, c.BLOCK_SIZE, c.BLOCK_SIZE)
-        item_img = self.atlas.subsurface(texture_rect)
-        item_img = pygame.transform.scale(item_img, (self.slot_size, self.slot_size))
-        self.screen.blit(item_img, rect.topleft)
+        item_img = ICON_CACHE.icon(self.atlas, (tx, ty), self.slot_size)
+        surface.blit(item_img, rect.topleft)
         if slot["quantity"] > 1:
             quantity = self.font.render(str(slot["quantity"]), True, (255, 255, 255))
-            self.screen.blit(quantity, (rect.right - quantity.get_width() - 5, rect.bottom - quantity.get_height() - 5))
+            surface.blit(quantity, (rect.right - quantity.get_width() - 5, rect.bottom - quantity.get_height() - 5))
 
     def run(self):
         clock = pygame.time.Clock()
@@ -290,4 +284,4 @@ class StorageUI:
                     self.running = False
                 self.handle_event(event)
             self.draw()
-            pygame.display.flip()
+            self.ui_manager.present()
@@ -0,0 +1,101 @@
+from collections import OrderedDict
+import pygame
+import config as c
+
+class SurfacePool:
+    """Recycles equally sized SRCALPHA surfaces under a memory cap
+
+    Surfaces are leased under a key (a chunk tile) and handed back with
+    release(); released surfaces are reused for the next lease of the same
+    size instead of allocating a new one. When the pool is full, the lease
+    seen least recently is taken back and ``on_evict`` is called with its key
+    so the owner forgets it. Leases touched in the current frame are never
+    taken back; if they alone exceed the cap the pool grows past it and counts
+    that in stats['over_cap'].
+    """
+
+    def __init__(self, max_bytes=c.SURFACE_POOL_BYTES, on_evict=None):
+        self.max_bytes = max_bytes
+        self.on_evict = on_evict
+        self.leased = OrderedDict()  # key -> [surface, frame last seen], least recently seen first
+        self.free = {}  # (width, height) -> [surface]
+        self.bytes = 0  # Size of every surface the pool holds, leased or free
+        self.frame = 0
+        self.stats = {'allocated': 0, 'reused': 0, 'evicted': 0, 'over_cap': 0}
+
+    @staticmethod
+    def surface_bytes(size):
+        return size[0] * size[1] * 4
+
+    def begin_frame(self):
+        """Start a new frame; only leases seen in earlier frames can be evicted"""
+        self.frame += 1
+
+    def acquire(self, key, size):
+        """Lease an SRCALPHA surface of ``size``; a reused one still holds its old pixels"""
+        size = tuple(size)
+        surface = None
+        if self.free.get(size):
+            surface = self.free[size].pop()
+            self.stats['reused'] += 1
+        else:
+            needed = self.surface_bytes(size)
+            while self.bytes + needed > self.max_bytes and not self._drop_free():
+                evicted = self._evict()
+                if evicted is None:
+                    self.stats['over_cap'] += 1
+                    break
+                if evicted.get_size() == size:
+                    surface = evicted
+                    self.stats['reused'] += 1
+                    break
+                self.bytes -= self.surface_bytes(evicted.get_size())
+            if surface is None:
+                surface = pygame.Surface(size, pygame.SRCALPHA)
+                self.bytes += needed
+                self.stats['allocated'] += 1
+        self.leased[key] = [surface, self.frame]
+        return surface
+
+    def _drop_free(self):
+        """Let go of one unused surface; False if there is none"""
+        for size, surfaces in self.free.items():
+            if surfaces:
+                surfaces.pop()
+                self.bytes -= self.surface_bytes(size)
+                return True
+        return False
+
+    def _evict(self):
+        """Take back the lease seen least recently, or None if every lease is on screen"""
+        if not self.leased:
+            return None
+        key, (surface, frame) = next(iter(self.leased.items()))
+        if frame >= self.frame:
+            return None
+        del self.leased[key]
+        self.stats['evicted'] += 1
+        if self.on_evict:
+            self.on_evict(key)
+        return surface
+
+    def touch(self, key):
+        """Record that a leased surface was shown this frame"""
+        lease = self.leased.get(key)
+        if lease is not None:
+            lease[1] = self.frame
+            self.leased.move_to_end(key)
+
+    def release(self, key):
+        """Hand a leased surface back for reuse"""
+        lease = self.leased.pop(key, None)
+        if lease is None:
+            return
+        surface = lease[0]
+        if self.bytes > self.max_bytes:
+            self.bytes -= self.surface_bytes(surface.get_size())  # Shrink back under the cap
+        else:
+            self.free.setdefault(surface.get_size(), []).append(surface)
+
+    def memory_mb(self):
+        return self.bytes / 1024 / 1024
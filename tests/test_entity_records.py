@@ -0,0 +1,71 @@
+"""Block entities keep block items (Dirt, Iron Ore, Wood) across saves"""
+import json
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)  # Block and item definitions are loaded from relative paths
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import block as b
+from item import ITEM_PICKAXE, COAL
+from chunk_codec import encode_chunk, decode_chunk, entity_records
+from save_manager import SaveManager
+from save_schema import migrate_2_to_3
+
+def slot(item, quantity):
+    return {"item": item, "quantity": quantity}
+
+def entity_chunk():
+    chest = b.STORAGE.create_instance()
+    chest.script.inventory[0] = slot(b.DIRT.item_variant, 5)
+    chest.script.inventory[1] = slot(ITEM_PICKAXE, 1)
+    furnace = b.FURNACE.create_instance()
+    furnace.script.input_slot = slot(b.IRON_ORE.item_variant, 3)
+    furnace.script.fuel_slot = slot(b.WOOD.item_variant, 7)
+    enhancer = b.ENHANCER.create_instance()
+    enhancer.script.input_slot = slot(b.DIRT.item_variant, 1)
+    enhancer.script.ingredient_slot = slot(COAL, 2)
+    return [[chest, furnace, enhancer, b.AIR]]
+
+def contents(chunk):
+    chest, furnace, enhancer = chunk[0][:3]
+    return {
+        "chest": [(s["item"].id, s["quantity"]) for s in chest.script.inventory if s and s.get("item")],
+        "furnace": [(s["item"].id, s["quantity"]) for s in (furnace.script.input_slot, furnace.script.fuel_slot)],
+        "enhancer": [(s["item"].id, s["quantity"]) for s in (enhancer.script.input_slot, enhancer.script.ingredient_slot)],
+    }
+
+EXPECTED = {
+    "chest": [(2, 5), (ITEM_PICKAXE.id, 1)],
+    "furnace": [(17, 3), (19, 7)],
+    "enhancer": [(2, 1), (COAL.id, 2)],
+}
+
+def test_region_payload_round_trip():
+    assert contents(decode_chunk(encode_chunk(entity_chunk()))) == EXPECTED
+
+def test_region_payload_round_trip_with_save_manager_registry(tmp_path):
+    save_manager = SaveManager(save_dir=str(tmp_path))
+    assert contents(decode_chunk(encode_chunk(entity_chunk()), save_manager.item_registry)) == EXPECTED
+
+def test_json_entity_records_round_trip(tmp_path):
+    save_manager = SaveManager(save_dir=str(tmp_path))
+    chunk = entity_chunk()
+    grid = [[block.id for block in row] for row in chunk]
+    loaded = save_manager.deserialize_chunk(grid, entity_records(chunk, len(chunk[0])))
+    assert contents(loaded) == EXPECTED
+
+def test_schema_2_to_3_migration_keeps_block_items(tmp_path):
+    save_manager = SaveManager(save_dir=str(tmp_path))
+    chunk = entity_chunk()
+    grid = [[block.to_dict() if isinstance(block, (b.StorageBlock, b.FurnaceBlock, b.EnhancerBlock)) else block.id
+             for block in row] for row in chunk]
+    save_manager.write_json_atomic(save_manager.world_file, {"chunks": {"0": grid}})
+    save_manager.write_level("json")
+    migrate_2_to_3(save_manager)
+    with open(save_manager.world_file) as f:
+        data = json.load(f)
+    loaded = save_manager.deserialize_chunk(data["chunks"]["0"], data["entities"]["0"])
+    assert contents(loaded) == EXPECTED
@@ -0,0 +1,51 @@
+"""A region file with a damaged header only costs the chunks stored in it"""
+import os
+import sys
+from types import SimpleNamespace
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)  # Block and item definitions are loaded from relative paths
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import config as c
+import block as b
+from region_file import RegionStorage, region_filename
+from save_manager import SaveManager
+
+SEED = 7
+CHUNKS = (-2, -1, 0, 1)  # Regions -1 and 0
+
+def save_world(save_dir):
+    save_manager = SaveManager(seed=SEED, save_dir=save_dir)
+    world_chunks = {ci: [[b.STONE] * c.CHUNK_WIDTH for _ in range(4)] for ci in CHUNKS}
+    player = SimpleNamespace(rect=SimpleNamespace(x=120, y=340), health=80, hunger=60, thirst=50)
+    inventory = SimpleNamespace(hotbar=[None] * 9, armor=[None] * 4, main=[None] * 27, selected_hotbar_index=2)
+    save_manager.save_all(world_chunks, player, inventory)
+    save_manager.close()
+
+def corrupt_header(save_dir, region):
+    path = os.path.join(save_dir, "region", region_filename(region))
+    with open(path, "r+b") as f:
+        f.write(b"\0\0\0\0")
+    return path
+
+def test_load_all_skips_region_with_corrupt_header(tmp_path):
+    save_world(str(tmp_path))
+    path = corrupt_header(str(tmp_path), -1)
+
+    world_chunks, player_data = SaveManager(seed=SEED, save_dir=str(tmp_path)).load_all(b.BLOCK_MAP)
+
+    assert player_data is not None
+    assert player_data["player"]["health"] == 80
+    assert sorted(world_chunks) == [0, 1]
+    assert world_chunks[0][0][0].id == b.STONE.id
+    assert os.path.exists(path + ".corrupt")
+
+def test_compact_skips_region_with_corrupt_header(tmp_path):
+    save_world(str(tmp_path))
+    corrupt_header(str(tmp_path), -1)
+
+    regions = RegionStorage(os.path.join(str(tmp_path), "region"))
+    regions.compact()
+    assert sorted(regions.chunk_indices()) == [0, 1]
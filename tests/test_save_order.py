@@ -0,0 +1,39 @@
+"""A background save queued before a chunk was unloaded never replaces the newer copy"""
+import os
+import sys
+from types import SimpleNamespace
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)  # Block and item definitions are loaded from relative paths
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import config as c
+import block as b
+from chunk_store import ChunkStore
+from save_manager import SaveManager
+
+SEED = 7
+
+def test_stale_snapshot_does_not_overwrite_unloaded_chunk(tmp_path):
+    save_manager = SaveManager(seed=SEED, save_dir=str(tmp_path))
+    chunk_store = ChunkStore(save_manager, SEED, cache_size=0)
+    try:
+        chunk = [[b.STONE] * c.CHUNK_WIDTH for _ in range(4)]
+        player = SimpleNamespace(rect=SimpleNamespace(x=0, y=0), health=100, hunger=100, thirst=100)
+        inventory = SimpleNamespace(hotbar=[], armor=[], main=[], selected_hotbar_index=0)
+
+        # An autosave copies the chunk; its write is still queued on the saver
+        stale = save_manager.snapshot({0: chunk}, player, inventory, chunk_indices=[0])
+
+        # The player edits the chunk, which is then unloaded and dropped from the LRU
+        chunk[0][0] = b.DIRT
+        chunk_store.mark_dirty(0)
+        chunk_store.unload(0, chunk)
+        assert 0 not in chunk_store.cache
+
+        save_manager.write_snapshot(stale)
+        assert save_manager.load_chunk(0)[0][0].id == b.DIRT.id
+    finally:
+        chunk_store.stop()
+        save_manager.close()
@@ -0,0 +1,33 @@
+"""Chunks draw every tinted block from the baked tint atlas, never tinting at runtime"""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)  # Textures are loaded from relative paths
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+import config as c
+import block  # noqa: F401  Registers every block type
+from registry import REGISTRY
+from chunk_raster import ChunkRasterizer
+from texture_manager import TextureManager, tint_variants
+
+def test_rendering_tinted_blocks_uses_only_baked_tints():
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    lut = REGISTRY.block_lut()
+    texture_manager = TextureManager()
+    texture_manager.load_atlas("texture_atlas.png")
+    texture_manager.bake_tints(tint_variants(lut))
+
+    tinted = [b for b in lut if b is not None and b.tint]
+    assert tinted
+    rasterizer = ChunkRasterizer(texture_manager, lut)
+    chunk = [tinted, [b.create_instance() if hasattr(b, "create_instance") else b for b in tinted]]
+    surface = pygame.Surface((len(tinted) * c.BLOCK_SIZE, len(chunk) * c.BLOCK_SIZE), pygame.SRCALPHA)
+    for mode in ("blits", "numpy"):
+        rasterizer.render(surface, chunk, mode=mode)
+
+    assert texture_manager.stats['runtime_tints'] == 0
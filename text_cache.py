@@ -0,0 +1,78 @@
+import re
+from collections import OrderedDict
+import pygame
+import config as c
+
+NUMBER = re.compile(r"(-?\d+)")
+
+class TextCache:
+    """Fonts created once and rendered strings kept in an LRU
+
+    Text that changes every frame (coordinates, FPS, stack counts) would
+    flood the LRU, so draw() renders the words of a line as cached strings
+    and its numbers from cached digit glyphs.
+    """
+
+    def __init__(self, max_entries=c.TEXT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.fonts = {}
+        self.entries = OrderedDict()  # (text, size, color) -> surface, least recently used first
+        self.glyphs = {}  # (size, color) -> {character: surface}
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    def font(self, size):
+        """The default font at ``size``, created on first use"""
+        font = self.fonts.get(size)
+        if font is None:
+            font = self.fonts[size] = pygame.font.SysFont(None, size)
+        return font
+
+    def render(self, text, size=24, color=(255, 255, 255)):
+        """Antialiased surface of ``text``"""
+        key = (text, size, tuple(color))
+        surface = self.entries.get(key)
+        if surface is not None:
+            self.entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return surface
+        self.stats['misses'] += 1
+        surface = self.entries[key] = self.font(size).render(text, True, color)
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.stats['evictions'] += 1
+        return surface
+
+    def _digits(self, size, color):
+        glyphs = self.glyphs.get((size, color))
+        if glyphs is None:
+            font = self.font(size)
+            glyphs = self.glyphs[(size, color)] = {char: font.render(char, True, color) for char in "-0123456789"}
+        return glyphs
+
+    def draw(self, surface, text, size=24, color=(255, 255, 255), **anchor):
+        """Blit ``text`` placed like Rect(**anchor), e.g. topright=(x, y); returns its rect"""
+        color = tuple(color)
+        digits = self._digits(size, color)
+        pieces = []
+        for i, part in enumerate(NUMBER.split(text)):
+            if i % 2:
+                pieces.extend(digits[char] for char in part)
+            elif part:
+                pieces.append(self.render(part, size, color))
+        width = sum(piece.get_width() for piece in pieces)
+        rect = pygame.Rect(0, 0, width, max((piece.get_height() for piece in pieces), default=0))
+        for name, value in (anchor or {'topleft': (0, 0)}).items():
+            setattr(rect, name, value)
+        x = rect.x
+        blits = []
+        for piece in pieces:
+            blits.append((piece, (x, rect.y)))
+            x += piece.get_width()
+        surface.blits(blits, doreturn=False)
+        return rect
+
+    def hit_rate(self):
+        lookups = self.stats['hits'] + self.stats['misses']
+        return self.stats['hits'] / lookups if lookups else 0.0
+
+TEXT_CACHE = TextCache()
@@ -1,24 +1,212 @@
+import hashlib
+import json
+import os
+from collections import OrderedDict
 import pygame
 import config as c
-from PIL import Image
 import numpy as np
 from texture_packer import TexturePacker
 from typing import Dict, List, Tuple
 
+# Bump whenever load_atlas' packing or quantizing changes, so old cached atlases are rebuilt
+ATLAS_CACHE_VERSION = 1
+TINT_ATLAS_COLUMNS = 32  # Tiles per row of the baked tint atlas
+
+def block_texture_key(block):
+    """(coords, tint) a block is drawn with; tints without alpha are drawn half strength"""
+    coords = tuple(block.texture_coords) if isinstance(block.texture_coords, list) else block.texture_coords
+    tint = getattr(block, 'tint', None)
+    if tint:
+        tint = (*tint, 128) if len(tint) == 3 else tuple(tint)
+    return coords, tint or None
+
+def block_texture_keys(block):
+    """Every (coords, tint) a block can be drawn with: its texture and its animation frames"""
+    coords, tint = block_texture_key(block)
+    frames = [(tuple(frame), tint) for frame in block.animation_frames or ()]
+    return [(coords, tint)] + [key for key in frames if key[0] != coords]
+
+def tint_variants(blocks):
+    """Every tinted (coords, tint) the chunk rasterizer draws ``blocks`` with, for bake_tints"""
+    return {key for block in blocks if block is not None and block.tint for key in block_texture_keys(block)}
+
+class TextureCache:
+    """LRU of sliced and tinted textures, bounded by entry count and bytes
+
+    Pinned textures (every block's own texture) are kept outside the LRU and
+    never evicted; the limits apply to everything else, such as farm growth
+    stages and one-off tints.
+    """
+
+    def __init__(self, max_entries=c.TEXTURE_CACHE_SIZE, max_bytes=c.TEXTURE_CACHE_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # key -> surface, least recently used first
+        self.pinned = {}
+        self.bytes = 0  # Size of the LRU entries, pinned textures excluded
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    @staticmethod
+    def surface_bytes(surface):
+        return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+    def get(self, key):
+        surface = self.pinned.get(key)
+        if surface is None:
+            surface = self.entries.get(key)
+            if surface is None:
+                self.stats['misses'] += 1
+                return None
+            self.entries.move_to_end(key)
+        self.stats['hits'] += 1
+        return surface
+
+    def put(self, key, surface):
+        if key in self.pinned:
+            self.pinned[key] = surface
+            return
+        old = self.entries.pop(key, None)
+        if old is not None:
+            self.bytes -= self.surface_bytes(old)
+        self.entries[key] = surface
+        self.bytes += self.surface_bytes(surface)
+        while self.entries and (len(self.entries) > self.max_entries or self.bytes > self.max_bytes):
+            _, evicted = self.entries.popitem(last=False)
+            self.bytes -= self.surface_bytes(evicted)
+            self.stats['evictions'] += 1
+
+    def pin(self, key, surface):
+        old = self.entries.pop(key, None)
+        if old is not None:
+            self.bytes -= self.surface_bytes(old)
+        self.pinned[key] = surface
+
+    def hit_rate(self):
+        lookups = self.stats['hits'] + self.stats['misses']
+        return self.stats['hits'] / lookups if lookups else 0.0
+
+    def clear(self):
+        self.entries.clear()
+        self.pinned.clear()
+        self.bytes = 0
+
+    def __len__(self):
+        return len(self.entries) + len(self.pinned)
+
 class TextureManager:
     def __init__(self):
-        self.texture_cache = {}
+        self.texture_cache = TextureCache()
         self.block_textures = {}
         self.item_textures = {}
         self.atlas = None
         self.atlas_surface = None
+        self.atlas_key = None  # Cache key of the packed atlas, set by load_atlas
+        self.tint_atlas = None  # Secondary atlas of pre-tinted variants, see bake_tints
+        self.baked = {}  # (coords, tint) -> subsurface of tint_atlas
+        self.stats = {'runtime_tints': 0}  # Tinted textures that were not baked and had to be tinted on demand
         self._load_counter = 0
         self._last_clear = 0
         self.packer = TexturePacker()
         self.texture_batches = {}
 
     def load_atlas(self, atlas_path):
-        """Load and optimize the texture atlas"""
+        """Load the packed texture atlas, rebuilding it only when the source art changed
+
+        The packed atlas and its texture map are cached in TEXTURE_CACHE_DIR
+        under a hash of the source image, so a normal start is one PNG load.
+        """
+        with open(atlas_path, 'rb') as f:
+            digest = hashlib.sha1(f.read()).hexdigest()[:16]
+        key = f"atlas_{digest}_{c.BLOCK_SIZE}_v{ATLAS_CACHE_VERSION}"
+        self.atlas_key = key
+        image_path = os.path.join(c.TEXTURE_CACHE_DIR, key + ".png")
+        map_path = os.path.join(c.TEXTURE_CACHE_DIR, key + ".json")
+
+        if os.path.exists(image_path) and os.path.exists(map_path):
+            try:
+                atlas_surface = pygame.image.load(image_path)
+                with open(map_path, 'r') as f:
+                    texture_map = {texture_id: tuple(coords) for texture_id, coords in json.load(f).items()}
+            except (pygame.error, OSError, ValueError) as e:
+                print(f"Rebuilding texture atlas, cache {image_path} is unreadable: {e}")
+            else:
+                self.packer.texture_map = texture_map
+                self.packer.atlas_surface = atlas_surface
+                self.atlas_surface = atlas_surface
+                return self.atlas_surface
+
+        self.atlas_surface = self.build_atlas(atlas_path)
+        try:
+            self._write_atlas_cache(key, image_path, map_path)
+        except (pygame.error, OSError) as e:
+            print(f"Could not cache the texture atlas: {e}")
+        return self.atlas_surface
+
+    def _write_atlas_cache(self, key, image_path, map_path):
+        os.makedirs(c.TEXTURE_CACHE_DIR, exist_ok=True)
+        # Write under temporary names first so a crash never leaves half a cache entry
+        pygame.image.save(self.atlas_surface, image_path + ".tmp.png")
+        with open(map_path + ".tmp", 'w') as f:
+            json.dump(self.packer.texture_map, f)
+        os.replace(image_path + ".tmp.png", image_path)
+        os.replace(map_path + ".tmp", map_path)
+        # Atlases built from older art are never needed again
+        self._prune_cache("atlas_", key)
+
+    def _prune_cache(self, prefix, key):
+        """Remove cache files of an older atlas or tint set"""
+        for name in os.listdir(c.TEXTURE_CACHE_DIR):
+            if name.startswith(prefix) and not name.startswith(key):
+                os.remove(os.path.join(c.TEXTURE_CACHE_DIR, name))
+
+    def bake_tints(self, variants):
+        """Pre-tint texture variants into a secondary atlas so drawing never tints
+
+        ``variants`` are (coords, tint) pairs, one per tinted block texture
+        and animation frame. The atlas is cached in TEXTURE_CACHE_DIR and
+        only rebuilt when the art or the set of tints changes.
+        """
+        variants = sorted({(tuple(coords), tuple(tint)) for coords, tint in variants if tint})
+        names = "|".join(f"{coords}{tint}" for coords, tint in variants)
+        digest = hashlib.sha1(f"{self.atlas_key}|{names}".encode()).hexdigest()[:16]
+        key = f"tints_{digest}"
+        path = os.path.join(c.TEXTURE_CACHE_DIR, key + ".png")
+        size = c.BLOCK_SIZE
+        rows = max(1, -(-len(variants) // TINT_ATLAS_COLUMNS))
+
+        atlas = None
+        if self.atlas_key and os.path.exists(path):
+            try:
+                atlas = pygame.image.load(path)
+            except pygame.error as e:
+                print(f"Rebuilding tint atlas, cache {path} is unreadable: {e}")
+            if atlas is not None and atlas.get_size() != (TINT_ATLAS_COLUMNS * size, rows * size):
+                atlas = None
+        if atlas is None:
+            atlas = pygame.Surface((TINT_ATLAS_COLUMNS * size, rows * size), pygame.SRCALPHA)
+            for i, (coords, tint) in enumerate(variants):
+                atlas.blit(self._make_texture(coords, tint),
+                           ((i % TINT_ATLAS_COLUMNS) * size, (i // TINT_ATLAS_COLUMNS) * size))
+            if self.atlas_key:
+                try:
+                    os.makedirs(c.TEXTURE_CACHE_DIR, exist_ok=True)
+                    pygame.image.save(atlas, path + ".tmp.png")
+                    os.replace(path + ".tmp.png", path)
+                    self._prune_cache("tints_", key)
+                except (pygame.error, OSError) as e:
+                    print(f"Could not cache the tint atlas: {e}")
+
+        self.tint_atlas = atlas
+        self.baked = {
+            variant: atlas.subsurface(((i % TINT_ATLAS_COLUMNS) * size, (i // TINT_ATLAS_COLUMNS) * size, size, size))
+            for i, variant in enumerate(variants)
+        }
+        return atlas
+
+    def build_atlas(self, atlas_path):
+        """Slice, pack and quantize the source atlas (the slow path behind load_atlas)"""
+        from PIL import Image  # Only needed when the cached atlas is out of date
+
         # Load image with PIL first for processing
         pil_image = Image.open(atlas_path)
         if (pil_image.mode != 'RGBA'):
@@ -54,18 +242,36 @@ class TextureManager:
                 textures[f"{x}_{y}"] = texture_surface
         
         # Pack textures into optimized atlas
-        self.atlas_surface = self.packer.pack_textures(textures)
-        self.atlas_surface = self.packer.optimize_atlas(self.atlas_surface)
-        
-        return self.atlas_surface
+        atlas_surface = self.packer.pack_textures(textures)
+        return self.packer.optimize_atlas(atlas_surface)
 
     def get_texture(self, coords, tint=None):
         """Get a cached texture with optimized batching"""
-        cache_key = (coords, tuple(tint) if isinstance(tint, (list, tuple)) else tint)
-        
-        if cache_key in self.texture_cache:
-            return self.texture_cache[cache_key]
-            
+        cache_key = (tuple(coords), tuple(tint) if isinstance(tint, (list, tuple)) else tint)
+        if tint:
+            texture = self.baked.get(cache_key)
+            if texture is not None:
+                return texture
+        texture = self.texture_cache.get(cache_key)
+        if texture is not None:
+            return texture
+        if tint:
+            self.stats['runtime_tints'] += 1
+        texture = self._make_texture(coords, tint)
+        self.texture_cache.put(cache_key, texture)
+        return texture
+
+    def pin_block_textures(self, blocks):
+        """Keep the textures and animation frames of these blocks cached for good; chunk rendering needs them every frame"""
+        for block in blocks:
+            if block is None or block.id == 0:
+                continue
+            for coords, tint in block_texture_keys(block):
+                if (coords, tint) not in self.baked:
+                    self.texture_cache.pin((coords, tint), self._make_texture(coords, tint))
+
+    def _make_texture(self, coords, tint=None):
+        """Slice one texture out of the packed atlas and tint it"""
         # Get texture coordinates from packer
         texture_id = f"{coords[0]}_{coords[1]}"
         tex_coords = self.packer.get_texture_coords(texture_id)
@@ -87,10 +293,7 @@ class TextureManager:
         if tint:
             tinted = region.copy()
             tinted.fill(tint, special_flags=pygame.BLEND_RGBA_MULT)
-            self.texture_cache[cache_key] = tinted
             return tinted
-            
-        self.texture_cache[cache_key] = region
         return region
 
     def begin_batch(self, batch_id: str):
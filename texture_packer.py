@@ -1,5 +1,4 @@
 import pygame
-from PIL import Image
 import numpy as np
 from typing import Dict, List, Tuple
 import config as c
@@ -55,6 +54,7 @@ class TexturePacker:
 
     def optimize_atlas(self, atlas_surface: pygame.Surface) -> pygame.Surface:
         """Optimize the atlas for GPU usage"""
+        from PIL import Image  # Only the atlas build needs PIL; cached atlases skip it
         # Convert to PIL Image for processing
         atlas_string = pygame.image.tostring(atlas_surface, 'RGBA')
         atlas_pil = Image.frombytes('RGBA', atlas_surface.get_size(), atlas_string)
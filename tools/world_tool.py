@@ -0,0 +1,347 @@
+"""Offline maintenance for world saves.
+
+Usage:
+    python tools/world_tool.py stats saves/world_42
+    python tools/world_tool.py stats saves/world_42 --chunks --top 20 --output stats.json
+    python tools/world_tool.py convert saves/world_42 --to region
+    python tools/world_tool.py compact saves/world_42 --drop-pristine --dry-run
+    python tools/world_tool.py pregen saves/world_7 --seed 7 --range -50 50 --workers 8
+
+Every command works on a save directory through SaveManager, so saves from
+older versions are upgraded first, exactly as the game would on load. Run it
+while the game is not using the save.
+
+    stats    stored size, encoding and block entities per chunk, and a block
+             histogram for the whole world
+    convert  switch a save between the JSON and region formats
+    compact  shrink the region files; with --drop-pristine also drop saved
+             chunks identical to freshly generated terrain (the game would
+             regenerate them, but this undoes pregen)
+    pregen   generate a range of chunks on worker processes and store them, so
+             players never wait for terrain generation in that range
+"""
+import os
+
+# Run headless: the game's modules load textures, which needs a display mode, not a window.
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import contextlib
+import json
+import re
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+GAME_DIR = Path(__file__).parent.parent
+sys.path.append(str(GAME_DIR))
+
+import pygame
+import config as c
+
+KIND_NAMES = {0: "full", 1: "delta"}
+
+@contextlib.contextmanager
+def quiet(verbose=False):
+    """Silence the game's debug prints unless --verbose was given"""
+    if verbose:
+        yield
+        return
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+def init_game(verbose=False):
+    """Load the block and item registries the way the game does"""
+    # Assets are loaded with paths relative to the game directory
+    os.chdir(GAME_DIR)
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    with quiet(verbose):
+        import block  # noqa: F401  Registers every block type
+
+def find_seed(save_dir):
+    """Seed of a save directory from its header or its file names, or None"""
+    level_path = os.path.join(save_dir, "level.json")
+    if os.path.exists(level_path):
+        with open(level_path, "r") as f:
+            seed = json.load(f).get("seed")
+        if seed is not None:
+            return seed
+    for name in os.listdir(save_dir):
+        match = re.fullmatch(r"(?:world|player)_(-?\d+)\.json", name)
+        if match:
+            return int(match.group(1))
+    return None
+
+def open_save(args, create=False):
+    """(SaveManager, level) for the save directory of a command, upgraded to the current schema"""
+    from save_manager import SaveManager
+    from save_schema import SCHEMA_VERSION, migrate
+    if not create and not os.path.isdir(args.save_dir):
+        sys.exit(f"No save directory {args.save_dir}")
+    saved_seed = find_seed(args.save_dir) if os.path.isdir(args.save_dir) else None
+    if args.seed is not None and saved_seed is not None and args.seed != saved_seed:
+        sys.exit(f"{args.save_dir} holds a world with seed {saved_seed}, not {args.seed}")
+    seed = args.seed if args.seed is not None else saved_seed
+    if seed is None:
+        sys.exit(f"Cannot tell the seed of {args.save_dir}; pass --seed")
+    with quiet(args.verbose):
+        save_manager = SaveManager(seed=seed, save_dir=args.save_dir)
+    level = save_manager.read_level()
+    if level is not None and level.get("schema_version") == SCHEMA_VERSION:
+        return save_manager, level
+    level = migrate(save_manager)
+    if level is None and not create:
+        sys.exit(f"{args.save_dir} does not contain a save")
+    return save_manager, level
+
+def check_generator(level):
+    """Refuse to compare against terrain from a different generator version"""
+    from worldgen import GENERATOR_VERSION
+    if level.get("generator_version", GENERATOR_VERSION) != GENERATOR_VERSION:
+        sys.exit(f"Save was written by terrain generator {level.get('generator_version')}, "
+                 f"this game generates version {GENERATOR_VERSION}; refusing to compare terrain")
+
+def iter_chunks(save_manager, level):
+    """(ci, chunk, stored bytes, encoding) for every saved chunk; chunk is None if it is unreadable"""
+    from chunk_codec import decode_chunk, ChunkDecodeError
+    from region_file import RegionFormatError
+    if level["format"] == "region":
+        regions = save_manager.region_storage()
+        for ci in sorted(save_manager.saved_chunk_indices()):
+            size = regions.stored_size(ci)
+            try:
+                payload = regions.read_chunk(ci)
+                kind = KIND_NAMES.get(payload[1], "?") if payload[0] >= 2 else "full"
+                with quiet():  # Delta chunks regenerate their terrain, which prints debug output
+                    chunk = decode_chunk(payload, save_manager.item_registry, base=lambda: save_manager.generate_base(ci))
+            except (RegionFormatError, ChunkDecodeError) as e:
+                print(f"Chunk {ci} is unreadable: {e}")
+                yield ci, None, size, "corrupt"
+                continue
+            yield ci, chunk, size, kind
+    else:
+        world = save_manager.read_json(save_manager.world_file)
+        entities = world.get("entities", {})
+        for key in sorted(world.get("chunks", {}), key=int):
+            grid = world["chunks"][key]
+            records = entities.get(key)
+            size = len(json.dumps(grid, separators=(",", ":"))) + len(json.dumps(records or []))
+            yield int(key), save_manager.deserialize_chunk(grid, records), size, "json"
+
+def is_pristine(save_manager, ci, chunk):
+    """True if a chunk holds exactly the terrain the generator produces for it"""
+    from chunk_codec import chunk_ids, entity_records
+    from worldgen import generate_chunk
+    with quiet():
+        base = generate_chunk(ci, c.CHUNK_WIDTH, c.WORLD_HEIGHT, save_manager.world_seed())
+    width = len(chunk[0]) if chunk else 0
+    return chunk_ids(chunk) == chunk_ids(base) and entity_records(chunk, width) == entity_records(base, width)
+
+def cmd_stats(args):
+    from chunk_codec import chunk_ids, entity_records
+    from registry import REGISTRY
+    save_manager, level = open_save(args)
+    lut = REGISTRY.block_lut()
+
+    def block_name(block_id):
+        return lut[block_id].name if block_id < len(lut) and lut[block_id] else f"#{block_id}"
+
+    world_histogram = Counter()
+    kinds = Counter()
+    rows = []
+    for ci, chunk, size, kind in iter_chunks(save_manager, level):
+        kinds[kind] += 1
+        if chunk is None:
+            rows.append({"chunk": ci, "bytes": size, "encoding": kind})
+            continue
+        histogram = Counter(chunk_ids(chunk))
+        world_histogram.update(histogram)
+        rows.append({
+            "chunk": ci,
+            "bytes": size,
+            "encoding": kind,
+            "entities": len(entity_records(chunk, len(chunk[0]))),
+            "blocks": {block_name(block_id): count for block_id, count in histogram.most_common()}
+        })
+    save_manager.close()
+
+    total = sum(row["bytes"] for row in rows)
+    print(f"{args.save_dir}: {level['format']} save, seed {save_manager.seed}, "
+          f"schema {level.get('schema_version')}")
+    print(f"{len(rows)} chunks, {total / 1024:.1f} KiB stored"
+          + (f", {total / len(rows) / 1024:.2f} KiB per chunk" if rows else ""))
+    print("Encodings: " + ", ".join(f"{kind} {count}" for kind, count in kinds.most_common()))
+    print(f"Block entities: {sum(row.get('entities', 0) for row in rows)}")
+
+    if args.chunks:
+        print(f"\n{'chunk':>7} {'bytes':>9} {'encoding':<8} {'entities':>8}  most common blocks")
+        for row in rows:
+            common = ", ".join(f"{name} {count}" for name, count in list(row.get("blocks", {}).items())[:3])
+            print(f"{row['chunk']:>7} {row['bytes']:>9} {row['encoding']:<8} {row.get('entities', 0):>8}  {common}")
+    else:
+        print("\nLargest chunks: " + ", ".join(
+            f"{row['chunk']} ({row['bytes']} B)" for row in sorted(rows, key=lambda row: -row["bytes"])[:5]))
+
+    cells = sum(world_histogram.values())
+    print(f"\n{'block':<20} {'count':>10} {'share':>7}")
+    for block_id, count in world_histogram.most_common(args.top):
+        print(f"{block_name(block_id):<20} {count:>10} {count / cells:>7.1%}")
+
+    if args.output:
+        report = {
+            "save_dir": args.save_dir,
+            "level": level,
+            "total_bytes": total,
+            "blocks": {block_name(block_id): count for block_id, count in world_histogram.most_common()},
+            "chunks": rows
+        }
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.output}")
+
+def cmd_convert(args):
+    from save_schema import convert_json_to_region, convert_region_to_json
+    save_manager, level = open_save(args)
+    if level["format"] == args.to:
+        print(f"{args.save_dir} is already a {args.to} save")
+        return
+    started = time.perf_counter()
+    with quiet(args.verbose):
+        if args.to == "region":
+            count = convert_json_to_region(save_manager)
+        else:
+            count = convert_region_to_json(save_manager)
+    save_manager.close()
+    print(f"Converted {count} chunks to {args.to} in {time.perf_counter() - started:.2f} s")
+    if args.to != c.SAVE_FORMAT:
+        print(f"Note: with SAVE_FORMAT = \"{c.SAVE_FORMAT}\" the game converts the save back when it loads it")
+
+def cmd_compact(args):
+    save_manager, level = open_save(args)
+    pristine = []
+    if args.drop_pristine:
+        check_generator(level)
+        total = 0
+        for ci, chunk, _, _ in iter_chunks(save_manager, level):
+            total += 1
+            if chunk is not None and is_pristine(save_manager, ci, chunk):
+                pristine.append(ci)
+        print(f"{len(pristine)} of {total} saved chunks are unmodified terrain")
+    if args.dry_run or (level["format"] != "region" and not pristine):
+        save_manager.close()
+        return
+
+    if level["format"] == "region":
+        regions = save_manager.region_storage()
+        for ci in pristine:
+            regions.delete_chunk(ci)
+        regions.flush(sync=True)
+        reclaimed = regions.compact()
+    else:
+        before = os.path.getsize(save_manager.world_file)
+        world = save_manager.read_json(save_manager.world_file)
+        for ci in pristine:
+            world["chunks"].pop(str(ci), None)
+            world.get("entities", {}).pop(str(ci), None)
+        save_manager.write_json_atomic(save_manager.world_file, world)
+        reclaimed = before - os.path.getsize(save_manager.world_file)
+    save_manager.close()
+    dropped = f"Dropped {len(pristine)} chunks, reclaimed" if args.drop_pristine else "Reclaimed"
+    print(f"{dropped} {reclaimed / 1024:.1f} KiB")
+
+def _init_worker(verbose):
+    if "block" not in sys.modules:  # Forked workers inherit the loaded registries
+        init_game(verbose)
+
+def _pregen_chunk(job):
+    """Worker side of pregen: generate one chunk and encode it as a full payload"""
+    from chunk_codec import encode_chunk
+    from worldgen import generate_chunk
+    ci, seed = job
+    with quiet():
+        chunk = generate_chunk(ci, c.CHUNK_WIDTH, c.WORLD_HEIGHT, seed)
+    return ci, encode_chunk(chunk)
+
+def cmd_pregen(args):
+    first, last = sorted(args.range)
+    save_manager, level = open_save(args, create=True)
+    if level is not None and level["format"] != "region":
+        sys.exit(f"{args.save_dir} is a {level['format']} save; convert it to region first")
+    if level is not None:
+        check_generator(level)
+
+    regions = save_manager.region_storage()
+    todo = [ci for ci in range(first, last + 1) if not regions.has_chunk(ci)]
+    print(f"Generating {len(todo)} chunks ({last - first + 1 - len(todo)} already saved) "
+          f"on {args.workers} workers")
+    started = time.perf_counter()
+    jobs = [(ci, save_manager.world_seed()) for ci in todo]
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker,
+                             initargs=(args.verbose,)) as pool:
+        # Workers generate and encode; only this process writes the region files
+        for done, (ci, payload) in enumerate(pool.map(_pregen_chunk, jobs, chunksize=4), 1):
+            regions.write_chunk(ci, payload)
+            if done % 100 == 0 or done == len(jobs):
+                regions.flush()
+                print(f"  {done}/{len(jobs)} chunks")
+    regions.flush(sync=True)
+    if level is None:
+        save_manager.write_level("region")
+    save_manager.close()
+    elapsed = time.perf_counter() - started
+    print(f"Generated {len(todo)} chunks in {elapsed:.2f} s"
+          + (f" ({len(todo) / elapsed:.1f} chunks/s)" if todo and elapsed > 0 else ""))
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect and maintain world saves offline")
+    parser.add_argument("--verbose", action="store_true", help="keep game debug output")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def command(name, handler, help):
+        sub = commands.add_parser(name, help=help)
+        sub.add_argument("save_dir", help="save directory, e.g. saves/world_42")
+        sub.add_argument("--seed", type=int, default=None,
+                         help="world seed (default: read from the save)")
+        # Also accepted after the command; SUPPRESS keeps a --verbose given before it
+        sub.add_argument("--verbose", action="store_true", default=argparse.SUPPRESS,
+                         help="keep game debug output")
+        sub.set_defaults(handler=handler)
+        return sub
+
+    stats = command("stats", cmd_stats, "report chunk sizes and block histograms")
+    stats.add_argument("--chunks", action="store_true", help="list every chunk")
+    stats.add_argument("--top", type=int, default=15, help="blocks shown in the world histogram")
+    stats.add_argument("--output", default=None, help="also write the full report as JSON")
+
+    convert = command("convert", cmd_convert, "convert between the JSON and region formats")
+    convert.add_argument("--to", choices=("json", "region"), required=True, help="target format")
+
+    compact = command("compact", cmd_compact, "shrink region files, optionally dropping unmodified chunks")
+    compact.add_argument("--drop-pristine", action="store_true",
+                         help="also drop chunks identical to generated terrain, including pregenerated ones")
+    compact.add_argument("--dry-run", action="store_true", help="only report what would be dropped")
+
+    pregen = command("pregen", cmd_pregen, "pre-generate a range of chunks in parallel")
+    pregen.add_argument("--range", type=int, nargs=2, required=True, metavar=("FIRST", "LAST"),
+                        help="chunk indices to generate, inclusive")
+    pregen.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="generator processes (default: one per CPU)")
+
+    args = parser.parse_args(argv)
+    args.save_dir = os.path.abspath(args.save_dir)  # init_game changes the working directory
+    if getattr(args, "output", None):
+        args.output = os.path.abspath(args.output)
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+    init_game(args.verbose)
+    args.handler(args)
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
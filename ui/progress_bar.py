@@ -1,4 +1,5 @@
 import pygame
+from text_cache import TEXT_CACHE
 
 class ProgressBar:
     def __init__(self, x, y, width, height, max_value=100, color=(0, 255, 0), 
@@ -8,7 +9,7 @@ class ProgressBar:
         self.color = color
         self.background_color = background_color
         self.border_color = border_color
-        self.font = pygame.font.SysFont(None, height - 4)  # Scale font to fit height
+        self.font_size = height - 4  # Scale font to fit height
 
     def draw(self, surface, current_value, label=""):
         # Draw background
@@ -24,6 +25,4 @@ class ProgressBar:
         
         # Draw text
         text = f"{label}: {int(current_value)}/{self.max_value}"
-        text_surface = self.font.render(text, True, (255, 255, 255))
-        text_rect = text_surface.get_rect(center=self.rect.center)
-        surface.blit(text_surface, text_rect)
+        TEXT_CACHE.draw(surface, text, self.font_size, (255, 255, 255), center=self.rect.center)
@@ -1,6 +1,7 @@
 import pygame
 from typing import Dict, List, Tuple
 import config as c
+from text_cache import TEXT_CACHE
 
 class UIBatch:
     def __init__(self):
@@ -9,16 +10,35 @@ class UIBatch:
         self.dirty = set()  # Track which elements need updating
 
 class UIManager:
+    """Batched UI drawing, and a retained mode for modal screens
+
+    In retained mode a screen paints its static background once (retain()),
+    declares its widgets with the state they show (draw_widget()) and queues
+    what moves over them, like the dragged item or a tooltip (draw_overlay()).
+    Widgets are drawn into a copy of the screen and repainted only when their
+    state changes; present() restores and redraws just the changed rectangles
+    and hands them to pygame.display.update, so an idle screen costs almost
+    nothing. Widgets must not overlap each other.
+    """
+
     def __init__(self, screen):
         self.screen = screen
         self.batches = {}  # Dictionary of UI batches by group
         self.font_cache = {}
         self.current_frame = 0
+        self.background = None    # Static chrome of a retained screen
+        self.base = None          # Background plus every widget, without overlays
+        self.widgets = {}         # widget id -> (rect, state) it was drawn with
+        self.dirty = []           # Rects of base changed since the last present()
+        self.overlays = []        # (rect, state, draw) queued for this frame
+        self.shown_overlays = []  # (rect, state) of the overlays on the display
+        self.full_redraw = True
+        self.stats = {'widgets_drawn': 0, 'rects_updated': 0}
         
     def get_font(self, size: int) -> pygame.font.Font:
         """Get cached font"""
         if size not in self.font_cache:
-            self.font_cache[size] = pygame.font.SysFont(None, size)
+            self.font_cache[size] = TEXT_CACHE.font(size)
         return self.font_cache[size]
 
     def create_batch(self, name: str) -> UIBatch:
@@ -67,3 +87,73 @@ class UIManager:
         self.current_frame += 1
         for batch in self.batches.values():
             batch.dirty = set()
+
+    def retain(self, draw_background):
+        """Start retained mode; draw_background(surface) paints over the frame on screen, once"""
+        if self.base is not None:
+            return
+        self.background = self.screen.copy()
+        draw_background(self.background)
+        self.base = self.background.copy()
+        self.widgets = {}
+        self.dirty = []
+        self.full_redraw = True
+
+    def draw_widget(self, widget_id, rect, state, draw):
+        """Keep a widget on the retained screen; draw(surface) repaints it only when ``rect`` or ``state`` changed"""
+        rect = pygame.Rect(rect)
+        shown = self.widgets.get(widget_id)
+        if shown is not None and shown[0] == rect and shown[1] == state:
+            return
+        if shown is not None and shown[0] != rect:
+            self.base.blit(self.background, shown[0], shown[0])
+            self.dirty.append(shown[0])
+        self.base.blit(self.background, rect, rect)
+        self.base.set_clip(rect)
+        draw(self.base)
+        self.base.set_clip(None)
+        self.widgets[widget_id] = (rect, state)
+        self.dirty.append(rect)
+        self.stats['widgets_drawn'] += 1
+
+    def draw_overlay(self, rect, state, draw):
+        """Queue draw(surface) over the widgets for this frame; it reruns only when the overlays changed"""
+        rect = pygame.Rect(rect).clip(self.screen.get_rect())
+        self.overlays.append((rect, state, draw))
+
+    def draw_tooltip(self, tooltip, text, pos):
+        """Queue a Tooltip as an overlay"""
+        if not text:
+            return
+        surface = tooltip.render(text)
+        rect = surface.get_rect(topleft=tooltip.position(self.screen, surface, pos))
+        self.draw_overlay(rect, text, lambda screen: screen.blit(surface, rect))
+
+    def present(self):
+        """Show the retained frame, updating only the rectangles that changed"""
+        overlays, self.overlays = self.overlays, []
+        shown = [(rect, state) for rect, state, _ in overlays]
+        if self.full_redraw:
+            self.screen.blit(self.base, (0, 0))
+            dirty = None
+        else:
+            dirty = self.dirty
+            if shown != self.shown_overlays or any(rect.collidelist(dirty) != -1 for rect, _ in shown):
+                # Take the old overlays off and draw all current ones afresh
+                dirty += [rect for rect, _ in self.shown_overlays] + [rect for rect, _ in shown]
+            else:
+                overlays = []  # Already on the display
+            for rect in dirty:
+                self.screen.blit(self.base, rect, rect)
+        for rect, _, draw in overlays:
+            self.screen.set_clip(rect)
+            draw(self.screen)
+        self.screen.set_clip(None)
+        if dirty is None:
+            pygame.display.flip()
+        elif dirty:
+            pygame.display.update(dirty)
+            self.stats['rects_updated'] += len(dirty)
+        self.dirty = []
+        self.shown_overlays = shown
+        self.full_redraw = False
@@ -7,10 +7,13 @@ class Tooltip:
         self.padding = padding
         self.bg_color = bg_color
         self.text_color = text_color
+        self._text = None
+        self._surface = None
 
-    def draw(self, screen, text, pos):
-        if not text:
-            return
+    def render(self, text):
+        """Tooltip surface for ``text``, kept while the text stays the same"""
+        if text == self._text:
+            return self._surface
 
         # Split text into lines and render each line
         lines = text.split('\n')
@@ -26,20 +29,30 @@ class Tooltip:
         tooltip_surface = pygame.Surface((tooltip_width, tooltip_height), pygame.SRCALPHA)
         tooltip_surface.fill(self.bg_color)
 
-        # Position tooltip to avoid going off screen
-        x, y = pos
-        if x + tooltip_width > screen.get_width():
-            x = screen.get_width() - tooltip_width
-        if y + tooltip_height > screen.get_height():
-            y = y - tooltip_height - 5  # Move above cursor
-
         # Draw text lines
         current_y = self.padding
         for surface in text_surfaces:
             tooltip_surface.blit(surface, (self.padding, current_y))
             current_y += surface.get_height()
 
-        screen.blit(tooltip_surface, (x, y))
+        self._text, self._surface = text, tooltip_surface
+        return tooltip_surface
+
+    def position(self, screen, surface, pos):
+        """Top left of the tooltip at ``pos``, kept on screen"""
+        # Position tooltip to avoid going off screen
+        x, y = pos
+        if x + surface.get_width() > screen.get_width():
+            x = screen.get_width() - surface.get_width()
+        if y + surface.get_height() > screen.get_height():
+            y = y - surface.get_height() - 5  # Move above cursor
+        return x, y
+
+    def draw(self, screen, text, pos):
+        if not text:
+            return
+        surface = self.render(text)
+        screen.blit(surface, self.position(screen, surface, pos))
 
 def get_item_tooltip(item):
     if not item:
@@ -1,6 +1,10 @@
 import pygame
 import config as c
 import block as b  # to check block types
+from logger import get_logger, DEBUG
+from icon_cache import ICON_CACHE
+
+log = get_logger("world_item")
 
 class WorldItem:
     def __init__(self, item, x, y):
@@ -27,7 +31,7 @@ class WorldItem:
                 lx = tx % chunk_width
                 if ci in world_chunks and 0 <= ty < world_height:
                     tile = world_chunks[ci][ty][lx]
-                    print(f"Checking collision at ({tx}, {ty}) in chunk {ci}, local ({lx}, {ty}): {tile.name}")
+                    log.debug("Checking collision at (%d, %d) in chunk %d, local (%d, %d): %s", tx, ty, ci, lx, ty, tile.name)
                     if tile not in (b.AIR, b.WATER):
                         # Collision found: item should sit on top of this block
                         block_top = ty * block_size
@@ -39,23 +43,19 @@ class WorldItem:
         self.rect = new_rect
 
         # Debug information
-        if collision_detected:
-            print(f"Item '{self.item.name}' position: ({self.rect.x}, {self.rect.y}), velocity: {self.vy}, collision: {collision_detected}, block: {collided_block.name}")
-        else:
-            print(f"Item '{self.item.name}' position: ({self.rect.x}, {self.rect.y}), velocity: {self.vy}, collision: {collision_detected}")
+        if log.isEnabledFor(DEBUG):
+            log.debug("Item '%s' position: (%d, %d), velocity: %s, collision: %s, block: %s",
+                      self.item.name, self.rect.x, self.rect.y, self.vy, collision_detected,
+                      collided_block.name if collided_block else None)
 
     def draw(self, surface, atlas):
-        block_size = c.BLOCK_SIZE
-        new_size = block_size // 2  # shrink texture size to half
-        tx, ty = self.item.texture_coords
-        texture_rect = pygame.Rect(tx * block_size, ty * block_size, block_size, block_size)
+        new_size = c.BLOCK_SIZE // 2  # shrink texture size to half
         try:
-            item_img = atlas.subsurface(texture_rect)
+            item_img = ICON_CACHE.icon(atlas, self.item.texture_coords, new_size)
         except Exception as e:
-            print(f"Error drawing item '{self.item.name}': {e}")
+            log.error("Error drawing item '%s': %s", self.item.name, e)
             pygame.draw.rect(surface, (255, 0, 0), self.rect)  # fallback: red rectangle
             return
-        item_img = pygame.transform.scale(item_img, (new_size, new_size))
         offset_x = self.rect.x + (self.rect.width - new_size) // 2
         offset_y = self.rect.y + (self.rect.height - new_size) // 2
         surface.blit(item_img, (offset_x, offset_y))
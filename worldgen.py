@@ -1,5 +1,6 @@
 from noise import pnoise1, pnoise2
 import random
+import threading
 import block as b  # Keep the original import style
 from tree_generator import generate_tree
 from biomes import BiomeManager
@@ -7,8 +8,17 @@ from dungeon_generator import DungeonGenerator
 
 # Add chunk caching
 chunk_cache = {}
+chunk_cache_lock = threading.Lock()  # Chunk loader workers generate alongside the main thread
 MAX_CACHED_CHUNKS = 50
 
+# Bump whenever generate_chunk produces different terrain for the same seed:
+# delta saves only store changes relative to the generator's output.
+GENERATOR_VERSION = 1
+
+def chunk_rng(seed, chunk_index):
+    """Random source for one chunk, so terrain is a pure function of (seed, chunk)"""
+    return random.Random(f"{seed}:{chunk_index}")
+
 def int_to_block(code):
     """Convert an integer code to the corresponding Block object."""
     mapping = {
@@ -31,9 +41,12 @@ def generate_chunk(chunk_index, chunk_width, height, seed=0):
     """Generate a chunk with biome-based terrain and caching"""
     # Check cache first
     cache_key = (chunk_index, seed)
-    if cache_key in chunk_cache:
-        return [row[:] for row in chunk_cache[cache_key]]  # Return deep copy
+    with chunk_cache_lock:
+        cached = chunk_cache.get(cache_key)
+    if cached is not None:
+        return [row[:] for row in cached]  # Return deep copy
 
+    rng = chunk_rng(seed, chunk_index)
     biome_manager = BiomeManager(seed)
     chunk = [[0 for _ in range(chunk_width)] for _ in range(height)]
     surface_heights = [None] * chunk_width
@@ -59,7 +72,7 @@ def generate_chunk(chunk_index, chunk_width, height, seed=0):
         chunk[terrain_height][local_x] = biome.surface_block
         
         # Underground layers
-        dirt_depth = random.randint(3, 5)
+        dirt_depth = rng.randint(3, 5)
         for y in range(terrain_height + 1, min(terrain_height + dirt_depth, height - 1)):
             chunk[y][local_x] = biome.subsurface_block
             
@@ -90,17 +103,17 @@ def generate_chunk(chunk_index, chunk_width, height, seed=0):
         surface = surface_heights[local_x]
         # Only start placing water below the grass surface.
         for y in range(surface + 1, height):
-            if chunk[y][local_x] == b.AIR and random.random() < water_cave_chance:
-                group_length = random.randint(3, 5)
+            if chunk[y][local_x] == b.AIR and rng.random() < water_cave_chance:
+                group_length = rng.randint(3, 5)
                 for i in range(group_length):
                     if local_x + i < chunk_width and chunk[y][local_x + i] == b.AIR:
                         chunk[y][local_x + i] = b.WATER
 
     # --- Dungeon Generation Last ---
-    if random.random() < 0.1:  # 10% chance per chunk
+    if rng.random() < 0.1:  # 10% chance per chunk
         print(f"\nDEBUG: Generating dungeon in chunk {chunk_index}")
-        dungeon_y = random.randint(height // 3, height - 25)
-        dungeon = DungeonGenerator(min_rooms=4, max_rooms=8)
+        dungeon_y = rng.randint(height // 3, height - 25)
+        dungeon = DungeonGenerator(min_rooms=4, max_rooms=8, rng=rng)
         
         # Generate dungeon and apply modifications
         modified_chunks = dungeon.generate(chunk, -chunk_width, dungeon_y, chunk_index)
@@ -157,11 +170,11 @@ def generate_chunk(chunk_index, chunk_width, height, seed=0):
         terrain_height = surface_heights[local_x]
         if terrain_height is not None:
             biome = biome_manager.get_biome(chunk_index * chunk_width + local_x)
-            if random.random() < biome.tree_chance:
+            if rng.random() < biome.tree_chance:
                 if biome.tree_type == "normal":
-                    generate_tree(chunk, local_x, terrain_height)
+                    generate_tree(chunk, local_x, terrain_height, rng=rng)
                 elif biome.tree_type == "acacia":
-                    generate_acacia_tree(chunk, local_x, terrain_height)
+                    generate_acacia_tree(chunk, local_x, terrain_height, rng)
 
     # Convert to Block objects
     for y in range(height):
@@ -170,17 +183,19 @@ def generate_chunk(chunk_index, chunk_width, height, seed=0):
                 chunk[y][x] = int_to_block(chunk[y][x])
 
     # Cache the chunk before returning
-    if len(chunk_cache) >= MAX_CACHED_CHUNKS:
-        chunk_cache.pop(next(iter(chunk_cache)))
-    chunk_cache[cache_key] = [row[:] for row in chunk]  # Store deep copy
+    cached = [row[:] for row in chunk]  # Store deep copy
+    with chunk_cache_lock:
+        while len(chunk_cache) >= MAX_CACHED_CHUNKS:
+            chunk_cache.pop(next(iter(chunk_cache)))
+        chunk_cache[cache_key] = cached
 
     return chunk
 
-def generate_acacia_tree(chunk, x, y):
+def generate_acacia_tree(chunk, x, y, rng=random):
     """Generate an acacia tree (wider canopy, different leaves)"""
     # Tree height and canopy settings
-    trunk_height = random.randint(4, 6)
-    canopy_width = random.randint(5, 7)
+    trunk_height = rng.randint(4, 6)
+    canopy_width = rng.randint(5, 7)
     canopy_height = 2
 
     # Generate trunk
@@ -205,11 +220,12 @@ def generate_acacia_tree(chunk, x, y):
                 canopy_y - dy < len(chunk)):
                 # Add some randomness to canopy edges
                 if dx in (-canopy_width//2, canopy_width//2):
-                    if random.random() < 0.5:
+                    if rng.random() < 0.5:
                         chunk[canopy_y - dy][x + dx] = b.LEAVESGG
                 else:
                     chunk[canopy_y - dy][x + dx] = b.LEAVESGG
 
 def clear_chunk_cache():
     """Clear the chunk cache when needed"""
-    chunk_cache.clear()
+    with chunk_cache_lock:
+        chunk_cache.clear()